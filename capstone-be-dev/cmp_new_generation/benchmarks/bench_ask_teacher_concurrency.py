@@ -0,0 +1,105 @@
+"""
+Concurrency benchmark for /cmp-actions/ask-teacher against stubbed backends.
+
+The LLM chain, the question embeddings and the vector store (context lookups and
+saves) are replaced with stubs that sleep for a fixed latency, so the numbers only
+measure how well the request path overlaps I/O.
+With a non-blocking path, throughput should grow roughly linearly with concurrency.
+
+Usage:
+    python benchmarks/bench_ask_teacher_concurrency.py
+    python benchmarks/bench_ask_teacher_concurrency.py --llm-latency 0.5 --levels 1 8 32
+    python benchmarks/bench_ask_teacher_concurrency.py --blocking  # simulate the old sync path
+"""
+import argparse
+import asyncio
+import random
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from main import app  # noqa: E402
+from src.routers import main as router_module  # noqa: E402
+
+
+class StubChain:
+    def __init__(self, latency: float, blocking: bool):
+        self.latency = latency
+        self.blocking = blocking
+
+    async def ainvoke(self, inputs, *args, **kwargs):
+        if self.blocking:
+            time.sleep(self.latency)
+        else:
+            await asyncio.sleep(self.latency)
+        return f"Answer to: {inputs['question_from_student']}"
+
+
+class StubEmbeddings:
+    # Vector ngẫu nhiên: câu hỏi khác nhau không trúng semantic cache
+    def __init__(self, latency: float, dimensions: int = 1024):
+        self.latency = latency
+        self.dimensions = dimensions
+
+    async def aembed_query(self, text):
+        await asyncio.sleep(self.latency)
+        return [random.gauss(0, 1) for _ in range(self.dimensions)]
+
+
+def install_stubs(llm_latency: float, db_latency: float, blocking: bool) -> None:
+    chain = StubChain(llm_latency, blocking)
+
+    async def aget_from_vector_store(query, location):
+        await asyncio.sleep(db_latency)
+        return "stub context"
+
+    async def save_documents(docs):
+        await asyncio.sleep(db_latency)
+
+    router_module.select_chain = lambda name: chain
+    router_module.aget_from_vector_store = aget_from_vector_store
+    router_module.embeddings = StubEmbeddings(db_latency)
+    # Tài liệu được lưu qua document_queue, hàm lưu thật đã gắn vào queue khi tạo
+    router_module.document_queue.save = save_documents
+    app.dependency_overrides[router_module.rate_limit_mcp] = router_module.rate_unlimit
+
+
+async def run_level(client: httpx.AsyncClient, concurrency: int, requests_per_worker: int) -> float:
+    async def worker(worker_id: int):
+        for i in range(requests_per_worker):
+            response = await client.post(
+                "/cmp-actions/ask-teacher",
+                json={"question": f"Question {worker_id}-{i}?"})
+            assert response.json()["success"], response.text
+
+    started = time.perf_counter()
+    await asyncio.gather(*[worker(w) for w in range(concurrency)])
+    elapsed = time.perf_counter() - started
+    return concurrency * requests_per_worker / elapsed
+
+
+async def main(args) -> None:
+    install_stubs(args.llm_latency, args.db_latency, args.blocking)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        baseline = None
+        print(f"{'concurrency':>12} {'req/s':>10} {'speedup':>10}")
+        for level in args.levels:
+            throughput = await run_level(client, level, args.requests_per_worker)
+            baseline = baseline or throughput
+            print(f"{level:>12} {throughput:>10.1f} {throughput / baseline:>9.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--llm-latency", type=float, default=0.2)
+    parser.add_argument("--db-latency", type=float, default=0.02)
+    parser.add_argument("--requests-per-worker", type=int, default=5)
+    parser.add_argument("--levels", type=int, nargs="+", default=[1, 4, 16, 64])
+    parser.add_argument("--blocking", action="store_true",
+                        help="Stub the chain with time.sleep to reproduce the old blocking path")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,258 @@
+"""
+Micro-benchmark of the precompiled question extractor against the previous implementation.
+
+The previous implementation rebuilt and re-matched every regex for every sentence. The
+script checks both return identical results on random transcripts, then times long pasted
+transcripts of increasing size.
+
+Usage:
+    python benchmarks/bench_extract_questions.py
+    python benchmarks/bench_extract_questions.py --sizes 100 1000 5000 --repeat 3
+"""
+import argparse
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.actions.questions import extract_questions, extract_questions_batch  # noqa: E402
+
+SENTENCES = [
+    "Xin chào thầy, em là sinh viên năm hai.",
+    "Nextjs là gì?",
+    "Em muốn biết cách dùng router trong Nextjs.",
+    "Tôi vẫn chưa hiểu lắm.",
+    "Làm sao để cấu hình routing động",
+    "What is the difference between SSR and SSG?",
+    "Can you explain how React hooks work",
+    "how to use useEffect correctly",
+    "1. Giải thích về middleware trong framework",
+    "Hôm nay trời đẹp quá.",
+    "Cảm ơn thầy rất nhiều, bài giảng rất hay.",
+    "React works with a virtual DOM",
+    "Thầy có thể giải thích thêm về state không",
+    "I still don't understand closures.",
+    "Python dùng để làm gì",
+    "This sentence has no question at all.",
+    "Mình chưa rõ phần này; cho biết thêm về API | REST là gì",
+    "Where should I put my environment variables?",
+    "Tại sao component bị render lại nhiều lần",
+    "Ok.",
+]
+
+
+def legacy_extract_questions(text: str) -> list[str]:
+    """
+    Extract questions from text comprehensively in both Vietnamese and English.
+
+    This function detects:
+    1. Questions ending with question marks
+    2. Questions starting with question words
+    3. Numbered questions
+    4. Implicit questions without question marks
+    5. Core information requests in conversational text
+
+    Args:
+        text: Input text that may contain questions
+
+    Returns:
+        List of extracted questions
+    """
+    if not text:
+        return []
+
+    questions = []
+
+    # Clean text - normalize spaces and line breaks
+    cleaned_text = re.sub(r'\s+', ' ', text).strip()
+
+    # Split into sentences for better analysis
+    sentences = re.split(r'(?<=[.!?])\s+|[|;]', cleaned_text)
+    sentences = [s.strip() for s in sentences if s.strip()]
+
+    # English question words (expanded)
+    en_question_words = r'\b(what|why|how|when|where|who|which|whose|whom|can|could|would|will|is|are|do|does|did|has|have|should|may|might|explain|tell|describe|elaborate|clarify|discuss|advise)\b'
+
+    # Vietnamese question words (expanded)
+    vn_question_words = r'\b(gì|sao|làm sao|khi nào|ở đâu|ai|tại sao|bao giờ|như thế nào|cái gì|vì sao|có phải|làm thế nào|hãy|là gì|thế nào|cho biết|giải thích|trình bày|nói về|là ai|thể nào)\b'
+
+    question_word_pattern = f"({en_question_words}|{vn_question_words})"
+
+    # Pattern 1: Extract explicit questions with question marks
+    for s in sentences:
+        if s.endswith('?'):
+            questions.append(s)
+
+    # Pattern 2: Extract questions starting with question words (without relying on question marks)
+    for s in sentences:
+        if re.match(question_word_pattern, s.lower()) and s not in questions:
+            questions.append(s)
+
+    # Pattern 3: Extract implicit questions using request phrases
+    request_phrases_en = [
+        r'\b(I\s+(?:want|need|would like)\s+to\s+(?:know|understand|learn))',
+        r'\b((?:Can|Could)\s+you\s+(?:explain|tell|clarify|help))',
+        r'\b((?:Please|Kindly)\s+(?:explain|tell|clarify|advise))',
+        r'\b(I\'m\s+(?:confused|unclear|interested)\s+about)',
+        r'\b((?:not|don\'t)\s+understand\s+how)',
+        r'(what\s+is|how\s+to|how\s+can)'
+    ]
+
+    request_phrases_vi = [
+        r'\b((?:tôi|mình|em)\s+(?:muốn|cần|chưa)\s+(?:biết|hiểu))',
+        r'\b((?:bạn|thầy|anh|chị|cô|anh|em)\s+(?:có thể|vui lòng|hãy)\s+(?:giải thích|cho biết|nói về))',
+        r'\b((?:xin|làm ơn|vui lòng)\s+(?:giải thích|cho biết|nói))',
+        r'\b((?:chưa|không|còn)\s+(?:rõ|hiểu|biết))',
+        r'\b((?:là gì|để làm gì|làm sao))'
+    ]
+
+    all_request_patterns = request_phrases_en + request_phrases_vi
+
+    for s in sentences:
+        if s in questions:
+            continue
+
+        for pattern in all_request_patterns:
+            if re.search(pattern, s.lower()):
+                questions.append(s)
+                break
+
+    # Pattern 4: Look for topic-focused sentences that mention key concepts
+    # This is useful when people ask about a topic without explicit question structure
+    # Like "Nextjs là gì" (What is NextJS)
+    if not questions:
+        # Extract sentences with keywords/topics and common information request patterns
+        topic_request_patterns = [
+            # Vietnamese: "X là gì", "X dùng để làm gì"
+            r'([a-zA-Z0-9_\-]+\s+(?:là gì|là ai|là cái gì|dùng để làm gì))',
+            # English: "what is X", "how to use X"
+            r'((?:what is|how to use|how to|how does)\s+[a-zA-Z0-9_\-]+)',
+            # English: "X works", "X function"
+            r'([a-zA-Z0-9_\-]+\s+(?:works|function|means|used for))',
+        ]
+
+        for s in sentences:
+            for pattern in topic_request_patterns:
+                if re.search(pattern, s.lower()):
+                    questions.append(s)
+                    break
+
+    # Pattern 5: Look for sentences with "tôi vẫn chưa rõ" or "I'm still unclear" type phrases
+    # These typically lead to the core question
+    unclear_patterns = [
+        # Vietnamese
+        r'((?:tôi|mình|em)\s+(?:vẫn|còn|chưa)\s+(?:chưa|không)\s+(?:rõ|hiểu|biết))',
+        # English
+        r'((?:I|We)\s+(?:still|am|don\'t|do not)\s+(?:unclear|confused|understand|know))'
+    ]
+
+    for i, s in enumerate(sentences):
+        for pattern in unclear_patterns:
+            if re.search(pattern, s.lower()) and i < len(sentences) - 1:
+                # The actual question likely follows this phrase
+                next_sentence = sentences[i+1]
+                if next_sentence not in questions:
+                    questions.append(next_sentence)
+
+    # Clean up questions
+    cleaned_questions = []
+    for q in questions:
+        # Remove leading numbers and punctuation
+        q = re.sub(r'^\d+\s*[.)]\s*', '', q.strip())
+
+        # Remove common conversation starters like "Hello professor" or "Thank you for"
+        q = re.sub(
+            r'^(xin chào|cảm ơn|hello|thank you|hi|chào|kính gửi)[^.!?]+[,.]\s*', '', q, flags=re.IGNORECASE)
+
+        if q and len(q) > 5:  # Ensure minimum length for a valid question
+            cleaned_questions.append(q)
+
+    # Extract the most probable core question
+    # Priority:
+    # 1. Question mark questions
+    # 2. Direct request questions with "how", "what", etc.
+    # 3. Sentences with key topic indicators
+
+    core_questions = []
+
+    # Priority 1: Question marks
+    question_mark_questions = [q for q in cleaned_questions if q.endswith('?')]
+    if question_mark_questions:
+        core_questions.extend(question_mark_questions)
+
+    # Priority 2: Questions with direct question words
+    if not core_questions:
+        for q in cleaned_questions:
+            if re.match(question_word_pattern, q.lower()):
+                core_questions.append(q)
+
+    # If we have multiple core questions, prioritize based on relevance and specificity
+    if len(core_questions) > 1:
+        # Prefer questions with specific technical terms or topic indicators
+        for q in core_questions:
+            # Check for specific technical terms (adjust based on your domain)
+            if re.search(r'\b(router|route|routing|nextjs|react|framework|javascript|phương pháp|cách|method)\b', q.lower()):
+                return [q]
+
+        # If no specific technical terms found, return the longest question as it's likely more detailed
+        return [max(core_questions, key=len)]
+
+    return core_questions if core_questions else cleaned_questions
+
+
+def random_transcript(rng: random.Random, num_sentences: int) -> str:
+    return " ".join(rng.choice(SENTENCES) for _ in range(num_sentences))
+
+
+def long_transcript(rng: random.Random, num_sentences: int) -> str:
+    # Numbered so sentences are distinct, like a real pasted transcript
+    sentences = []
+    for i in range(num_sentences):
+        sentence = rng.choice(SENTENCES)
+        sentences.append(f"{sentence[:-1]} {i}{sentence[-1]}")
+    return " ".join(sentences)
+
+
+def check_equivalence(rng: random.Random, cases: int) -> None:
+    for _ in range(cases):
+        text = random_transcript(rng, rng.randint(0, 12))
+        expected = legacy_extract_questions(text)
+        actual = extract_questions(text)
+        assert actual == expected, (text, expected, actual)
+    texts = [random_transcript(rng, rng.randint(1, 8)) for _ in range(50)]
+    assert extract_questions_batch(texts) == [
+        legacy_extract_questions(text) for text in texts]
+    print(f"Identical results on {cases} random transcripts and one batch")
+
+
+def timeit(func, text: str, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(text)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main(args) -> None:
+    rng = random.Random(args.seed)
+    check_equivalence(rng, args.cases)
+    print(f"{'sentences':>10} {'chars':>10} {'legacy (ms)':>12} {'engine (ms)':>12} {'speedup':>8}")
+    for size in args.sizes:
+        text = long_transcript(rng, size)
+        legacy = timeit(legacy_extract_questions, text, args.repeat)
+        engine = timeit(extract_questions, text, args.repeat)
+        print(f"{size:>10} {len(text):>10} {legacy * 1000:>12.2f} "
+              f"{engine * 1000:>12.2f} {legacy / engine:>7.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000, 5000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--cases", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0)
+    main(parser.parse_args())
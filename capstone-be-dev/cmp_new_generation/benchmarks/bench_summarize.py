@@ -0,0 +1,113 @@
+"""
+Benchmark of the sparse LSA summarization engine against sumy's LsaSummarizer.
+
+sumy builds a dense vocabulary-by-sentence matrix and runs a full SVD, so it is only
+timed up to --legacy-max bytes; above that it would need gigabytes of memory. Inputs
+are random Vietnamese and English paragraphs of about 1 KB, 100 KB and 5 MB by default.
+The engine is timed in "full" and "chunked" modes, with the peak memory allocated by
+each mode (tracemalloc, excluding the input text).
+
+Usage:
+    python benchmarks/bench_summarize.py
+    python benchmarks/bench_summarize.py --sizes 1000 100000 --repeat 3
+"""
+import argparse
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sumy.parsers.plaintext import PlaintextParser  # noqa: E402
+from sumy.summarizers.lsa import LsaSummarizer  # noqa: E402
+
+from src.actions.summarize import summarize  # noqa: E402
+from src.actions.summarize.tokenizer import TokenizerVietnamese  # noqa: E402
+
+WORDS = (
+    "thầy sinh viên bài giảng mô hình dữ liệu hệ thống router component state "
+    "framework javascript python react nextjs server client database vector "
+    "embedding câu hỏi trả lời học tập kiến thức giải thích ví dụ cấu hình "
+    "middleware request response cache hiệu năng bộ nhớ thuật toán tóm tắt "
+    "văn bản ngữ cảnh tìm kiếm trang web nội dung phân tích"
+).split()
+
+
+def legacy_summarize(text: str, num_sentences: int = 5) -> str:
+    tokenizer = TokenizerVietnamese()
+    parser = PlaintextParser.from_string(text, tokenizer)
+    summarizer = LsaSummarizer()
+    summary = summarizer(parser.document, num_sentences)
+    return " ".join(str(sentence) for sentence in summary)
+
+
+def random_text(rng: random.Random, size: int) -> str:
+    paragraphs = []
+    length = 0
+    while length < size:
+        sentences = []
+        for _ in range(rng.randint(3, 8)):
+            words = rng.choices(WORDS, k=rng.randint(6, 20))
+            sentences.append(" ".join(words).capitalize() + rng.choice(".?!"))
+        paragraph = " ".join(sentences)
+        paragraphs.append(paragraph)
+        length += len(paragraph.encode("utf-8")) + 2
+    return "\n\n".join(paragraphs)
+
+
+def summarize_full(text: str) -> str:
+    return summarize(text, mode="full")
+
+
+def summarize_chunked(text: str) -> str:
+    return summarize(text, mode="chunked")
+
+
+def timeit(func, text: str, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(text)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def peak_memory(func, text: str) -> float:
+    """Peak memory in MB allocated while running func."""
+    tracemalloc.start()
+    func(text)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 1024 / 1024
+
+
+def main(args) -> None:
+    rng = random.Random(args.seed)
+    print(f"{'bytes':>10} {'legacy (ms)':>12} {'full (ms)':>12} {'speedup':>8} "
+          f"{'chunked (ms)':>13} {'full (MB)':>10} {'chunked (MB)':>13}")
+    for size in args.sizes:
+        text = random_text(rng, size)
+        repeat = args.repeat if size <= args.legacy_max else 1
+        engine = timeit(summarize_full, text, repeat)
+        engine_chunked = timeit(summarize_chunked, text, repeat)
+        memory = peak_memory(summarize_full, text)
+        memory_chunked = peak_memory(summarize_chunked, text)
+        if size <= args.legacy_max:
+            legacy = timeit(legacy_summarize, text, repeat)
+            legacy_columns = f"{legacy * 1000:>12.2f} {engine * 1000:>12.2f} {legacy / engine:>7.1f}x"
+        else:
+            legacy_columns = f"{'skipped':>12} {engine * 1000:>12.2f} {'-':>8}"
+        print(f"{size:>10} {legacy_columns} {engine_chunked * 1000:>13.2f} "
+              f"{memory:>10.1f} {memory_chunked:>13.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+",
+                        default=[1_000, 100_000, 5_000_000])
+    parser.add_argument("--legacy-max", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    main(parser.parse_args())
@@ -0,0 +1,209 @@
+"""
+Benchmark of the compiled TokenizerVietnamese against the previous implementation.
+
+The previous implementation ran one str.replace per abbreviation and one re.sub per
+sentence, and a regex match per single-character token. The script checks both return
+identical sentences and words on random texts, then times texts of about 1 KB, 100 KB
+and 5 MB, including the lazy iter_sentences/iter_words APIs.
+
+Usage:
+    python benchmarks/bench_tokenizer.py
+    python benchmarks/bench_tokenizer.py --sizes 1000 100000 --repeat 3
+"""
+import argparse
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.actions.summarize.tokenizer import TokenizerVietnamese  # noqa: E402
+
+PIECES = [
+    "TS.", "ThS.", "GS.", "PGS.", "TP.", "T.P", "Q.", "P.", "H.", "TW.", "UBND.",
+    "HĐND.", ".", "!", "?", ";", "…", '"', ")", "]", "'", " ", "  ", "\n", "\t",
+    "xin", "chào", "thầy", "a", "b", "đông-nam", "-", "_", "foo_bar", "x", "1",
+    "12", "a-b-c", ",", "é", "Đ", "P", "T", "S", "ạ",
+]
+
+SENTENCES = [
+    "Xin chào thầy, em là sinh viên năm hai.",
+    "TS. Nguyễn Văn A giảng dạy tại TP. Hồ Chí Minh.",
+    "Thầy có thể giải thích thêm về middleware không?",
+    "Hệ thống đông-nam và tây-bắc được cấu hình (xem mục 2).",
+    "React works with a virtual DOM; state changes trigger a re-render!",
+    "Cảm ơn thầy rất nhiều… bài giảng rất hay.",
+]
+
+
+def legacy_to_sentences(text):
+    """
+    Split Vietnamese text into sentences using regex patterns.
+
+    Args:
+        text: String text to split into sentences
+
+    Returns:
+        List of sentences
+    """
+    if not text:
+        return []
+
+    # Normalize whitespace
+    text = re.sub(r'\s+', ' ', text.strip())
+
+    # Handle abbreviations to avoid incorrect sentence splitting
+    common_abbrs = ["TS.", "ThS.", "GS.", "PGS.", "TP.",
+                    "T.P", "Q.", "P.", "H.", "TW.", "UBND.", "HĐND."]
+    for abbr in common_abbrs:
+        # Replace periods in abbreviations with a special marker
+        text = text.replace(abbr, abbr.replace(".", "<period>"))
+
+    # Split by sentence ending punctuation
+    sentences = re.split(r'([.!?;…][\'")\]]*)', text)
+
+    # Combine the sentences with their punctuation
+    result = []
+    for i in range(0, len(sentences) - 1, 2):
+        if i+1 < len(sentences):
+            result.append(sentences[i] + sentences[i+1])
+        else:
+            result.append(sentences[i])
+
+    # Clean up sentences
+    cleaned_sentences = []
+    for s in result:
+        # Skip empty sentences
+        if not s.strip():
+            continue
+
+        # Restore periods in abbreviations
+        s = s.replace("<period>", ".")
+
+        # Remove extra whitespace
+        s = re.sub(r'\s+', ' ', s.strip())
+
+        # If sentence doesn't end with punctuation, it might be a fragment
+        if not re.search(r'[.!?;…]$', s):
+            # Only add if it's reasonably long
+            if len(s.split()) > 3:
+                cleaned_sentences.append(s)
+        else:
+            cleaned_sentences.append(s)
+
+    # If no sentences found, return original text as a single sentence
+    if not cleaned_sentences and text.strip():
+        return [text.strip()]
+
+    return cleaned_sentences
+
+def legacy_to_words(text):
+    """
+    Tokenize Vietnamese text into words using regex patterns.
+
+    Args:
+        text: String text to tokenize
+
+    Returns:
+        List of words
+    """
+    if not text:
+        return []
+
+    # Normalize whitespace
+    text = re.sub(r'\s+', ' ', text.strip())
+
+    # Handle Vietnamese compound words with hyphens: maintain them as single tokens
+    # For example: "đông-nam", "tây-bắc"
+    text = re.sub(r'(\w+)-(\w+)', r'\1_\2', text)
+
+    # Split by whitespace and punctuation
+    words = re.findall(r'\b[\w_]+\b|\S', text)
+
+    # Clean up words
+    cleaned_words = []
+    for word in words:
+        # Skip punctuation and single characters except for Vietnamese single-char words
+        if len(word) == 1 and not re.match(r'[aàáảãạăằắẳẵặâầấẩẫậeèéẻẽẹêềếểễệiìíỉĩịoòóỏõọôồốổỗộơờớởỡợuùúủũụưừứửữựyỳýỷỹỵđ]', word.lower()):
+            if not word.isalnum():
+                continue
+
+        # Restore hyphens
+        word = word.replace('_', '-')
+
+        # Add to results if not empty
+        if word.strip():
+            cleaned_words.append(word)
+
+    return cleaned_words
+
+
+def check_equivalence(rng: random.Random, cases: int) -> None:
+    tokenizer = TokenizerVietnamese()
+    for _ in range(cases):
+        text = "".join(rng.choice(PIECES) + (" " if rng.random() < 0.3 else "")
+                       for _ in range(rng.randint(0, 25)))
+        assert tokenizer.to_words(text) == legacy_to_words(text), text
+        # The previous fallback returned the whole text with its abbreviation markers
+        expected = [sentence.replace("<period>", ".")
+                    for sentence in legacy_to_sentences(text)]
+        assert tokenizer.to_sentences(text) == expected, text
+    print(f"Identical results on {cases} random texts")
+
+
+def random_text(rng: random.Random, size: int) -> str:
+    sentences = []
+    length = 0
+    while length < size:
+        sentence = rng.choice(SENTENCES)
+        sentences.append(sentence)
+        length += len(sentence.encode("utf-8")) + 1
+    return " ".join(sentences)
+
+
+def timeit(func, text: str, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(text)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def tokenize_legacy(text: str) -> int:
+    return sum(len(legacy_to_words(sentence)) for sentence in legacy_to_sentences(text))
+
+
+def tokenize_compiled(text: str, tokenizer=TokenizerVietnamese()) -> int:
+    return sum(len(tokenizer.to_words(sentence)) for sentence in tokenizer.to_sentences(text))
+
+
+def tokenize_lazy(text: str, tokenizer=TokenizerVietnamese()) -> int:
+    return sum(sum(1 for _ in tokenizer.iter_words(sentence))
+               for sentence in tokenizer.iter_sentences(text))
+
+
+def main(args) -> None:
+    rng = random.Random(args.seed)
+    check_equivalence(rng, args.cases)
+    print(f"{'bytes':>10} {'legacy (ms)':>12} {'lists (ms)':>12} {'lazy (ms)':>12} {'speedup':>8}")
+    for size in args.sizes:
+        text = random_text(rng, size)
+        repeat = args.repeat if size < 1_000_000 else 1
+        legacy = timeit(tokenize_legacy, text, repeat)
+        compiled = timeit(tokenize_compiled, text, repeat)
+        lazy = timeit(tokenize_lazy, text, repeat)
+        print(f"{size:>10} {legacy * 1000:>12.2f} {compiled * 1000:>12.2f} "
+              f"{lazy * 1000:>12.2f} {legacy / compiled:>7.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+",
+                        default=[1_000, 100_000, 5_000_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--cases", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=0)
+    main(parser.parse_args())
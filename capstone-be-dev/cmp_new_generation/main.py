@@ -1,12 +1,28 @@
 import uvicorn
-from src.routers import actions_router
+from contextlib import asynccontextmanager
+from src.routers import actions_router, admin_router
+from src.executor import shutdown_executor, warm_process_pool
+from src.actions.ctxs import page_fetcher
+from src.actions.db import dispose_vector_stores, document_queue
 from fastapi import FastAPI
 from langchain_core.globals import set_verbose, set_debug
 set_verbose(False)
 set_debug(False)
 
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await document_queue.start()
+    warm_process_pool()
+    yield
+    await page_fetcher.close()
+    # Lưu hết tài liệu còn trong hàng đợi trước khi đóng kết nối database
+    await document_queue.close()
+    await dispose_vector_stores()
+    shutdown_executor()
+
+
+app = FastAPI(lifespan=lifespan)
 
 
 @app.get("/")
@@ -14,6 +30,7 @@ async def root():
     return {"message": "Hello World"}
 
 app.include_router(actions_router)
+app.include_router(admin_router)
 
 if __name__ == "__main__":
     uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
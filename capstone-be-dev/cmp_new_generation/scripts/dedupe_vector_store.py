@@ -0,0 +1,97 @@
+"""
+One-off maintenance command collapsing duplicate documents of the vector store.
+
+Documents saved before ids were derived from the content have random ids, so the same
+answer or summary may be stored many times. The command groups the documents of the
+collection by their content-addressed id (normalized content, location and topic), keeps
+one document per group under that id and deletes the others. Embeddings are not
+recomputed.
+
+Usage:
+    python scripts/dedupe_vector_store.py --dry-run
+    python scripts/dedupe_vector_store.py
+"""
+import argparse
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+from sqlalchemy import delete, select, update
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.actions.db.vector_store import document_id, get_vector_store  # noqa: E402
+
+# Số id tối đa trong một câu lệnh DELETE
+DELETE_CHUNK_SIZE = 500
+
+
+def plan(store) -> tuple[list[str], dict[str, tuple[str, dict]]]:
+    """
+    Find the duplicates of the collection.
+
+    Returns:
+        The ids to delete, and the kept documents to rename, as
+        old id -> (new id, metadata).
+    """
+    EmbeddingStore = store.EmbeddingStore
+    groups: dict[str, list[tuple[str, dict]]] = defaultdict(list)
+    with store._make_sync_session() as session:
+        collection = store.get_collection(session)
+        rows = session.execute(
+            select(EmbeddingStore.id, EmbeddingStore.document, EmbeddingStore.cmetadata)
+            .where(EmbeddingStore.collection_id == collection.uuid)
+            .execution_options(yield_per=1000))
+        for id, document, metadata in rows:
+            metadata = metadata or {}
+            key = document_id(
+                document or "", metadata.get("location", ""), metadata.get("topic", ""))
+            groups[key].append((str(id), metadata))
+
+    to_delete: list[str] = []
+    to_rename: dict[str, tuple[str, dict]] = {}
+    for canonical, members in groups.items():
+        ids = [id for id, _ in members]
+        keep = canonical if canonical in ids else ids[0]
+        to_delete.extend(id for id in ids if id != keep)
+        if keep != canonical:
+            metadata = dict(members[ids.index(keep)][1])
+            metadata["id"] = canonical
+            to_rename[keep] = (canonical, metadata)
+    return to_delete, to_rename
+
+
+def apply(store, to_delete: list[str], to_rename: dict[str, tuple[str, dict]]) -> None:
+    """Delete the duplicates and rename the kept documents, in one transaction."""
+    EmbeddingStore = store.EmbeddingStore
+    with store._make_sync_session() as session:
+        for start in range(0, len(to_delete), DELETE_CHUNK_SIZE):
+            chunk = to_delete[start:start + DELETE_CHUNK_SIZE]
+            session.execute(delete(EmbeddingStore).where(
+                EmbeddingStore.id.in_(chunk)))
+        for old_id, (new_id, metadata) in to_rename.items():
+            session.execute(
+                update(EmbeddingStore)
+                .where(EmbeddingStore.id == old_id)
+                .values(id=new_id, cmetadata=metadata))
+        session.commit()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--dry-run", action="store_true",
+                        help="only report what would change")
+    args = parser.parse_args()
+
+    store = get_vector_store()
+    to_delete, to_rename = plan(store)
+    print(f"Duplicates to delete: {len(to_delete)}")
+    print(f"Documents to re-id:   {len(to_rename)}")
+    if args.dry_run or (not to_delete and not to_rename):
+        return
+    apply(store, to_delete, to_rename)
+    print("Done")
+
+
+if __name__ == "__main__":
+    main()
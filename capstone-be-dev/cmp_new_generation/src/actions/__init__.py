@@ -1,19 +1,42 @@
-from .chains import (
-    get_chains,
-    select_chain,
-)
-from .ctxs import (
-    search_google,
-    get_content_from_url,
-    get_content_from_urls,
-)
-from .summarize import summarize
-from .db import (
-    save_to_vector_store,
-    get_from_vector_store,
-    create_document,
-)
+import importlib
+
+# Các module con chỉ được import khi cần: worker của process pool chỉ import
+# summarize/questions, không phải tạo LLM, embeddings hay kết nối database
+_EXPORTS = {
+    "get_chains": ".chains",
+    "select_chain": ".chains",
+    "search_google": ".ctxs",
+    "get_content_from_url": ".ctxs",
+    "get_content_from_urls": ".ctxs",
+    "asearch_google": ".ctxs",
+    "aget_content_from_url": ".ctxs",
+    "aget_content_from_urls": ".ctxs",
+    "summarize": ".summarize",
+    "save_to_vector_store": ".db",
+    "get_from_vector_store": ".db",
+    "asave_to_vector_store": ".db",
+    "aget_from_vector_store": ".db",
+    "aget_many_from_vector_store": ".db",
+    "create_document": ".db",
+    "DialogueTurn": ".dialogue",
+    "run_dialogue": ".dialogue",
+    "extract_questions": ".questions",
+    "extract_questions_batch": ".questions",
+}
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
 
 __all__ = ["get_chains", "select_chain", "search_google", "get_content_from_url",
-           "get_content_from_urls", "summarize", "save_to_vector_store",
-           "get_from_vector_store", "create_document"]
+           "get_content_from_urls", "asearch_google", "aget_content_from_url",
+           "aget_content_from_urls", "summarize", "save_to_vector_store",
+           "get_from_vector_store", "asave_to_vector_store", "aget_from_vector_store",
+           "aget_many_from_vector_store", "create_document", "DialogueTurn",
+           "run_dialogue", "extract_questions", "extract_questions_batch"]
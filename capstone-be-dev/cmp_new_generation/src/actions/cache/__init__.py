@@ -0,0 +1,5 @@
+from .semantic import SemanticCache, get_answer_cache, answer_cache_stats
+from .llm import TieredLLMCache, get_llm_cache, llm_cache_stats, invalidate_llm_cache
+
+__all__ = ["SemanticCache", "get_answer_cache", "answer_cache_stats",
+           "TieredLLMCache", "get_llm_cache", "llm_cache_stats", "invalidate_llm_cache"]
@@ -0,0 +1,320 @@
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, List, Optional, Sequence, Tuple
+
+from langchain_core.caches import RETURN_VAL_TYPE, BaseCache
+from langchain_core.messages import message_to_dict, messages_from_dict
+from langchain_core.outputs import ChatGeneration, Generation
+
+from ...executor import run_blocking
+from ...settings import LLM_CACHE_MAX_ENTRIES, LLM_CACHE_PATH, LLM_CACHE_TTL
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def llm_cache_key(prompt: str, llm_string: str) -> str:
+    """Cache key of a prompt sent to an LLM configuration (model and parameters)."""
+    return hashlib.sha256(f"{llm_string}\0{prompt}".encode("utf-8")).hexdigest()
+
+
+class LLMCacheStore:
+    """
+    SQLite storage shared by every LLM cache namespace.
+
+    Attributes:
+        path (str): Path of the SQLite database, empty to disable the disk tier.
+    """
+
+    def __init__(self, path: str = LLM_CACHE_PATH) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        if path:
+            try:
+                self._conn = sqlite3.connect(
+                    path, timeout=5, check_same_thread=False)
+                self._conn.execute("PRAGMA journal_mode=WAL")
+                self._conn.execute(
+                    "CREATE TABLE IF NOT EXISTS llm_cache ("
+                    "namespace TEXT NOT NULL, key TEXT NOT NULL, "
+                    "generations TEXT NOT NULL, created_at REAL NOT NULL, "
+                    "PRIMARY KEY (namespace, key))")
+                self._conn.commit()
+            except sqlite3.Error as e:
+                logger.error(f"LLM cache disk tier disabled: {str(e)}")
+                self._conn = None
+
+    @property
+    def enabled(self) -> bool:
+        return self._conn is not None
+
+    def get(self, namespace: str, key: str, min_created_at: float) -> Optional[Tuple[str, float]]:
+        if self._conn is None:
+            return None
+        with self._lock:
+            try:
+                return self._conn.execute(
+                    "SELECT generations, created_at FROM llm_cache "
+                    "WHERE namespace = ? AND key = ? AND created_at > ?",
+                    (namespace, key, min_created_at)).fetchone()
+            except sqlite3.Error as e:
+                logger.error(f"Error reading LLM cache: {str(e)}")
+                return None
+
+    def set(self, namespace: str, key: str, generations: str, created_at: float) -> None:
+        if self._conn is None:
+            return
+        with self._lock:
+            try:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO llm_cache (namespace, key, generations, created_at) "
+                    "VALUES (?, ?, ?, ?)", (namespace, key, generations, created_at))
+                self._conn.commit()
+            except sqlite3.Error as e:
+                logger.error(f"Error writing LLM cache: {str(e)}")
+
+    def delete(self, namespace: str, min_created_at: Optional[float] = None) -> None:
+        """Delete every entry of a namespace, or only the expired ones if `min_created_at` is set."""
+        if self._conn is None:
+            return
+        with self._lock:
+            try:
+                if min_created_at is None:
+                    self._conn.execute(
+                        "DELETE FROM llm_cache WHERE namespace = ?", (namespace,))
+                else:
+                    self._conn.execute(
+                        "DELETE FROM llm_cache WHERE namespace = ? AND created_at <= ?",
+                        (namespace, min_created_at))
+                self._conn.commit()
+            except sqlite3.Error as e:
+                logger.error(f"Error deleting LLM cache: {str(e)}")
+
+    def count(self, namespace: str) -> int:
+        if self._conn is None:
+            return 0
+        with self._lock:
+            try:
+                return self._conn.execute(
+                    "SELECT COUNT(*) FROM llm_cache WHERE namespace = ?",
+                    (namespace,)).fetchone()[0]
+            except sqlite3.Error as e:
+                logger.error(f"Error reading LLM cache: {str(e)}")
+                return 0
+
+
+class TieredLLMCache(BaseCache):
+    """
+    Exact-match LLM response cache with an in-memory LRU tier and a SQLite tier.
+
+    Entries are keyed on the rendered prompt and the LLM string, which LangChain
+    builds from the model name and the invocation parameters, so changing the model
+    or a parameter never returns a stale answer. Both tiers expire entries after
+    `ttl` seconds; hits on disk are promoted to memory.
+
+    Attributes:
+        namespace (str): Name of the chain using the cache, used for stats and invalidation.
+        store (LLMCacheStore): The disk tier.
+        ttl (float): Lifetime of an entry in seconds.
+        max_entries (int): Maximum number of entries kept in memory.
+    """
+
+    # Xóa các entry hết hạn trên đĩa sau mỗi N lần ghi
+    PURGE_EVERY = 100
+
+    def __init__(
+        self,
+        namespace: str,
+        store: LLMCacheStore,
+        ttl: float = LLM_CACHE_TTL,
+        max_entries: int = LLM_CACHE_MAX_ENTRIES,
+    ) -> None:
+        self.namespace = namespace
+        self.store = store
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._memory: "OrderedDict[str, Tuple[RETURN_VAL_TYPE, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._writes = 0
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        key = llm_cache_key(prompt, llm_string)
+        generations = self._lookup_memory(key)
+        if generations is None:
+            generations = self._lookup_disk(key)
+        return generations
+
+    async def alookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        key = llm_cache_key(prompt, llm_string)
+        generations = self._lookup_memory(key)
+        if generations is None:
+            if self.store.enabled:
+                generations = await run_blocking(self._lookup_disk, key)
+            else:
+                generations = self._lookup_disk(key)
+        return generations
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        key = llm_cache_key(prompt, llm_string)
+        now = time.time()
+        self._remember(key, return_val, now)
+        self._write(key, _encode(return_val), now)
+
+    async def aupdate(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        key = llm_cache_key(prompt, llm_string)
+        now = time.time()
+        self._remember(key, return_val, now)
+        if self.store.enabled:
+            await run_blocking(self._write, key, _encode(return_val), now)
+
+    def clear(self, **kwargs: Any) -> None:
+        """Invalidate every entry of this namespace in both tiers."""
+        with self._lock:
+            self._memory.clear()
+        self.store.delete(self.namespace)
+
+    async def aclear(self, **kwargs: Any) -> None:
+        await run_blocking(self.clear)
+
+    def stats(self) -> dict:
+        """Hit and miss counters and the size of both tiers."""
+        disk_entries = self.store.count(self.namespace)
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0,
+                "memory_entries": len(self._memory),
+                "max_entries": self.max_entries,
+                "disk_entries": disk_entries,
+                "ttl": self.ttl,
+            }
+
+    def _lookup_memory(self, key: str) -> Optional[RETURN_VAL_TYPE]:
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is None:
+                return None
+            generations, created_at = entry
+            if created_at <= time.time() - self.ttl:
+                del self._memory[key]
+                return None
+            self._memory.move_to_end(key)
+            self.memory_hits += 1
+            return generations
+
+    def _lookup_disk(self, key: str) -> Optional[RETURN_VAL_TYPE]:
+        row = self.store.get(self.namespace, key, time.time() - self.ttl)
+        generations = None
+        if row is not None:
+            try:
+                generations = _decode(row[0])
+            except Exception as e:
+                logger.error(f"Error decoding LLM cache entry: {str(e)}")
+        with self._lock:
+            if generations is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+        self._remember(key, generations, row[1])
+        return generations
+
+    def _write(self, key: str, payload: str, now: float) -> None:
+        self.store.set(self.namespace, key, payload, now)
+        self._writes += 1
+        if self._writes % self.PURGE_EVERY == 0:
+            self.store.delete(self.namespace, now - self.ttl)
+
+    def _remember(self, key: str, generations: RETURN_VAL_TYPE, created_at: float) -> None:
+        with self._lock:
+            self._memory.pop(key, None)
+            self._memory[key] = (generations, created_at)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+
+def _encode(generations: Sequence[Generation]) -> str:
+    return json.dumps([
+        {
+            "text": generation.text,
+            "generation_info": generation.generation_info,
+            "message": message_to_dict(generation.message)
+            if isinstance(generation, ChatGeneration) else None,
+        }
+        for generation in generations
+    ], ensure_ascii=False)
+
+
+def _decode(payload: str) -> List[Generation]:
+    generations: List[Generation] = []
+    for item in json.loads(payload):
+        if item["message"] is not None:
+            message = messages_from_dict([item["message"]])[0]
+            generations.append(ChatGeneration(
+                message=message, generation_info=item["generation_info"]))
+        else:
+            generations.append(Generation(
+                text=item["text"], generation_info=item["generation_info"]))
+    return generations
+
+
+llm_cache_store = LLMCacheStore()
+_llm_caches: dict[str, TieredLLMCache] = {}
+_llm_caches_lock = threading.Lock()
+
+
+def get_llm_cache(namespace: str) -> TieredLLMCache:
+    """
+    Get the LLM cache of a chain, creating it on first use.
+
+    Args:
+        namespace: Name of the chain.
+
+    Returns:
+        The cache shared by every call of that chain.
+    """
+    with _llm_caches_lock:
+        cache = _llm_caches.get(namespace)
+        if cache is None:
+            cache = _llm_caches[namespace] = TieredLLMCache(
+                namespace, llm_cache_store)
+        return cache
+
+
+def llm_cache_stats() -> dict:
+    """Stats of every LLM cache, keyed by chain."""
+    with _llm_caches_lock:
+        caches = dict(_llm_caches)
+    return {namespace: cache.stats() for namespace, cache in caches.items()}
+
+
+def invalidate_llm_cache(namespace: Optional[str] = None) -> List[str]:
+    """
+    Invalidate the LLM cache of one chain, or of every chain.
+
+    Args:
+        namespace: Name of the chain, None for all of them.
+
+    Returns:
+        The names of the invalidated caches.
+    """
+    with _llm_caches_lock:
+        if namespace is None:
+            caches = list(_llm_caches.values())
+        else:
+            caches = [_llm_caches[namespace]] if namespace in _llm_caches else []
+    for cache in caches:
+        cache.clear()
+    return [cache.namespace for cache in caches]
@@ -0,0 +1,172 @@
+import logging
+import threading
+import time
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from ...settings import (
+    SEMANTIC_CACHE_MAX_ENTRIES,
+    SEMANTIC_CACHE_THRESHOLD,
+    SEMANTIC_CACHE_TTL,
+)
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class SemanticCache:
+    """
+    Answer cache matching questions by embedding similarity.
+
+    Question embeddings are L2-normalized and kept in one NumPy matrix, so a lookup
+    is a single matrix-vector product followed by an argmax over cosine similarities.
+    Entries expire after `ttl` seconds; when the cache is full, the least recently
+    used entry is evicted.
+
+    Attributes:
+        threshold (float): Minimum cosine similarity for a cached answer to be reused.
+        ttl (float): Lifetime of an entry in seconds.
+        max_entries (int): Maximum number of cached answers.
+    """
+
+    def __init__(
+        self,
+        threshold: float = SEMANTIC_CACHE_THRESHOLD,
+        ttl: float = SEMANTIC_CACHE_TTL,
+        max_entries: int = SEMANTIC_CACHE_MAX_ENTRIES,
+    ) -> None:
+        self.threshold = threshold
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._vectors: Optional[np.ndarray] = None
+        self._created = np.zeros(max_entries)
+        self._last_used = np.zeros(max_entries)
+        self._answers: List[Optional[str]] = [None] * max_entries
+        self._size = 0
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, vector: List[float]) -> Optional[Tuple[str, float]]:
+        """
+        Find the cached answer of the most similar question.
+
+        Args:
+            vector: Embedding of the incoming question.
+
+        Returns:
+            The cached answer and its similarity, or None if no question is similar enough.
+        """
+        query = _normalize(vector)
+        now = time.time()
+        with self._lock:
+            self._expire(now)
+            match = None
+            if self._size and self._vectors is not None and query.shape[0] == self._vectors.shape[1]:
+                similarities = self._vectors[:self._size] @ query
+                best = int(np.argmax(similarities))
+                if similarities[best] >= self.threshold:
+                    self._last_used[best] = now
+                    match = (self._answers[best], float(similarities[best]))
+
+            if match:
+                self.hits += 1
+            else:
+                self.misses += 1
+            return match
+
+    def add(self, vector: List[float], answer: str) -> None:
+        """
+        Cache the answer of a question.
+
+        Args:
+            vector: Embedding of the question.
+            answer: The generated answer.
+        """
+        entry = _normalize(vector)
+        now = time.time()
+        with self._lock:
+            if self._vectors is None or self._vectors.shape[1] != entry.shape[0]:
+                self._vectors = np.zeros(
+                    (self.max_entries, entry.shape[0]), dtype=np.float32)
+                self._size = 0
+            self._expire(now)
+            if self._size < self.max_entries:
+                index = self._size
+                self._size += 1
+            else:
+                index = int(np.argmin(self._last_used[:self._size]))
+            self._vectors[index] = entry
+            self._created[index] = now
+            self._last_used[index] = now
+            self._answers[index] = answer
+
+    def clear(self) -> None:
+        with self._lock:
+            self._size = 0
+            self._answers = [None] * self.max_entries
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": self._size,
+                "max_entries": self.max_entries,
+                "threshold": self.threshold,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+    def _expire(self, now: float) -> None:
+        """Drop expired entries by compacting the live ones to the front."""
+        if not self._size:
+            return
+        alive = self._created[:self._size] > now - self.ttl
+        if alive.all():
+            return
+        keep = np.flatnonzero(alive)
+        count = len(keep)
+        self._vectors[:count] = self._vectors[keep]
+        self._created[:count] = self._created[keep]
+        self._last_used[:count] = self._last_used[keep]
+        self._answers[:count] = [self._answers[i] for i in keep]
+        self._size = count
+
+
+def _normalize(vector: List[float]) -> np.ndarray:
+    array = np.asarray(vector, dtype=np.float32)
+    norm = np.linalg.norm(array)
+    return array / norm if norm else array
+
+
+# Mỗi endpoint một cache riêng vì các chain dùng prompt khác nhau
+_answer_caches: dict[str, SemanticCache] = {}
+_answer_caches_lock = threading.Lock()
+
+
+def get_answer_cache(name: str) -> SemanticCache:
+    """
+    Get the semantic answer cache of an endpoint, creating it on first use.
+
+    Args:
+        name: Name of the endpoint.
+
+    Returns:
+        The cache shared by every request of that endpoint.
+    """
+    with _answer_caches_lock:
+        cache = _answer_caches.get(name)
+        if cache is None:
+            cache = _answer_caches[name] = SemanticCache()
+        return cache
+
+
+def answer_cache_stats() -> dict:
+    """Stats of every semantic answer cache, keyed by endpoint."""
+    with _answer_caches_lock:
+        caches = dict(_answer_caches)
+    return {name: cache.stats() for name, cache in caches.items()}
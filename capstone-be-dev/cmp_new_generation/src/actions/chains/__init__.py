@@ -1,4 +1,7 @@
-from .llms import get_chains, select_chain
+from .llms import build_chain, get_chains, select_chain
+from .metrics import ChainMetrics, chain_metrics_stats
 from .mistral_chat import ChatMistralAI
+from .router import LLMRouter, router_stats
 
-__all__ = ["get_chains", "select_chain", "ChatMistralAI"]
+__all__ = ["build_chain", "get_chains", "select_chain", "ChainMetrics", "chain_metrics_stats",
+           "ChatMistralAI", "LLMRouter", "router_stats"]
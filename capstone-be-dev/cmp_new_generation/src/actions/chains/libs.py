@@ -12,8 +12,6 @@ from langchain.sql_database import SQLDatabase  # cơ sở dữ liệu
 from langchain_core.output_parsers import StrOutputParser, PydanticOutputParser
 from langchain_core.runnables import RunnablePassthrough  # truyền đa dạng đối số
 from operator import itemgetter  # lấy giá trị từ dict
-# Cache
-from langchain.cache import InMemoryCache
 
 # Note: We use our custom wrapper classes for MistralAI instead of these imports
 # from langchain_mistralai import ChatMistralAI, MistralAIEmbeddings
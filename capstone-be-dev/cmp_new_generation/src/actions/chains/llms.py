@@ -1,10 +1,20 @@
 from .libs import *
 from fastapi import Depends
 from typing import Annotated
-from src.settings import MODEL_NAME, API_KEY
+from src.settings import (
+    MODEL_NAME, API_KEY, LLM_CACHE_CHAINS, LLM_BACKENDS, LLM_ROUTES, LLM_HEDGE_CHAINS,
+    LLM_CHAIN_CONFIG,
+    OLLAMA_BASE_URL, OLLAMA_MODEL,
+    OPENAI_COMPAT_BASE_URL, OPENAI_COMPAT_API_KEY, OPENAI_COMPAT_MODEL,
+)
 from .templates import *
-from typing import Literal
+from typing import Dict, List, Literal, Optional
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_ollama import ChatOllama
 from .mistral_chat import ChatMistralAI
+from .router import LLMRouter
+from .metrics import get_chain_metrics
+from ..cache import get_llm_cache
 import logging
 
 # Configure logging
@@ -20,6 +30,104 @@ llm = ChatMistralAI(
 )
 
 
+_backends: Dict[str, Optional[BaseChatModel]] = {"mistral": llm}
+
+
+def create_backend(name: str) -> Optional[BaseChatModel]:
+    """
+    Create an LLM backend by name, None if it is not configured.
+    """
+    if name == "ollama":
+        if not OLLAMA_MODEL:
+            return None
+        return ChatOllama(model=OLLAMA_MODEL, base_url=OLLAMA_BASE_URL)
+    if name == "openai":
+        if not OPENAI_COMPAT_BASE_URL or not OPENAI_COMPAT_MODEL:
+            return None
+        try:
+            from langchain_openai import ChatOpenAI
+        except ImportError:
+            logger.error(
+                "OpenAI-compatible backend requires langchain-openai, backend disabled")
+            return None
+        return ChatOpenAI(
+            base_url=OPENAI_COMPAT_BASE_URL,
+            api_key=OPENAI_COMPAT_API_KEY or "none",
+            model=OPENAI_COMPAT_MODEL,
+        )
+    raise ValueError(f"Unknown LLM backend: {name}")
+
+
+def get_backend(name: str) -> Optional[BaseChatModel]:
+    """
+    Get an LLM backend shared by every chain, created on first use.
+    """
+    if name not in _backends:
+        _backends[name] = create_backend(name)
+    return _backends[name]
+
+
+def configure_backend(backend: BaseChatModel, chain_name: str) -> BaseChatModel:
+    """
+    Copy of a backend with the model, max tokens, temperature and hedging of a chain.
+
+    Only the Mistral backend is configured (LLM_CHAIN_CONFIG, LLM_HEDGE_CHAINS);
+    the copy shares the HTTP clients of the base LLM. Other backends keep their
+    own model and settings.
+    """
+    if not isinstance(backend, ChatMistralAI):
+        return backend
+    update = {}
+    config = LLM_CHAIN_CONFIG.get(chain_name)
+    if config is not None:
+        update.update(
+            model=config["model"] or backend.model,
+            max_tokens=config["max_tokens"],
+            temperature=config["temperature"],
+        )
+    if chain_name in LLM_HEDGE_CHAINS:
+        update["hedge_group"] = chain_name
+    return backend.model_copy(update=update) if update else backend
+
+
+def get_llm(chain_name: str):
+    """
+    Get the LLM of a chain.
+
+    Chains with several configured backends (LLM_ROUTES, LLM_BACKENDS) get an
+    LLMRouter over them, other chains the single backend. The Mistral backend
+    uses the model and generation limits of the chain (see configure_backend),
+    the response cache is added if the chain opted in (LLM_CACHE_CHAINS) and the
+    stop sequences of the chain are bound to every call.
+    """
+    names: List[str] = [
+        name for name in LLM_ROUTES.get(chain_name, LLM_BACKENDS) if get_backend(name) is not None]
+    if not names:
+        logger.error(f"No LLM backend configured for {chain_name}, using mistral")
+        names = ["mistral"]
+    backends = [configure_backend(get_backend(name), chain_name) for name in names]
+    if len(names) == 1:
+        model = backends[0]
+    else:
+        # Mỗi model Mistral có độ trễ riêng: tách thống kê theo model
+        stats_names = [
+            f"{name}:{backend.model}" if isinstance(backend, ChatMistralAI) else name
+            for name, backend in zip(names, backends)
+        ]
+        model = LLMRouter(backends=backends, backend_names=stats_names)
+        logger.info(f"LLM router for {chain_name}: {', '.join(stats_names)}")
+    if chain_name in LLM_CACHE_CHAINS:
+        model = model.model_copy(update={"cache": get_llm_cache(chain_name)})
+    config = LLM_CHAIN_CONFIG.get(chain_name)
+    if config is not None:
+        logger.info(
+            f"LLM for {chain_name}: model {config['model']}, max_tokens {config['max_tokens']}, "
+            f"temperature {config['temperature']}")
+        if config["stop"]:
+            return model.bind(stop=config["stop"])
+    return model
+
+
 def get_chains(
     llm: BaseLLM,
     template: PromptTemplate,
@@ -29,20 +137,21 @@ def get_chains(
     )
 
 
-alex_professor_it = get_chains(
-    llm=llm,
-    template=template_alex_professor_it,
-)
+def build_chain(chain_name: str, template: PromptTemplate):
+    """
+    Build a chain from its configuration, recording the latency and token usage
+    of its LLM calls (see ChainMetrics).
+    """
+    return get_chains(llm=get_llm(chain_name), template=template).with_config(
+        run_name=chain_name, callbacks=[get_chain_metrics(chain_name)])
 
-alice_student_it = get_chains(
-    llm=llm,
-    template=template_alice_student_it,
-)
 
-generate_links_from_question = get_chains(
-    llm=llm,
-    template=template_generate_links_from_question,
-)
+alex_professor_it = build_chain("alex_professor_it", template_alex_professor_it)
+
+alice_student_it = build_chain("alice_student_it", template_alice_student_it)
+
+generate_links_from_question = build_chain(
+    "generate_links_from_question", template_generate_links_from_question)
 
 
 def select_chain(
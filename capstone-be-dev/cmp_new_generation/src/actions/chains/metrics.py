@@ -0,0 +1,126 @@
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.messages import BaseMessage
+from langchain_core.outputs import LLMResult
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Số lời gọi gần nhất dùng để tính percentile độ trễ
+LATENCY_WINDOW = 200
+
+
+class ChainMetrics(BaseCallbackHandler):
+    """
+    Callback handler recording the latency and token usage of the LLM calls of a chain.
+
+    Token usage is read from the `usage_metadata` of the generated messages.
+    Responses served by the LLM cache are counted apart and add no tokens.
+
+    Attributes:
+        name (str): Name of the chain.
+    """
+
+    # Chỉ cập nhật bộ đếm, không cần chạy trong executor
+    run_inline = True
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._lock = threading.Lock()
+        self._started: Dict[UUID, float] = {}
+        self._latencies: Deque[float] = deque(maxlen=LATENCY_WINDOW)
+        self.calls = 0
+        self.errors = 0
+        self.cache_hits = 0
+        self.input_tokens = 0
+        self.output_tokens = 0
+
+    def on_chat_model_start(
+        self, serialized: Dict[str, Any], messages: List[List[BaseMessage]], *, run_id: UUID, **kwargs: Any
+    ) -> None:
+        self._started[run_id] = time.perf_counter()
+
+    def on_llm_start(self, serialized: Dict[str, Any], prompts: List[str], *, run_id: UUID, **kwargs: Any) -> None:
+        self._started[run_id] = time.perf_counter()
+
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any) -> None:
+        latency = self._elapsed(run_id)
+        usage = _usage(response)
+        with self._lock:
+            self.calls += 1
+            if latency is not None:
+                self._latencies.append(latency)
+            if usage is None:
+                return
+            if usage.get("total_cost") == 0:
+                # Langchain đặt total_cost = 0 cho kết quả lấy từ cache
+                self.cache_hits += 1
+                return
+            self.input_tokens += usage.get("input_tokens", 0)
+            self.output_tokens += usage.get("output_tokens", 0)
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._elapsed(run_id)
+        with self._lock:
+            self.calls += 1
+            self.errors += 1
+
+    def stats(self) -> dict:
+        """Latency percentiles and token usage of the chain."""
+        with self._lock:
+            latencies = sorted(self._latencies)
+            billed = self.calls - self.errors - self.cache_hits
+            return {
+                "calls": self.calls,
+                "errors": self.errors,
+                "cache_hits": self.cache_hits,
+                "latency_avg": sum(latencies) / len(latencies) if latencies else None,
+                "latency_p50": latencies[int(0.5 * (len(latencies) - 1))] if latencies else None,
+                "latency_p90": latencies[int(0.9 * (len(latencies) - 1))] if latencies else None,
+                "input_tokens": self.input_tokens,
+                "output_tokens": self.output_tokens,
+                "output_tokens_avg": self.output_tokens / billed if billed > 0 else None,
+            }
+
+    def _elapsed(self, run_id: UUID) -> Optional[float]:
+        started = self._started.pop(run_id, None)
+        return time.perf_counter() - started if started is not None else None
+
+
+def _usage(response: LLMResult) -> Optional[dict]:
+    """Summed `usage_metadata` of the generated messages, None if none reports it."""
+    usage: Optional[dict] = None
+    for generations in response.generations:
+        for generation in generations:
+            metadata = getattr(getattr(generation, "message", None), "usage_metadata", None)
+            if not metadata:
+                continue
+            usage = usage or {"input_tokens": 0, "output_tokens": 0}
+            usage["input_tokens"] += metadata.get("input_tokens", 0)
+            usage["output_tokens"] += metadata.get("output_tokens", 0)
+            if "total_cost" in metadata:
+                usage["total_cost"] = metadata["total_cost"]
+    return usage
+
+
+_metrics: Dict[str, ChainMetrics] = {}
+
+
+def get_chain_metrics(name: str) -> ChainMetrics:
+    """Get the metrics handler of a chain, created on first use."""
+    metrics = _metrics.get(name)
+    if metrics is None:
+        metrics = _metrics[name] = ChainMetrics(name)
+    return metrics
+
+
+def chain_metrics_stats() -> Dict[str, dict]:
+    """Latency and token usage of every chain."""
+    return {name: metrics.stats() for name, metrics in _metrics.items()}
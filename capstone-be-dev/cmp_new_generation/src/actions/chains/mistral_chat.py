@@ -1,10 +1,14 @@
 from langchain_mistralai import ChatMistralAI as BaseChatMistralAI
+from langchain_mistralai.chat_models import global_ssl_context
 from ...settings import API_KEY, MODEL_NAME
+from ...upstream import controlled_clients, get_hedger, mistral_budget, mistral_controller
 import httpx
 import logging
-from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 from typing import Any, Dict, List, Mapping, Optional, Union
-from langchain_core.callbacks.manager import CallbackManagerForLLMRun
+from langchain_core.callbacks.manager import (
+    AsyncCallbackManagerForLLMRun,
+    CallbackManagerForLLMRun,
+)
 from langchain_core.language_models.chat_models import BaseChatModel
 from langchain_core.messages import (
     AIMessage,
@@ -21,10 +25,23 @@ logger = logging.getLogger(__name__)
 
 class ChatMistralAI(BaseChatMistralAI):
     """
-    A wrapper around the ChatMistralAI class that adds retry logic 
-    for HTTPStatusError (especially 429 rate limit errors).
+    A wrapper around the ChatMistralAI class whose requests go through the
+    shared Mistral concurrency controller.
+
+    The controller limits in-flight calls (AIMD), honours `Retry-After` and
+    retries only timeouts, connection errors and retryable statuses, so the
+    retries of langchain_mistralai are disabled.
+
+    With `hedge_group` set, async calls are hedged (see Hedger): a call slower
+    than the recent latencies of its group is sent a second time and the first
+    response wins.
+
+    Attributes:
+        hedge_group (Optional[str]): Hedger used by async calls, None to disable hedging.
     """
 
+    hedge_group: Optional[str] = None
+
     def __init__(
         self,
         api_key: Optional[str] = API_KEY,
@@ -32,19 +49,28 @@ class ChatMistralAI(BaseChatMistralAI):
         **kwargs: Any,
     ) -> None:
         """Initialize the ChatMistralAI wrapper."""
+        kwargs.setdefault("max_retries", 1)
         super().__init__(api_key=api_key, model=model, **kwargs)
+        self.client.close()
+        self.client, self.async_client = controlled_clients(
+            self.client, self.async_client, mistral_controller, mistral_budget, verify=global_ssl_context)
         logger.info(f"Initialized ChatMistralAI with model {model}")
 
-    @retry(
-        retry=retry_if_exception_type(
-            (httpx.TimeoutException, httpx.HTTPStatusError)),
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=10),
-        before_sleep=lambda retry_state: logger.warning(
-            f"MistralAI API call failed, retrying in {retry_state.next_action.sleep} seconds... "
-            f"Attempt {retry_state.attempt_number}/3"
-        )
-    )
+    def _create_message_dicts(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]],
+    ) -> Any:
+        """
+        Build the request messages and parameters, keeping the stop sequences.
+
+        The Mistral API accepts `stop`, but langchain_mistralai drops it.
+        """
+        message_dicts, params = super()._create_message_dicts(messages, None)
+        if stop:
+            params["stop"] = stop
+        return message_dicts, params
+
     def _generate(
         self,
         messages: List[BaseMessage],
@@ -53,7 +79,7 @@ class ChatMistralAI(BaseChatMistralAI):
         **kwargs: Any,
     ) -> Any:
         """
-        Generate chat completion with retry for rate limiting and connection issues.
+        Generate chat completion.
 
         Args:
             messages: The messages to use for chat completion.
@@ -67,9 +93,42 @@ class ChatMistralAI(BaseChatMistralAI):
         try:
             return super()._generate(messages, stop, run_manager, **kwargs)
         except httpx.HTTPStatusError as e:
-            if e.response.status_code == 429:
-                logger.warning("Rate limit exceeded. Retrying...")
+            logger.error(
+                f"MistralAI API call failed with status {e.response.status_code}")
             raise
         except Exception as e:
             logger.error(f"Error in chat completion: {str(e)}")
             raise
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> Any:
+        """
+        Asynchronously generate chat completion.
+
+        Args:
+            messages: The messages to use for chat completion.
+            stop: Sequences that immediately terminate generation.
+            run_manager: Async callback manager for LLM run.
+            **kwargs: Additional arguments for the API call.
+
+        Returns:
+            Chat completion result.
+        """
+        generate = super()._agenerate
+        try:
+            if self.hedge_group is None:
+                return await generate(messages, stop, run_manager, **kwargs)
+            return await get_hedger(self.hedge_group).run(
+                lambda: generate(messages, stop, run_manager, **kwargs))
+        except httpx.HTTPStatusError as e:
+            logger.error(
+                f"MistralAI API call failed with status {e.response.status_code}")
+            raise
+        except Exception as e:
+            logger.error(f"Error in async chat completion: {str(e)}")
+            raise
@@ -0,0 +1,323 @@
+import logging
+import random
+import threading
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Deque, Dict, Iterator, List, Optional, Tuple
+
+from langchain_core.callbacks.manager import (
+    AsyncCallbackManagerForLLMRun,
+    CallbackManagerForLLMRun,
+)
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import BaseMessage
+from langchain_core.outputs import ChatGenerationChunk, ChatResult
+
+from ...settings import (
+    LLM_ROUTER_COOLDOWN,
+    LLM_ROUTER_EXPLORE_RATE,
+    LLM_ROUTER_MAX_ERROR_RATE,
+    LLM_ROUTER_WINDOW,
+)
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Số lỗi liên tiếp khiến backend bị tạm ngưng ngay, không chờ đủ cửa sổ
+MAX_CONSECUTIVE_FAILURES = 3
+# Số mẫu tối thiểu trước khi xét tỉ lệ lỗi
+MIN_SAMPLES = 5
+
+
+class BackendStats:
+    """
+    Rolling latency and error rate of one LLM backend.
+
+    The last `window` calls are kept. A backend whose error rate over the window
+    reaches `max_error_rate`, or which fails MAX_CONSECUTIVE_FAILURES times in a
+    row, is unhealthy for `cooldown` seconds and then gets traffic again.
+
+    Attributes:
+        name (str): Name of the backend.
+        window (int): Number of calls kept.
+        max_error_rate (float): Error rate making the backend unhealthy.
+        cooldown (float): Seconds an unhealthy backend is skipped.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        window: int = LLM_ROUTER_WINDOW,
+        max_error_rate: float = LLM_ROUTER_MAX_ERROR_RATE,
+        cooldown: float = LLM_ROUTER_COOLDOWN,
+    ) -> None:
+        self.name = name
+        self.max_error_rate = max_error_rate
+        self.cooldown = cooldown
+        self._lock = threading.Lock()
+        self._calls: Deque[Tuple[float, bool]] = deque(maxlen=window)
+        self._consecutive_failures = 0
+        self._unhealthy_until = 0.0
+        self.total = 0
+        self.failures = 0
+
+    def record(self, latency: float, ok: bool) -> None:
+        """Record the outcome of a call."""
+        with self._lock:
+            self._calls.append((latency, ok))
+            self.total += 1
+            if ok:
+                self._consecutive_failures = 0
+                return
+            self.failures += 1
+            self._consecutive_failures += 1
+            if (self._consecutive_failures >= MAX_CONSECUTIVE_FAILURES
+                    or (len(self._calls) >= MIN_SAMPLES and self._error_rate() >= self.max_error_rate)):
+                self._unhealthy_until = time.monotonic() + self.cooldown
+                self._calls.clear()
+                self._consecutive_failures = 0
+                logger.warning(
+                    f"LLM backend {self.name} unhealthy, skipped for {self.cooldown} seconds")
+
+    @property
+    def healthy(self) -> bool:
+        return time.monotonic() >= self._unhealthy_until
+
+    @property
+    def latency(self) -> Optional[float]:
+        """Mean latency of the successful calls of the window, None before any."""
+        with self._lock:
+            latencies = [latency for latency, ok in self._calls if ok]
+        return sum(latencies) / len(latencies) if latencies else None
+
+    @property
+    def measured(self) -> bool:
+        """Whether the window holds any call."""
+        return bool(self._calls)
+
+    def stats(self) -> dict:
+        with self._lock:
+            latencies = sorted(latency for latency, ok in self._calls if ok)
+            error_rate = self._error_rate()
+        return {
+            "healthy": self.healthy,
+            "latency_avg": sum(latencies) / len(latencies) if latencies else None,
+            "latency_p90": latencies[int(0.9 * (len(latencies) - 1))] if latencies else None,
+            "error_rate": error_rate,
+            "window": len(self._calls),
+            "total": self.total,
+            "failures": self.failures,
+        }
+
+    def _error_rate(self) -> float:
+        if not self._calls:
+            return 0.0
+        return sum(1 for _, ok in self._calls if not ok) / len(self._calls)
+
+
+_stats: Dict[str, BackendStats] = {}
+
+
+def get_backend_stats(name: str) -> BackendStats:
+    """Stats of a backend, shared by every router using it."""
+    stats = _stats.get(name)
+    if stats is None:
+        stats = _stats[name] = BackendStats(name)
+    return stats
+
+
+def router_stats() -> Dict[str, dict]:
+    """Latency and error rate of every backend used by a router."""
+    return {name: stats.stats() for name, stats in _stats.items()}
+
+
+class LLMRouter(BaseChatModel):
+    """
+    Chat model sending each call to the fastest healthy of several backends.
+
+    Backends are ranked by the mean latency of their recent successful calls.
+    A backend without any recent call is tried first once, to measure it, and a
+    backend with only failed calls comes after the measured ones. A small share of
+    calls (LLM_ROUTER_EXPLORE_RATE) goes to a random healthy backend so every
+    latency stays up to date. When a backend fails, the call is retried on the
+    next one; unhealthy backends are only tried when all the others failed.
+    Streams fail over only before their first chunk.
+
+    Attributes:
+        backends (List[BaseChatModel]): The chat models, in order of preference.
+        backend_names (List[str]): Name of each backend, used for stats.
+    """
+
+    backends: List[BaseChatModel]
+    backend_names: List[str]
+
+    @property
+    def _llm_type(self) -> str:
+        return "llm-router"
+
+    @property
+    def _identifying_params(self) -> Dict[str, Any]:
+        # Tham số của từng backend (model, max_tokens, temperature...) nằm trong
+        # khóa cache, đổi cấu hình backend thì không dùng lại kết quả cũ
+        return {
+            "backends": [
+                {"name": name, "_type": backend._llm_type, **backend._identifying_params}
+                for name, backend in zip(self.backend_names, self.backends)
+            ]
+        }
+
+    def ranked_backends(self) -> List[Tuple[str, BaseChatModel]]:
+        """Backends in the order they should be tried for the next call."""
+        candidates = list(zip(self.backend_names, self.backends))
+
+        def key(item: Tuple[int, Tuple[str, BaseChatModel]]):
+            position, (name, _) = item
+            stats = get_backend_stats(name)
+            latency = stats.latency
+            # Backend chưa có lời gọi nào được thử trước để đo độ trễ,
+            # backend chỉ có lời gọi lỗi xếp sau các backend đã đo được
+            if not stats.measured:
+                group = 0
+            elif latency is not None:
+                group = 1
+            else:
+                group = 2
+            return (not stats.healthy, group, latency or 0.0, position)
+
+        ranked = [backend for _, backend in sorted(enumerate(candidates), key=key)]
+        healthy = [backend for backend in ranked if get_backend_stats(backend[0]).healthy]
+        if len(healthy) > 1 and random.random() < LLM_ROUTER_EXPLORE_RATE:
+            chosen = random.choice(healthy[1:])
+            ranked.remove(chosen)
+            ranked.insert(0, chosen)
+        return ranked
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        """
+        Generate chat completion on the best backend, failing over to the others.
+
+        Args:
+            messages: The messages to use for chat completion.
+            stop: Sequences that immediately terminate generation.
+            run_manager: Callback manager for LLM run.
+            **kwargs: Additional arguments for the API call.
+
+        Returns:
+            Chat completion result.
+        """
+        error: Optional[BaseException] = None
+        for name, backend in self.ranked_backends():
+            started = time.perf_counter()
+            try:
+                result = backend._generate(messages, stop=stop, run_manager=run_manager, **kwargs)
+            except Exception as e:
+                error = self._failed(name, started, e)
+                continue
+            get_backend_stats(name).record(time.perf_counter() - started, True)
+            return result
+        raise error
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        """
+        Asynchronously generate chat completion on the best backend, failing over to the others.
+
+        Args:
+            messages: The messages to use for chat completion.
+            stop: Sequences that immediately terminate generation.
+            run_manager: Async callback manager for LLM run.
+            **kwargs: Additional arguments for the API call.
+
+        Returns:
+            Chat completion result.
+        """
+        error: Optional[BaseException] = None
+        for name, backend in self.ranked_backends():
+            started = time.perf_counter()
+            try:
+                result = await backend._agenerate(messages, stop=stop, run_manager=run_manager, **kwargs)
+            except Exception as e:
+                error = self._failed(name, started, e)
+                continue
+            get_backend_stats(name).record(time.perf_counter() - started, True)
+            return result
+        raise error
+
+    def _stream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> Iterator[ChatGenerationChunk]:
+        error: Optional[BaseException] = None
+        for name, backend in self.ranked_backends():
+            started = time.perf_counter()
+            chunks = backend._stream(messages, stop=stop, run_manager=run_manager, **kwargs)
+            try:
+                first = next(chunks)
+            except StopIteration:
+                get_backend_stats(name).record(time.perf_counter() - started, True)
+                return
+            except Exception as e:
+                error = self._failed(name, started, e)
+                continue
+            yield first
+            yield from self._finish_stream(name, started, chunks)
+            return
+        raise error
+
+    async def _astream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        error: Optional[BaseException] = None
+        for name, backend in self.ranked_backends():
+            started = time.perf_counter()
+            chunks = backend._astream(messages, stop=stop, run_manager=run_manager, **kwargs)
+            try:
+                first = await chunks.__anext__()
+            except StopAsyncIteration:
+                get_backend_stats(name).record(time.perf_counter() - started, True)
+                return
+            except Exception as e:
+                error = self._failed(name, started, e)
+                continue
+            yield first
+            try:
+                async for chunk in chunks:
+                    yield chunk
+            except Exception:
+                get_backend_stats(name).record(time.perf_counter() - started, False)
+                raise
+            get_backend_stats(name).record(time.perf_counter() - started, True)
+            return
+        raise error
+
+    def _finish_stream(self, name: str, started: float, chunks: Iterator[ChatGenerationChunk]) -> Iterator[ChatGenerationChunk]:
+        try:
+            yield from chunks
+        except Exception:
+            get_backend_stats(name).record(time.perf_counter() - started, False)
+            raise
+        get_backend_stats(name).record(time.perf_counter() - started, True)
+
+    def _failed(self, name: str, started: float, error: Exception) -> Exception:
+        get_backend_stats(name).record(time.perf_counter() - started, False)
+        logger.warning(f"LLM backend {name} failed, trying next backend: {str(error)}")
+        return error
@@ -1,3 +1,18 @@
-from .gg import search_google, get_content_from_url, get_content_from_urls
+from .gg import (
+    search_google,
+    get_content_from_url,
+    get_content_from_urls,
+    asearch_google,
+    aget_content_from_url,
+    aget_content_from_urls,
+    search_cache,
+)
+from .fetcher import PageFetcher, PageResponse, page_fetcher
+from .content_cache import ContentCache, content_cache, canonical_url
+from .search_cache import SearchCache, normalize_query
 
-__all__ = ["search_google", "get_content_from_url", "get_content_from_urls"]
+__all__ = ["search_google", "get_content_from_url", "get_content_from_urls",
+           "asearch_google", "aget_content_from_url", "aget_content_from_urls",
+           "PageFetcher", "PageResponse", "page_fetcher",
+           "ContentCache", "content_cache", "canonical_url",
+           "SearchCache", "search_cache", "normalize_query"]
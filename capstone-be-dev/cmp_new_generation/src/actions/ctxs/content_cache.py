@@ -0,0 +1,234 @@
+import logging
+import sqlite3
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from typing import Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from ...settings import CONTENT_CACHE_MAX_BYTES, CONTENT_CACHE_PATH, CONTENT_CACHE_TTL
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Tham số theo dõi quảng cáo, không ảnh hưởng nội dung trang
+TRACKING_PARAMS = frozenset(["fbclid", "gclid", "msclkid", "yclid", "ref_src"])
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def canonical_url(url: str) -> str:
+    """
+    Canonical form of a URL used as cache key.
+
+    The scheme and host are lower-cased, default ports, fragments and tracking
+    parameters (utm_*, fbclid, ...) are dropped and query parameters are sorted.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    query = urlencode(sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.startswith("utm_") and key not in TRACKING_PARAMS
+    ))
+    return urlunsplit((scheme, host, parts.path or "/", query, ""))
+
+
+@dataclass
+class CachedContent:
+    """Extracted content of a page and the validators of the response it came from."""
+    content: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    fetched_at: float
+    fresh: bool
+
+    def conditional_headers(self) -> dict:
+        """Headers revalidating the cached page with a conditional request."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ContentCache:
+    """
+    Cache of the text extracted from web pages, stored compressed in SQLite.
+
+    Entries are keyed by canonical URL. Within `ttl` seconds an entry is served
+    without any request; after that it is revalidated with a conditional request
+    when the page sent an ETag or Last-Modified header, and a 304 answer renews
+    it without downloading or extracting the page again; if revalidation fails
+    (network error, 5xx) the stale content is served. When the compressed
+    content exceeds `max_bytes`, the least recently used entries are evicted.
+
+    Attributes:
+        path (str): Path of the SQLite database, empty to disable the cache.
+        ttl (float): Seconds an entry is used without revalidation.
+        max_bytes (int): Maximum total size of the compressed content.
+    """
+
+    def __init__(
+        self,
+        path: str = CONTENT_CACHE_PATH,
+        ttl: float = CONTENT_CACHE_TTL,
+        max_bytes: int = CONTENT_CACHE_MAX_BYTES,
+    ) -> None:
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self.hits = 0
+        self.revalidated = 0
+        self.stale = 0
+        self.misses = 0
+        if path:
+            try:
+                self._conn = sqlite3.connect(
+                    path, timeout=5, check_same_thread=False)
+                self._conn.execute("PRAGMA journal_mode=WAL")
+                self._conn.execute(
+                    "CREATE TABLE IF NOT EXISTS url_content ("
+                    "url TEXT PRIMARY KEY, content BLOB NOT NULL, size INTEGER NOT NULL, "
+                    "etag TEXT, last_modified TEXT, "
+                    "fetched_at REAL NOT NULL, accessed_at REAL NOT NULL)")
+                self._conn.commit()
+            except sqlite3.Error as e:
+                logger.error(f"Content cache disabled: {str(e)}")
+                self._conn = None
+
+    @property
+    def enabled(self) -> bool:
+        return self._conn is not None
+
+    def get(self, url: str) -> Optional[CachedContent]:
+        """
+        Look up the cached content of a URL.
+
+        Args:
+            url: The page URL.
+
+        Returns:
+            The cached content, fresh or to be revalidated, or None.
+        """
+        if self._conn is None:
+            return None
+        key = canonical_url(url)
+        now = time.time()
+        with self._lock:
+            try:
+                row = self._conn.execute(
+                    "SELECT content, etag, last_modified, fetched_at FROM url_content WHERE url = ?",
+                    (key,)).fetchone()
+                if row is None:
+                    self.misses += 1
+                    return None
+                content, etag, last_modified, fetched_at = row
+                fresh = now - fetched_at < self.ttl
+                if not fresh and not etag and not last_modified:
+                    # Hết hạn và không thể kiểm tra lại bằng conditional request
+                    self.misses += 1
+                    return None
+                if fresh:
+                    self.hits += 1
+                self._conn.execute(
+                    "UPDATE url_content SET accessed_at = ? WHERE url = ?", (now, key))
+                self._conn.commit()
+            except sqlite3.Error as e:
+                logger.error(f"Error reading content cache: {str(e)}")
+                return None
+        return CachedContent(
+            content=zlib.decompress(content).decode("utf-8"),
+            etag=etag,
+            last_modified=last_modified,
+            fetched_at=fetched_at,
+            fresh=fresh,
+        )
+
+    def set(self, url: str, content: str, etag: Optional[str] = None, last_modified: Optional[str] = None) -> None:
+        """
+        Store the extracted content of a URL.
+
+        Args:
+            url: The page URL.
+            content: The extracted text.
+            etag: ETag header of the response.
+            last_modified: Last-Modified header of the response.
+        """
+        if self._conn is None:
+            return
+        blob = zlib.compress(content.encode("utf-8"))
+        if len(blob) > self.max_bytes:
+            return
+        now = time.time()
+        with self._lock:
+            try:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO url_content "
+                    "(url, content, size, etag, last_modified, fetched_at, accessed_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (canonical_url(url), blob, len(blob), etag, last_modified, now, now))
+                self._evict()
+                self._conn.commit()
+            except sqlite3.Error as e:
+                logger.error(f"Error writing content cache: {str(e)}")
+
+    def renew(self, url: str, etag: Optional[str] = None, last_modified: Optional[str] = None) -> None:
+        """Mark the cached content of a URL as fresh after a 304 Not Modified answer."""
+        if self._conn is None:
+            return
+        with self._lock:
+            try:
+                self._conn.execute(
+                    "UPDATE url_content SET fetched_at = ?, "
+                    "etag = COALESCE(?, etag), last_modified = COALESCE(?, last_modified) "
+                    "WHERE url = ?",
+                    (time.time(), etag, last_modified, canonical_url(url)))
+                self._conn.commit()
+                self.revalidated += 1
+            except sqlite3.Error as e:
+                logger.error(f"Error writing content cache: {str(e)}")
+
+    def record_stale(self) -> None:
+        """Count stale content served because its revalidation failed."""
+        with self._lock:
+            self.stale += 1
+
+    def stats(self) -> dict:
+        """Hit, revalidation and miss counters and the size of the cache."""
+        entries, total_bytes = 0, 0
+        with self._lock:
+            if self._conn is not None:
+                try:
+                    entries, total_bytes = self._conn.execute(
+                        "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM url_content").fetchone()
+                except sqlite3.Error as e:
+                    logger.error(f"Error reading content cache: {str(e)}")
+            return {
+                "hits": self.hits,
+                "revalidated": self.revalidated,
+                "stale": self.stale,
+                "misses": self.misses,
+                "entries": entries,
+                "bytes": total_bytes,
+                "max_bytes": self.max_bytes,
+                "ttl": self.ttl,
+                "enabled": self._conn is not None,
+            }
+
+    def _evict(self) -> None:
+        # Giữ các trang được dùng gần đây nhất trong giới hạn dung lượng
+        self._conn.execute(
+            "DELETE FROM url_content WHERE url IN ("
+            "SELECT url FROM (SELECT url, SUM(size) OVER "
+            "(ORDER BY accessed_at DESC, url ROWS UNBOUNDED PRECEDING) AS running "
+            "FROM url_content) WHERE running > ?)", (self.max_bytes,))
+
+
+content_cache = ContentCache()
@@ -0,0 +1,210 @@
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Awaitable, Optional, Sequence, TypeVar
+
+import aiohttp
+
+from ...settings import (
+    FETCH_DNS_CACHE_TTL,
+    FETCH_MAX_BYTES,
+    FETCH_MAX_CONNECTIONS,
+    FETCH_MAX_PER_HOST,
+    FETCH_TOTAL_TIMEOUT,
+    HTTP_TIMEOUT,
+)
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+@dataclass
+class PageResponse:
+    """A fetched page: status, body and the validators used for conditional requests."""
+    status: int
+    body: bytes
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+    @property
+    def not_modified(self) -> bool:
+        return self.status == 304
+
+
+async def gather_with_deadline(
+    aws: Sequence[Awaitable[T]],
+    timeout: float,
+    labels: Sequence[str],
+) -> list[Optional[T]]:
+    """
+    Run awaitables concurrently under an overall deadline.
+
+    Failed or unfinished awaitables do not fail the call; their slot is None.
+
+    Args:
+        aws: The awaitables to run.
+        timeout: Deadline in seconds for all of them.
+        labels: Name of each awaitable, used for logging.
+
+    Returns:
+        The results, in the same order as `aws`.
+    """
+    if not aws:
+        return []
+
+    tasks = [asyncio.ensure_future(aw) for aw in aws]
+    _, pending = await asyncio.wait(tasks, timeout=timeout)
+    for task in pending:
+        task.cancel()
+    if pending:
+        await asyncio.gather(*pending, return_exceptions=True)
+
+    results: list[Optional[T]] = []
+    for label, task in zip(labels, tasks):
+        if task.cancelled():
+            logger.warning(
+                f"Fetching {label} did not finish within {timeout} seconds")
+            results.append(None)
+        elif task.exception() is not None:
+            logger.warning(
+                f"Error fetching {label}: {task.exception()!r}")
+            results.append(None)
+        else:
+            results.append(task.result())
+    return results
+
+
+class PageFetcher:
+    """
+    Concurrent page fetcher sharing one keep-alive connection pool.
+
+    The underlying aiohttp connector caps the total and per-host number of open
+    connections and caches DNS lookups, so fetching many links from the same few
+    sites reuses connections instead of reconnecting for every page.
+
+    Attributes:
+        max_connections (int): Maximum number of open connections in the pool.
+        max_per_host (int): Maximum number of concurrent connections per host.
+        dns_cache_ttl (int): Seconds a resolved host is kept in the DNS cache.
+        url_timeout (float): Deadline in seconds for fetching a single URL.
+        total_timeout (float): Deadline in seconds for a whole `fetch_many` call.
+        max_bytes (int): Maximum number of body bytes read from a single response.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = FETCH_MAX_CONNECTIONS,
+        max_per_host: int = FETCH_MAX_PER_HOST,
+        dns_cache_ttl: int = FETCH_DNS_CACHE_TTL,
+        url_timeout: float = HTTP_TIMEOUT,
+        total_timeout: float = FETCH_TOTAL_TIMEOUT,
+        max_bytes: int = FETCH_MAX_BYTES,
+    ) -> None:
+        self.max_connections = max_connections
+        self.max_per_host = max_per_host
+        self.dns_cache_ttl = dns_cache_ttl
+        self.url_timeout = url_timeout
+        self.total_timeout = total_timeout
+        self.max_bytes = max_bytes
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Create the shared session lazily, inside the running event loop."""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_connections,
+                limit_per_host=self.max_per_host,
+                use_dns_cache=True,
+                ttl_dns_cache=self.dns_cache_ttl,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.url_timeout),
+            )
+        return self._session
+
+    async def fetch(self, url: str) -> bytes:
+        """
+        Fetch the body of a URL, truncated to `max_bytes`.
+
+        Args:
+            url: The URL to fetch.
+
+        Returns:
+            The raw response body.
+
+        Raises:
+            aiohttp.ClientError: If the request fails or returns an error status.
+            asyncio.TimeoutError: If the per-URL deadline is exceeded.
+        """
+        return (await self.fetch_page(url)).body
+
+    async def fetch_page(self, url: str, headers: Optional[dict] = None) -> PageResponse:
+        """
+        Fetch a URL, optionally as a conditional request.
+
+        A 304 Not Modified answer to `If-None-Match`/`If-Modified-Since` headers is
+        returned with an empty body instead of raising.
+
+        Args:
+            url: The URL to fetch.
+            headers: Extra request headers.
+
+        Returns:
+            The status, body (truncated to `max_bytes`) and validators of the response.
+
+        Raises:
+            aiohttp.ClientError: If the request fails or returns an error status.
+            asyncio.TimeoutError: If the per-URL deadline is exceeded.
+        """
+        session = self._get_session()
+        async with session.get(url, headers=headers) as response:
+            if response.status == 304:
+                return PageResponse(
+                    status=304,
+                    body=b"",
+                    etag=response.headers.get("ETag"),
+                    last_modified=response.headers.get("Last-Modified"),
+                )
+            response.raise_for_status()
+            body = bytearray()
+            async for chunk in response.content.iter_chunked(64 * 1024):
+                body.extend(chunk)
+                if len(body) >= self.max_bytes:
+                    logger.warning(
+                        f"Response from {url} exceeds {self.max_bytes} bytes, truncating")
+                    del body[self.max_bytes:]
+                    break
+            return PageResponse(
+                status=response.status,
+                body=bytes(body),
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified"),
+            )
+
+    async def fetch_many(self, urls: list[str]) -> list[Optional[bytes]]:
+        """
+        Fetch several URLs concurrently under an overall deadline.
+
+        Failed or unfinished fetches do not fail the call; their slot is None.
+
+        Args:
+            urls: The URLs to fetch.
+
+        Returns:
+            The response bodies, in the same order as `urls`.
+        """
+        return await gather_with_deadline(
+            [self.fetch(url) for url in urls], self.total_timeout, urls)
+
+    async def close(self) -> None:
+        """Close the shared session and its connection pool."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+
+page_fetcher = PageFetcher()
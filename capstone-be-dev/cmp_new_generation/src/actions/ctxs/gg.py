@@ -1,7 +1,19 @@
 from googlesearch import search
+import asyncio
+import logging
 import re
+import aiohttp
 import requests
 from trafilatura import extract
+from ...executor import run_blocking, run_cpu_bound
+from ...settings import HTTP_TIMEOUT
+from .fetcher import page_fetcher, gather_with_deadline
+from .content_cache import content_cache
+from .search_cache import SearchCache
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
 
 # regrex collect url of website has content
 regex_url = r"https?://(?:www\.)?[-a-zA-Z0-9@:%._\+~#=]{1,256}\.[a-zA-Z0-9()]{1,6}\b(?:[-a-zA-Z0-9()@:%_\+.~#?&//=]*)"
@@ -13,9 +25,45 @@ def search_google(query: str, num_results: int = 5, start_num: int = 0):
     return list_url
 
 
+def search_google_window(query: str, num_results: int):
+    # Đếm kết quả trước khi lọc để biết Google đã hết kết quả hay chưa
+    list_url = list(search(query, num_results=num_results))
+    exhausted = len(list_url) < num_results
+    return [url for url in list_url if re.match(regex_url, url)], exhausted
+
+
+search_cache = SearchCache(search_google_window)
+
+
 def get_content_from_url(url: str):
-    response = requests.get(url)
-    return extract(response.text)
+    cached = content_cache.get(url)
+    if cached and cached.fresh:
+        return cached.content
+    try:
+        response = requests.get(
+            url, timeout=HTTP_TIMEOUT, headers=cached.conditional_headers() if cached else None)
+    except requests.RequestException as e:
+        if cached is None:
+            raise
+        return serve_stale(url, cached.content, repr(e))
+    if cached and response.status_code >= 500:
+        return serve_stale(url, cached.content, str(response.status_code))
+    if cached and response.status_code == 304:
+        content_cache.renew(url, response.headers.get(
+            "ETag"), response.headers.get("Last-Modified"))
+        return cached.content
+    content = extract(response.text)
+    if content and response.ok:
+        content_cache.set(url, content, response.headers.get(
+            "ETag"), response.headers.get("Last-Modified"))
+    return content
+
+
+def serve_stale(url: str, content: str, reason: str) -> str:
+    """Return the stale cached content of a URL whose revalidation failed."""
+    logger.warning(f"Revalidating {url} failed ({reason}), serving stale content")
+    content_cache.record_stale()
+    return content
 
 
 def get_content_from_urls(urls: list[str]):
@@ -23,3 +71,44 @@ def get_content_from_urls(urls: list[str]):
     for url in urls:
         list_content.append(get_content_from_url(url))
     return list_content
+
+
+async def asearch_google(query: str, num_results: int = 5, start_num: int = 0):
+    # Các trang start_num của cùng câu truy vấn được lấy từ một lần tìm kiếm,
+    # các request trùng nhau cùng lúc chỉ gọi Google một lần
+    return await search_cache.get(query, num_results=num_results, start_num=start_num)
+
+
+async def aget_content_from_url(url: str):
+    # Cache theo URL: trang còn hạn không cần tải lại, trang hết hạn được kiểm tra
+    # bằng conditional request (ETag/Last-Modified), 304 thì dùng lại nội dung cũ
+    cached = await run_blocking(content_cache.get, url) if content_cache.enabled else None
+    if cached and cached.fresh:
+        return cached.content
+
+    try:
+        page = await page_fetcher.fetch_page(
+            url, headers=cached.conditional_headers() if cached else None)
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        # Lỗi mạng hoặc 5xx khi kiểm tra lại: dùng nội dung cũ; 4xx (404, 410, ...) thì bỏ
+        status = getattr(e, "status", None)
+        if cached is None or (status is not None and status < 500):
+            raise
+        return serve_stale(url, cached.content, repr(e))
+    if cached and page.not_modified:
+        await run_blocking(content_cache.renew, url, page.etag, page.last_modified)
+        return cached.content
+
+    # trafilatura extract tốn CPU, trang lớn được chạy trong process pool
+    content = await run_cpu_bound(extract, page.body, input_size=len(page.body))
+    if content and content_cache.enabled:
+        await run_blocking(content_cache.set, url, content, page.etag, page.last_modified)
+    return content
+
+
+async def aget_content_from_urls(urls: list[str]):
+    # Tải song song qua connection pool dùng chung; URL lỗi/quá hạn trả về ""
+    # để kết quả vẫn khớp từng phần tử với urls
+    list_content = await gather_with_deadline(
+        [aget_content_from_url(url) for url in urls], page_fetcher.total_timeout, urls)
+    return [content or "" for content in list_content]
@@ -0,0 +1,146 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Tuple
+
+from ...executor import run_blocking
+from ...settings import (
+    SEARCH_CACHE_ENABLED,
+    SEARCH_CACHE_MAX_ENTRIES,
+    SEARCH_CACHE_TTL,
+    SEARCH_CACHE_WINDOW,
+)
+from ...singleflight import SingleFlight
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def normalize_query(query: str) -> str:
+    """Cache key of a search query: lower-cased with whitespace collapsed."""
+    return " ".join(query.lower().split())
+
+
+@dataclass
+class SearchWindow:
+    """The first results of a query, fetched in one search."""
+    urls: List[str]
+    exhausted: bool
+    fetched_at: float
+
+
+class SearchCache:
+    """
+    Cache of web search results, serving every page of a query from one search.
+
+    The first search of a query fetches a window of `window` results from offset
+    0; later `start_num`/`num_results` pages are sliced from it, and a page past
+    the window fetches a larger one. Concurrent searches of the same query are
+    coalesced into one upstream call. Empty results are not cached, so a
+    temporary block by the search engine is not remembered.
+
+    Attributes:
+        search (Callable): Blocking function (query, num_results) -> (urls, exhausted),
+            where exhausted tells that the engine has no more results.
+        ttl (float): Lifetime of a window in seconds.
+        window (int): Number of results fetched by the first search of a query.
+        max_entries (int): Maximum number of cached queries.
+        enabled (bool): Search every request upstream when False.
+    """
+
+    def __init__(
+        self,
+        search: Callable[[str, int], Tuple[List[str], bool]],
+        ttl: float = SEARCH_CACHE_TTL,
+        window: int = SEARCH_CACHE_WINDOW,
+        max_entries: int = SEARCH_CACHE_MAX_ENTRIES,
+        enabled: bool = SEARCH_CACHE_ENABLED,
+    ) -> None:
+        self.search = search
+        self.ttl = ttl
+        self.window = window
+        self.max_entries = max_entries
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._windows: "OrderedDict[str, SearchWindow]" = OrderedDict()
+        self._flight = SingleFlight("search")
+        self.hits = 0
+        self.misses = 0
+
+    async def get(self, query: str, num_results: int = 5, start_num: int = 0) -> List[str]:
+        """
+        Get a page of search results.
+
+        Args:
+            query: The search query.
+            num_results: Number of results of the page.
+            start_num: Offset of the first result.
+
+        Returns:
+            The URLs of the page.
+        """
+        end = start_num + num_results
+        if not self.enabled:
+            urls, _ = await run_blocking(self.search, query, end)
+            return urls[start_num:end]
+
+        key = normalize_query(query)
+        cached = self._lookup(key, end)
+        if cached is not None:
+            self.hits += 1
+            return cached.urls[start_num:end]
+
+        self.misses += 1
+        # Cửa sổ đủ lớn cho trang yêu cầu, làm tròn lên bội số của window
+        size = max(self.window, -(-end // self.window) * self.window)
+        result = await self._flight.do((key, size), lambda: self._fetch(key, query, size))
+        return result.urls[start_num:end]
+
+    async def _fetch(self, key: str, query: str, size: int) -> SearchWindow:
+        urls, exhausted = await run_blocking(self.search, query, size)
+        result = SearchWindow(urls=urls, exhausted=exhausted, fetched_at=time.time())
+        if urls:
+            with self._lock:
+                self._windows[key] = result
+                self._windows.move_to_end(key)
+                while len(self._windows) > self.max_entries:
+                    self._windows.popitem(last=False)
+        return result
+
+    def _lookup(self, key: str, end: int) -> Optional[SearchWindow]:
+        with self._lock:
+            cached = self._windows.get(key)
+            if cached is None:
+                return None
+            if time.time() - cached.fetched_at >= self.ttl:
+                del self._windows[key]
+                return None
+            if len(cached.urls) < end and not cached.exhausted:
+                return None
+            self._windows.move_to_end(key)
+            return cached
+
+    def clear(self) -> None:
+        """Drop every cached query."""
+        with self._lock:
+            self._windows.clear()
+
+    def stats(self) -> dict:
+        """Hit and miss counters, size and coalesced searches."""
+        total = self.hits + self.misses
+        with self._lock:
+            entries = len(self._windows)
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "entries": entries,
+            "max_entries": self.max_entries,
+            "window": self.window,
+            "ttl": self.ttl,
+            "enabled": self.enabled,
+            "upstream": self._flight.stats(),
+        }
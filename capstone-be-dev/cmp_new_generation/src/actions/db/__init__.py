@@ -1,5 +1,21 @@
-from .vector_store import save_to_vector_store, get_from_vector_store, create_document
+from .vector_store import (
+    save_to_vector_store,
+    get_from_vector_store,
+    asave_to_vector_store,
+    aget_from_vector_store,
+    aget_many_from_vector_store,
+    create_document,
+    embeddings,
+    get_pool_metrics,
+    dispose_vector_stores,
+)
+from .write_behind import WriteBehindQueue, document_queue
 from .mistral_embeddings import MistralAIEmbeddings
+from .embedding_cache import EmbeddingCache, embedding_cache
 
 __all__ = ["save_to_vector_store", "get_from_vector_store",
-           "create_document", "MistralAIEmbeddings"]
+           "asave_to_vector_store", "aget_from_vector_store",
+           "aget_many_from_vector_store",
+           "create_document", "embeddings", "get_pool_metrics", "dispose_vector_stores",
+           "WriteBehindQueue", "document_queue",
+           "MistralAIEmbeddings", "EmbeddingCache", "embedding_cache"]
@@ -0,0 +1,230 @@
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from typing import List, Optional, Sequence
+
+from ...settings import (
+    EMBEDDING_CACHE_DISK_MAX_BYTES,
+    EMBEDDING_CACHE_MAX_BYTES,
+    EMBEDDING_CACHE_PATH,
+    EMBEDDING_CACHE_TTL,
+)
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def embedding_key(model: str, text: str) -> str:
+    """Cache key of a text embedded by a model: SHA-256 of the model name and content."""
+    return hashlib.sha256(f"{model}\0{text}".encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """
+    Two-tier cache of embedding vectors keyed by content hash and model name.
+
+    The first tier is an in-process LRU bounded by the total size of the stored
+    vectors. The second tier is a SQLite database on disk that survives restarts;
+    hits there are promoted to memory. Vectors older than `ttl` are ignored, and
+    every PRUNE_EVERY writes the disk tier drops them along with the least
+    recently read vectors beyond `disk_max_bytes`.
+
+    Attributes:
+        max_bytes (int): Maximum total size of the vectors kept in memory.
+        path (str): Path of the SQLite database, empty to disable the disk tier.
+        disk_max_bytes (int): Maximum total size of the vectors kept on disk.
+        ttl (float): Seconds a vector is kept on disk, 0 to keep it forever.
+    """
+
+    # Dọn tầng đĩa sau mỗi N lần ghi
+    PRUNE_EVERY = 100
+
+    def __init__(
+        self,
+        max_bytes: int = EMBEDDING_CACHE_MAX_BYTES,
+        path: str = EMBEDDING_CACHE_PATH,
+        disk_max_bytes: int = EMBEDDING_CACHE_DISK_MAX_BYTES,
+        ttl: float = EMBEDDING_CACHE_TTL,
+    ) -> None:
+        self.max_bytes = max_bytes
+        self.path = path
+        self.disk_max_bytes = disk_max_bytes
+        self.ttl = ttl
+        self._writes = 0
+        self._memory: "OrderedDict[str, bytes]" = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        if path:
+            try:
+                self._conn = sqlite3.connect(
+                    path, timeout=5, check_same_thread=False)
+                self._conn.execute("PRAGMA journal_mode=WAL")
+                self._conn.execute(
+                    "CREATE TABLE IF NOT EXISTS embeddings ("
+                    "key TEXT PRIMARY KEY, model TEXT NOT NULL, "
+                    "vector BLOB NOT NULL, created_at REAL NOT NULL, "
+                    "accessed_at REAL NOT NULL DEFAULT 0)")
+                columns = [row[1] for row in self._conn.execute("PRAGMA table_info(embeddings)")]
+                if "accessed_at" not in columns:
+                    # File cache cũ chưa có cột accessed_at
+                    self._conn.execute(
+                        "ALTER TABLE embeddings ADD COLUMN accessed_at REAL NOT NULL DEFAULT 0")
+                self._conn.execute(
+                    "CREATE INDEX IF NOT EXISTS embeddings_accessed_at ON embeddings (accessed_at)")
+                self._prune()
+                self._conn.commit()
+            except sqlite3.Error as e:
+                logger.error(
+                    f"Embedding cache disk tier disabled: {str(e)}")
+                self._conn = None
+
+    def get_many(self, model: str, texts: Sequence[str]) -> List[Optional[List[float]]]:
+        """
+        Look up the embeddings of several texts.
+
+        Args:
+            model: The embedding model name.
+            texts: The texts to look up.
+
+        Returns:
+            The cached vector of each text, or None for misses.
+        """
+        keys = [embedding_key(model, text) for text in texts]
+        found: dict[str, bytes] = {}
+        with self._lock:
+            for key in keys:
+                blob = self._memory.get(key)
+                if blob is not None:
+                    self._memory.move_to_end(key)
+                    found[key] = blob
+
+            from_memory = set(found)
+            missing = [key for key in dict.fromkeys(keys) if key not in found]
+            if missing and self._conn is not None:
+                for key, blob in self._select(missing):
+                    found[key] = blob
+                    self._remember(key, blob)
+
+            for key in keys:
+                if key in from_memory:
+                    self.memory_hits += 1
+                elif key in found:
+                    self.disk_hits += 1
+                else:
+                    self.misses += 1
+
+        return [_decode(found[key]) if key in found else None for key in keys]
+
+    def set_many(self, model: str, texts: Sequence[str], vectors: Sequence[List[float]]) -> None:
+        """
+        Store the embeddings of several texts in both tiers.
+
+        Args:
+            model: The embedding model name.
+            texts: The embedded texts.
+            vectors: The embedding of each text.
+        """
+        now = time.time()
+        rows = [
+            (embedding_key(model, text), model, _encode(vector), now, now)
+            for text, vector in zip(texts, vectors)
+        ]
+        with self._lock:
+            for key, _, blob, _, _ in rows:
+                self._remember(key, blob)
+            if self._conn is not None:
+                try:
+                    self._conn.executemany(
+                        "INSERT OR REPLACE INTO embeddings (key, model, vector, created_at, accessed_at) "
+                        "VALUES (?, ?, ?, ?, ?)", rows)
+                    self._writes += 1
+                    if self._writes % self.PRUNE_EVERY == 0:
+                        self._prune()
+                    self._conn.commit()
+                except sqlite3.Error as e:
+                    logger.error(
+                        f"Error writing embedding cache: {str(e)}")
+
+    def stats(self) -> dict:
+        """Hit and miss counters and the size of the memory tier."""
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0,
+                "memory_entries": len(self._memory),
+                "memory_bytes": self._memory_bytes,
+                "max_bytes": self.max_bytes,
+                "disk_enabled": self._conn is not None,
+                "disk_max_bytes": self.disk_max_bytes,
+                "ttl": self.ttl,
+            }
+
+    def _select(self, keys: List[str]):
+        rows = []
+        now = time.time()
+        min_created_at = now - self.ttl if self.ttl > 0 else 0.0
+        try:
+            # SQLite giới hạn số tham số trong một câu lệnh
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                placeholders = ','.join('?' * len(chunk))
+                found = self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders}) "
+                    "AND created_at >= ?", (*chunk, min_created_at)).fetchall()
+                if found:
+                    self._conn.executemany(
+                        "UPDATE embeddings SET accessed_at = ? WHERE key = ?",
+                        [(now, key) for key, _ in found])
+                rows.extend(found)
+            self._conn.commit()
+        except sqlite3.Error as e:
+            logger.error(f"Error reading embedding cache: {str(e)}")
+        return rows
+
+    def _prune(self) -> None:
+        # Xóa vector hết hạn, rồi giữ các vector được đọc gần đây nhất trong giới hạn dung lượng
+        if self.ttl > 0:
+            self._conn.execute(
+                "DELETE FROM embeddings WHERE created_at < ?", (time.time() - self.ttl,))
+        self._conn.execute(
+            "DELETE FROM embeddings WHERE key IN ("
+            "SELECT key FROM (SELECT key, SUM(length(vector)) OVER "
+            "(ORDER BY accessed_at DESC, key ROWS UNBOUNDED PRECEDING) AS running "
+            "FROM embeddings) WHERE running > ?)", (self.disk_max_bytes,))
+
+    def _remember(self, key: str, blob: bytes) -> None:
+        previous = self._memory.pop(key, None)
+        if previous is not None:
+            self._memory_bytes -= len(previous)
+        if len(blob) > self.max_bytes:
+            return
+        self._memory[key] = blob
+        self._memory_bytes += len(blob)
+        while self._memory_bytes > self.max_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+
+
+def _encode(vector: List[float]) -> bytes:
+    return array("d", vector).tobytes()
+
+
+def _decode(blob: bytes) -> List[float]:
+    vector = array("d")
+    vector.frombytes(blob)
+    return vector.tolist()
+
+
+embedding_cache = EmbeddingCache()
@@ -1,9 +1,11 @@
 from langchain_mistralai import MistralAIEmbeddings as BaseMistralAIEmbeddings
 from ...settings import API_KEY_EMBEDDING, MODEL_NAME_EMBEDDING
+from ...upstream import controlled_clients, mistral_budget, mistral_controller
 import httpx
 import logging
-from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 from typing import List, Optional, Any
+from .embedding_cache import embedding_cache
+from ...executor import run_blocking
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -12,8 +14,12 @@ logger = logging.getLogger(__name__)
 
 class MistralAIEmbeddings(BaseMistralAIEmbeddings):
     """
-    A wrapper around the MistralAIEmbeddings class that adds retry logic 
-    for HTTPStatusError (especially 429 rate limit errors).
+    A wrapper around the MistralAIEmbeddings class whose requests go through the
+    shared Mistral concurrency controller (AIMD limit, `Retry-After`, retries of
+    retryable statuses only); the retries of langchain_mistralai are disabled.
+
+    Embeddings are served from `embedding_cache` when possible; only the texts
+    missing from the cache are sent to the API, in one batched call.
     """
 
     def __init__(
@@ -23,22 +29,16 @@ class MistralAIEmbeddings(BaseMistralAIEmbeddings):
         **kwargs: Any,
     ) -> None:
         """Initialize the MistralAIEmbeddings wrapper."""
+        kwargs.setdefault("max_retries", 1)
         super().__init__(api_key=api_key, model=model, **kwargs)
+        self.client.close()
+        self.client, self.async_client = controlled_clients(
+            self.client, self.async_client, mistral_controller, mistral_budget)
         logger.info(f"Initialized MistralAIEmbeddings with model {model}")
 
-    @retry(
-        retry=retry_if_exception_type(
-            (httpx.TimeoutException, httpx.HTTPStatusError)),
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=10),
-        before_sleep=lambda retry_state: logger.warning(
-            f"MistralAI API call failed, retrying in {retry_state.next_action.sleep} seconds... "
-            f"Attempt {retry_state.attempt_number}/3"
-        )
-    )
-    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+    def _embed_documents_upstream(self, texts: List[str]) -> List[List[float]]:
         """
-        Embed documents with retry for rate limiting and connection issues.
+        Embed documents with the API.
 
         Args:
             texts: The list of texts to embed.
@@ -49,26 +49,34 @@ class MistralAIEmbeddings(BaseMistralAIEmbeddings):
         try:
             return super().embed_documents(texts)
         except httpx.HTTPStatusError as e:
-            if e.response.status_code == 429:
-                logger.warning("Rate limit exceeded. Retrying...")
+            logger.error(
+                f"MistralAI API call failed with status {e.response.status_code}")
             raise
         except Exception as e:
             logger.error(f"Error embedding documents: {str(e)}")
             raise
 
-    @retry(
-        retry=retry_if_exception_type(
-            (httpx.TimeoutException, httpx.HTTPStatusError)),
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=10),
-        before_sleep=lambda retry_state: logger.warning(
-            f"MistralAI API call failed, retrying in {retry_state.next_action.sleep} seconds... "
-            f"Attempt {retry_state.attempt_number}/3"
-        )
-    )
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed documents, sending only the texts missing from the cache to the API.
+
+        Args:
+            texts: The list of texts to embed.
+
+        Returns:
+            List of embeddings, one for each text.
+        """
+        vectors = embedding_cache.get_many(self.model, texts)
+        missing = _missing_texts(texts, vectors)
+        if missing:
+            missing_vectors = self._embed_documents_upstream(missing)
+            embedding_cache.set_many(self.model, missing, missing_vectors)
+            vectors = _fill_missing(texts, vectors, missing, missing_vectors)
+        return vectors
+
     def embed_query(self, text: str) -> List[float]:
         """
-        Embed query text with retry for rate limiting and connection issues.
+        Embed query text.
 
         Args:
             text: The text to embed.
@@ -79,9 +87,80 @@ class MistralAIEmbeddings(BaseMistralAIEmbeddings):
         try:
             return super().embed_query(text)
         except httpx.HTTPStatusError as e:
-            if e.response.status_code == 429:
-                logger.warning("Rate limit exceeded. Retrying...")
+            logger.error(
+                f"MistralAI API call failed with status {e.response.status_code}")
             raise
         except Exception as e:
             logger.error(f"Error embedding query: {str(e)}")
             raise
+
+    async def _aembed_documents_upstream(self, texts: List[str]) -> List[List[float]]:
+        """
+        Asynchronously embed documents with the API.
+
+        Args:
+            texts: The list of texts to embed.
+
+        Returns:
+            List of embeddings, one for each text.
+        """
+        try:
+            return await super().aembed_documents(texts)
+        except httpx.HTTPStatusError as e:
+            logger.error(
+                f"MistralAI API call failed with status {e.response.status_code}")
+            raise
+        except Exception as e:
+            logger.error(f"Error embedding documents: {str(e)}")
+            raise
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        """
+        Asynchronously embed documents, sending only the texts missing from the cache to the API.
+
+        Args:
+            texts: The list of texts to embed.
+
+        Returns:
+            List of embeddings, one for each text.
+        """
+        # Tầng cache trên đĩa là SQLite, không chạy trực tiếp trên event loop
+        vectors = await run_blocking(embedding_cache.get_many, self.model, texts)
+        missing = _missing_texts(texts, vectors)
+        if missing:
+            missing_vectors = await self._aembed_documents_upstream(missing)
+            await run_blocking(embedding_cache.set_many, self.model, missing, missing_vectors)
+            vectors = _fill_missing(texts, vectors, missing, missing_vectors)
+        return vectors
+
+    async def aembed_query(self, text: str) -> List[float]:
+        """
+        Asynchronously embed query text.
+
+        Caching is handled by `aembed_documents`.
+
+        Args:
+            text: The text to embed.
+
+        Returns:
+            Embeddings for the text.
+        """
+        return (await self.aembed_documents([text]))[0]
+
+
+def _missing_texts(texts: List[str], vectors: List[Optional[List[float]]]) -> List[str]:
+    """Unique texts without a cached vector, in first-seen order."""
+    return list(dict.fromkeys(
+        text for text, vector in zip(texts, vectors) if vector is None))
+
+
+def _fill_missing(
+    texts: List[str],
+    vectors: List[Optional[List[float]]],
+    missing: List[str],
+    missing_vectors: List[List[float]],
+) -> List[List[float]]:
+    """Fill the cache misses with the vectors returned by the API."""
+    by_text = dict(zip(missing, missing_vectors))
+    return [vector if vector is not None else by_text[text]
+            for text, vector in zip(texts, vectors)]
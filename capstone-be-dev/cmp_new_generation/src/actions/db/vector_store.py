@@ -1,13 +1,29 @@
 from .mistral_embeddings import MistralAIEmbeddings
 from langchain_postgres import PGVector
-from ...settings import API_KEY_EMBEDDING, MODEL_NAME_EMBEDDING, DATABASE_URL
+from ...settings import (
+    API_KEY_EMBEDDING,
+    MODEL_NAME_EMBEDDING,
+    DATABASE_URL,
+    DB_POOL_SIZE,
+    DB_MAX_OVERFLOW,
+    DB_POOL_TIMEOUT,
+    DB_POOL_RECYCLE,
+)
 from langchain_core.documents import Document
-# lib to create random uuid
 import uuid
+import asyncio
+import hashlib
+import re
+import unicodedata
 import time
 import logging
+import threading
+from dataclasses import dataclass
 from functools import wraps
+from typing import Optional
+from sqlalchemy import create_engine, event, select
 from sqlalchemy.exc import OperationalError, ProgrammingError
+from sqlalchemy.ext.asyncio import create_async_engine
 import httpx
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 
@@ -38,33 +54,257 @@ embeddings = MistralAIEmbeddings(
 
 collection_name = "my_docs"
 
-# Function to get a fresh vector store connection
+# Namespace cố định của các id tài liệu, không được thay đổi (id sẽ khác với dữ liệu đã lưu)
+DOCUMENT_ID_NAMESPACE = uuid.UUID("5a0c6f3e-7d1b-4c8e-9f2a-3b6d8e1c4a70")
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_content(text: str) -> str:
+    """Normalize a text for hashing: Unicode NFC and collapsed whitespace."""
+    return _WHITESPACE_RE.sub(" ", unicodedata.normalize("NFC", text)).strip()
+
+
+def document_id(text: str, location: str, topic: str) -> str:
+    """
+    Deterministic id of a document, derived from its normalized content, location and topic.
+
+    Saving the same content twice yields the same id, so saves are idempotent upserts.
+    """
+    digest = hashlib.sha256(normalize_content(text).encode("utf-8")).hexdigest()
+    return str(uuid.uuid5(DOCUMENT_ID_NAMESPACE, f"{location}\0{topic}\0{digest}"))
+
+
+def to_async_database_url(url: str) -> str:
+    """
+    Convert a Postgres connection string to one using the async psycopg (v3) driver.
+
+    Args:
+        url: The database connection string.
+
+    Returns:
+        The connection string with the `postgresql+psycopg` scheme.
+    """
+    for prefix in ("postgresql+psycopg2://", "postgresql://", "postgres://"):
+        if url.startswith(prefix):
+            return "postgresql+psycopg://" + url[len(prefix):]
+    return url
+
+
+# Connection pool settings shared by the sync and async engines
+engine_args = {
+    "pool_size": DB_POOL_SIZE,
+    "max_overflow": DB_MAX_OVERFLOW,
+    "pool_timeout": DB_POOL_TIMEOUT,
+    "pool_recycle": DB_POOL_RECYCLE,
+    # Kiểm tra kết nối trước khi dùng để bỏ các kết nối đã chết
+    "pool_pre_ping": True,
+}
+
+
+@dataclass
+class CachedCollection:
+    """The columns of a collection row used by PGVector queries."""
+    uuid: uuid.UUID
+    name: str
+
+
+class PooledPGVector(PGVector):
+    """
+    PGVector that caches its collection row.
+
+    The collection never changes during the application's lifetime, so it is
+    looked up once instead of on every add or search. `delete_collection` is
+    not supported on this store.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        self._cached_collection: Optional[CachedCollection] = None
+        super().__init__(*args, **kwargs)
+
+    def get_collection(self, session):
+        if self._cached_collection is None:
+            collection = super().get_collection(session)
+            if collection is None:
+                return None
+            self._cached_collection = CachedCollection(
+                collection.uuid, collection.name)
+        return self._cached_collection
+
+    async def aget_collection(self, session):
+        if self._cached_collection is None:
+            collection = await super().aget_collection(session)
+            if collection is None:
+                return None
+            self._cached_collection = CachedCollection(
+                collection.uuid, collection.name)
+        return self._cached_collection
+
+    def existing_ids(self, ids: list[str]) -> set[str]:
+        """Return the ids of the collection among `ids`, without loading the embeddings."""
+        with self._make_sync_session() as session:
+            collection = self.get_collection(session)
+            stmt = select(self.EmbeddingStore.id).where(
+                self.EmbeddingStore.collection_id == collection.uuid,
+                self.EmbeddingStore.id.in_(ids))
+            return {str(id) for id in session.execute(stmt).scalars()}
+
+    async def aexisting_ids(self, ids: list[str]) -> set[str]:
+        """Asynchronously return the ids of the collection among `ids`."""
+        async with self._make_async_session() as session:
+            collection = await self.aget_collection(session)
+            stmt = select(self.EmbeddingStore.id).where(
+                self.EmbeddingStore.collection_id == collection.uuid,
+                self.EmbeddingStore.id.in_(ids))
+            return {str(id) for id in (await session.execute(stmt)).scalars()}
+
+
+class PoolStats:
+    """Counters of connections opened by an engine's pool."""
+
+    def __init__(self) -> None:
+        self.connects = 0
+        self.checkouts = 0
+        self.invalidated = 0
+
+    def attach(self, engine) -> None:
+        event.listen(engine, "connect", self._on_connect)
+        event.listen(engine, "checkout", self._on_checkout)
+        event.listen(engine, "invalidate", self._on_invalidate)
+
+    def _on_connect(self, *args) -> None:
+        self.connects += 1
+
+    def _on_checkout(self, *args) -> None:
+        self.checkouts += 1
+
+    def _on_invalidate(self, *args) -> None:
+        self.invalidated += 1
+
+
+_store_lock = threading.Lock()
+_vector_store: Optional[PooledPGVector] = None
+_async_vector_store: Optional[PooledPGVector] = None
+_pool_stats = {"sync": PoolStats(), "async": PoolStats()}
 
 
 def get_vector_store():
+    """
+    Get the application-lifetime vector store backed by a pooled sync engine.
+
+    The store is created on first use; callers share its engine and connection pool.
+    """
+    global _vector_store
+    if _vector_store is not None:
+        return _vector_store
+    with _store_lock:
+        if _vector_store is None:
+            try:
+                engine = create_engine(DATABASE_URL, **engine_args)
+                _pool_stats["sync"].attach(engine)
+                _vector_store = PooledPGVector(
+                    embeddings=embeddings,
+                    connection=engine,
+                    collection_name=collection_name,
+                    use_jsonb=True,
+                )
+            except Exception as e:
+                logger.error(
+                    f"Failed to create vector store connection: {str(e)}")
+                raise
+    return _vector_store
+
+
+def get_async_vector_store():
+    """
+    Get the application-lifetime vector store backed by a pooled async engine.
+
+    Used by the async endpoints so database I/O never blocks the event loop.
+    """
+    global _async_vector_store
+    if _async_vector_store is not None:
+        return _async_vector_store
     try:
-        return PGVector(
+        engine = create_async_engine(
+            to_async_database_url(DATABASE_URL), **engine_args)
+        _pool_stats["async"].attach(engine.sync_engine)
+        _async_vector_store = PooledPGVector(
             embeddings=embeddings,
-            connection=DATABASE_URL,
+            connection=engine,
             collection_name=collection_name,
             use_jsonb=True,
         )
+        return _async_vector_store
     except Exception as e:
-        logger.error(f"Failed to create vector store connection: {str(e)}")
+        logger.error(
+            f"Failed to create async vector store connection: {str(e)}")
         raise
 
 
+def _pool_metrics(pool, stats: PoolStats) -> dict:
+    return {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+        "connects": stats.connects,
+        "checkouts": stats.checkouts,
+        "invalidated": stats.invalidated,
+    }
+
+
+def get_pool_metrics() -> dict:
+    """
+    Get connection pool metrics of the vector store engines that have been created.
+
+    Returns:
+        Metrics keyed by "sync" and "async".
+    """
+    metrics = {}
+    if _vector_store is not None:
+        metrics["sync"] = _pool_metrics(
+            _vector_store._engine.pool, _pool_stats["sync"])
+    if _async_vector_store is not None:
+        metrics["async"] = _pool_metrics(
+            _async_vector_store._async_engine.sync_engine.pool, _pool_stats["async"])
+    return metrics
+
+
+async def dispose_vector_stores() -> None:
+    """Close the pooled connections of both vector stores, on application shutdown."""
+    global _vector_store, _async_vector_store
+    if _async_vector_store is not None:
+        await _async_vector_store._async_engine.dispose()
+        _async_vector_store = None
+    if _vector_store is not None:
+        _vector_store._engine.dispose()
+        _vector_store = None
+
+
 def create_document(text: str, location: str, topic: str):
     return Document(
         page_content=text,
         metadata={
             "location": location,
             "topic": topic,
-            "id": str(uuid.uuid4()),
+            "id": document_id(text, location, topic),
         }
     )
 
 
+def _unique_documents(docs: list[Document]) -> list[Document]:
+    """Drop documents of a batch with the same id (same content, location and topic)."""
+    return list({doc.metadata["id"]: doc for doc in docs}.values())
+
+
+def _new_documents(docs: list[Document], existing: set[str]) -> list[Document]:
+    new_docs = [doc for doc in docs if doc.metadata["id"] not in existing]
+    if len(new_docs) < len(docs):
+        logger.info(
+            f"Skipped {len(docs) - len(new_docs)} documents already in vector store")
+    return new_docs
+
+
 @db_retry_decorator()
 def save_to_vector_store(docs: list[Document]):
     """Save documents to vector store with retry mechanism"""
@@ -73,8 +313,13 @@ def save_to_vector_store(docs: list[Document]):
         return
 
     try:
-        # Get fresh connection
         vector_store = get_vector_store()
+        docs = _unique_documents(docs)
+        # Nội dung đã lưu thì bỏ qua, không cần gọi embedding
+        docs = _new_documents(
+            docs, vector_store.existing_ids([doc.metadata["id"] for doc in docs]))
+        if not docs:
+            return
         vector_store.add_documents(
             docs, ids=[doc.metadata["id"] for doc in docs])
         logger.info(
@@ -92,7 +337,6 @@ def get_from_vector_store(query: str, location: list[str]):
         return None
 
     try:
-        # Get fresh connection
         vector_store = get_vector_store()
         result = vector_store.similarity_search(
             query, k=5, filter={"location": {"$in": location}})
@@ -101,3 +345,69 @@ def get_from_vector_store(query: str, location: list[str]):
         logger.error(f"Error querying vector store: {str(e)}")
         # Return None instead of raising to prevent application crash
         return None
+
+
+@db_retry_decorator()
+async def asave_to_vector_store(docs: list[Document]):
+    """Asynchronously save documents to vector store with retry mechanism"""
+    if not docs:
+        logger.warning("No documents to save")
+        return
+
+    try:
+        vector_store = get_async_vector_store()
+        docs = _unique_documents(docs)
+        # Nội dung đã lưu thì bỏ qua, không cần gọi embedding
+        docs = _new_documents(
+            docs, await vector_store.aexisting_ids([doc.metadata["id"] for doc in docs]))
+        if not docs:
+            return
+        await vector_store.aadd_documents(
+            docs, ids=[doc.metadata["id"] for doc in docs])
+        logger.info(
+            f"Successfully saved {len(docs)} documents to vector store")
+    except Exception as e:
+        logger.error(f"Error saving to vector store: {str(e)}")
+        raise
+
+
+@db_retry_decorator()
+async def aget_from_vector_store(query: str, location: list[str]):
+    """Asynchronously get documents from vector store with retry mechanism"""
+    if not query or not location:
+        logger.warning("Invalid query or location")
+        return None
+
+    try:
+        vector_store = get_async_vector_store()
+        result = await vector_store.asimilarity_search(
+            query, k=5, filter={"location": {"$in": location}})
+        return result[0].page_content if result else None
+    except Exception as e:
+        logger.error(f"Error querying vector store: {str(e)}")
+        # Return None instead of raising to prevent application crash
+        return None
+
+
+@db_retry_decorator()
+async def aget_many_from_vector_store(queries: list[str], location: list[str]):
+    """
+    Asynchronously get the best document for each query, embedding all queries in one call
+    """
+    if not queries or not location:
+        logger.warning("Invalid queries or location")
+        return [None] * len(queries)
+
+    try:
+        vector_store = get_async_vector_store()
+        query_embeddings = await embeddings.aembed_documents(queries)
+        results = await asyncio.gather(*[
+            vector_store.asimilarity_search_by_vector(
+                embedding, k=5, filter={"location": {"$in": location}})
+            for embedding in query_embeddings
+        ])
+        return [result[0].page_content if result else None for result in results]
+    except Exception as e:
+        logger.error(f"Error querying vector store: {str(e)}")
+        # Return empty results instead of raising to prevent application crash
+        return [None] * len(queries)
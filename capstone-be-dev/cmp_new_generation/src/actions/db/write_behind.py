@@ -0,0 +1,180 @@
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, List, Optional
+
+from langchain_core.documents import Document
+
+from .vector_store import asave_to_vector_store
+from ...upstream import use_priority
+from ...settings import (
+    WRITE_BEHIND_BATCH_SIZE,
+    WRITE_BEHIND_FLUSH_INTERVAL,
+    WRITE_BEHIND_MAX_SIZE,
+    WRITE_BEHIND_PUT_TIMEOUT,
+)
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class WriteBehindQueue:
+    """
+    Buffer documents in memory and save them to the vector store in batches.
+
+    A background task flushes the buffer when it holds `batch_size` documents or
+    when `flush_interval` seconds have passed since the first buffered document,
+    so each flush is one embedding call and one bulk insert. The buffer is bounded:
+    when it is full, `put` waits up to `put_timeout` seconds for space and drops the
+    remaining documents after that.
+
+    Until `start` is called (or after `close`), documents are saved inline.
+
+    Attributes:
+        save (Callable): Coroutine function saving a batch of documents.
+        max_size (int): Maximum number of buffered documents.
+        batch_size (int): Maximum number of documents per flush.
+        flush_interval (float): Maximum time in seconds a document waits in the buffer.
+        put_timeout (float): Maximum time in seconds `put` waits for space.
+    """
+
+    def __init__(
+        self,
+        save: Callable[[List[Document]], Awaitable[None]],
+        max_size: int = WRITE_BEHIND_MAX_SIZE,
+        batch_size: int = WRITE_BEHIND_BATCH_SIZE,
+        flush_interval: float = WRITE_BEHIND_FLUSH_INTERVAL,
+        put_timeout: float = WRITE_BEHIND_PUT_TIMEOUT,
+    ) -> None:
+        self.save = save
+        self.max_size = max_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.put_timeout = put_timeout
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self.enqueued = 0
+        self.saved = 0
+        self.failed = 0
+        self.dropped = 0
+        self.batches = 0
+        self.last_flush_seconds = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self) -> None:
+        """Start the background flush task, on application startup."""
+        if self.running:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_size)
+        self._task = asyncio.create_task(self._run())
+
+    async def close(self) -> None:
+        """Flush every buffered document and stop the background task, on application shutdown."""
+        if not self.running:
+            return
+        queue, task = self._queue, self._task
+        self._queue = None
+        await queue.put(_STOP)
+        await task
+        self._task = None
+        # Tài liệu được thêm vào sau tín hiệu dừng
+        leftover = []
+        while not queue.empty():
+            leftover.append(queue.get_nowait())
+        if leftover:
+            await self._flush(leftover)
+
+    async def put(self, docs: List[Document]) -> None:
+        """
+        Buffer documents to be saved.
+
+        Args:
+            docs: The documents to save.
+        """
+        queue = self._queue
+        if queue is None or not self.running:
+            await self.save(docs)
+            return
+
+        for index, doc in enumerate(docs):
+            try:
+                queue.put_nowait(doc)
+            except asyncio.QueueFull:
+                try:
+                    await asyncio.wait_for(queue.put(doc), self.put_timeout)
+                except asyncio.TimeoutError:
+                    self.dropped += len(docs) - index
+                    logger.error(
+                        f"Write-behind queue full, dropped {len(docs) - index} documents")
+                    return
+            self.enqueued += 1
+
+    def stats(self) -> dict:
+        """Queue depth and flush counters."""
+        return {
+            "running": self.running,
+            "depth": self._queue.qsize() if self._queue is not None else 0,
+            "max_size": self.max_size,
+            "batch_size": self.batch_size,
+            "flush_interval": self.flush_interval,
+            "enqueued": self.enqueued,
+            "saved": self.saved,
+            "failed": self.failed,
+            "dropped": self.dropped,
+            "batches": self.batches,
+            "last_flush_seconds": self.last_flush_seconds,
+        }
+
+    async def _run(self) -> None:
+        queue = self._queue
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            item = await queue.get()
+            if item is _STOP:
+                break
+            batch = [item]
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            await self._flush(batch)
+
+    async def _flush(self, batch: List[Document]) -> None:
+        start = time.perf_counter()
+        try:
+            await self.save(batch)
+            self.saved += len(batch)
+        except Exception as e:
+            self.failed += len(batch)
+            logger.error(
+                f"Error flushing {len(batch)} documents to vector store: {str(e)}")
+        self.batches += 1
+        self.last_flush_seconds = time.perf_counter() - start
+
+
+async def save_in_background(docs: List[Document]) -> None:
+    """
+    Save documents with the background priority, so their embedding calls yield
+    the Mistral token budget to interactive answers
+    """
+    with use_priority("background"):
+        await asave_to_vector_store(docs)
+
+
+document_queue = WriteBehindQueue(save_in_background)
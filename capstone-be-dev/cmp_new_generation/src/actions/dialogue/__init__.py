@@ -0,0 +1,3 @@
+from .engine import DialogueTurn, run_dialogue
+
+__all__ = ["DialogueTurn", "run_dialogue"]
@@ -0,0 +1,109 @@
+import asyncio
+import logging
+from dataclasses import asdict, dataclass
+from typing import AsyncIterator, Awaitable, Callable, Optional
+
+from ..chains import select_chain
+from ...settings import BRAND_INSTRUCTION
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Số lượt trao đổi gần nhất được đưa lại vào ngữ cảnh của giáo sư
+HISTORY_TURNS = 2
+
+
+@dataclass
+class DialogueTurn:
+    """
+    One professor/student exchange of a dialogue.
+
+    Attributes:
+        turn (int): 1-based index of the turn.
+        question (str): The question the professor answered.
+        answer (str): The answer of alex_professor_it.
+        follow_up (Optional[str]): The follow-up question of alice_student_it,
+            None on the last turn.
+    """
+    turn: int
+    question: str
+    answer: str
+    follow_up: Optional[str] = None
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+def build_context(retrieved: str, history: list[DialogueTurn]) -> str:
+    """
+    Combine retrieved context with the most recent turns kept in memory.
+
+    Args:
+        retrieved: Context retrieved from the vector store.
+        history: The turns completed so far.
+
+    Returns:
+        The context passed to alex_professor_it.
+    """
+    if not history:
+        return retrieved
+    exchanges = "\n".join(
+        f"Sinh viên: {turn.question}\nGiáo sư Alex: {turn.answer}"
+        for turn in history[-HISTORY_TURNS:]
+    )
+    return f"{retrieved}\n\nTrao đổi trước đó:\n{exchanges}".strip()
+
+
+async def run_dialogue(
+    question: str,
+    turns: int,
+    retrieve: Callable[[str], Awaitable[str]],
+) -> AsyncIterator[DialogueTurn]:
+    """
+    Run a professor/student dialogue server-side, yielding each turn as it completes.
+
+    Each turn, alex_professor_it answers the current question and alice_student_it
+    asks the follow-up, which becomes the next question. The student reads the answer
+    from memory instead of the vector store. Retrieval for the next turn is keyed on
+    the professor's answer and starts while the student's LLM call is running, so it
+    is off the critical path.
+
+    Args:
+        question: The initial question of the student.
+        turns: Number of professor answers to produce.
+        retrieve: Coroutine returning vector-store context for a query.
+
+    Yields:
+        The completed turns, in order.
+    """
+    history: list[DialogueTurn] = []
+    context_task = asyncio.create_task(retrieve(question))
+    try:
+        for turn in range(1, turns + 1):
+            retrieved = await context_task
+            answer = await select_chain("alex_professor_it").ainvoke({
+                "question_from_student": question,
+                "context": build_context(retrieved, history),
+                "brand_instruction": BRAND_INSTRUCTION
+            })
+
+            if turn == turns:
+                history.append(DialogueTurn(turn, question, answer))
+                yield history[-1]
+                break
+
+            # Prefetch the next turn's retrieval while the student is generating
+            context_task = asyncio.create_task(retrieve(answer))
+            follow_up = await select_chain("alice_student_it").ainvoke({
+                "question_from_student": question,
+                "answer_from_alex_professor_it": answer,
+                "brand_instruction": BRAND_INSTRUCTION
+            })
+
+            history.append(DialogueTurn(turn, question, answer, follow_up))
+            yield history[-1]
+            question = follow_up
+    finally:
+        if not context_task.done():
+            context_task.cancel()
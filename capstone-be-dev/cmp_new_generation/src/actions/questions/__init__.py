@@ -0,0 +1,3 @@
+from .extractor import QuestionExtractor, extract_questions, extract_questions_batch
+
+__all__ = ["QuestionExtractor", "extract_questions", "extract_questions_batch"]
@@ -0,0 +1,239 @@
+import re
+from typing import Iterable
+
+# English question words (expanded)
+EN_QUESTION_WORDS = r'\b(what|why|how|when|where|who|which|whose|whom|can|could|would|will|is|are|do|does|did|has|have|should|may|might|explain|tell|describe|elaborate|clarify|discuss|advise)\b'
+
+# Vietnamese question words (expanded)
+VN_QUESTION_WORDS = r'\b(gì|sao|làm sao|khi nào|ở đâu|ai|tại sao|bao giờ|như thế nào|cái gì|vì sao|có phải|làm thế nào|hãy|là gì|thế nào|cho biết|giải thích|trình bày|nói về|là ai|thể nào)\b'
+
+# Implicit questions using request phrases
+REQUEST_PHRASES_EN = [
+    r'\b(I\s+(?:want|need|would like)\s+to\s+(?:know|understand|learn))',
+    r'\b((?:Can|Could)\s+you\s+(?:explain|tell|clarify|help))',
+    r'\b((?:Please|Kindly)\s+(?:explain|tell|clarify|advise))',
+    r'\b(I\'m\s+(?:confused|unclear|interested)\s+about)',
+    r'\b((?:not|don\'t)\s+understand\s+how)',
+    r'(what\s+is|how\s+to|how\s+can)'
+]
+
+REQUEST_PHRASES_VI = [
+    r'\b((?:tôi|mình|em)\s+(?:muốn|cần|chưa)\s+(?:biết|hiểu))',
+    r'\b((?:bạn|thầy|anh|chị|cô|anh|em)\s+(?:có thể|vui lòng|hãy)\s+(?:giải thích|cho biết|nói về))',
+    r'\b((?:xin|làm ơn|vui lòng)\s+(?:giải thích|cho biết|nói))',
+    r'\b((?:chưa|không|còn)\s+(?:rõ|hiểu|biết))',
+    r'\b((?:là gì|để làm gì|làm sao))'
+]
+
+# Topic-focused sentences without explicit question structure, like "Nextjs là gì"
+TOPIC_REQUEST_PATTERNS = [
+    # Vietnamese: "X là gì", "X dùng để làm gì"
+    r'([a-zA-Z0-9_\-]+\s+(?:là gì|là ai|là cái gì|dùng để làm gì))',
+    # English: "what is X", "how to use X"
+    r'((?:what is|how to use|how to|how does)\s+[a-zA-Z0-9_\-]+)',
+    # English: "X works", "X function"
+    r'([a-zA-Z0-9_\-]+\s+(?:works|function|means|used for))',
+]
+
+# Phrases like "tôi vẫn chưa rõ" or "I'm still unclear" that lead to the core question
+UNCLEAR_PATTERNS = [
+    # Vietnamese
+    r'((?:tôi|mình|em)\s+(?:vẫn|còn|chưa)\s+(?:chưa|không)\s+(?:rõ|hiểu|biết))',
+    # English
+    r'((?:I|We)\s+(?:still|am|don\'t|do not)\s+(?:unclear|confused|understand|know))'
+]
+
+# Every request phrase contains one of these literals, so a sentence without any of
+# them is rejected by a literal-only search before running the full patterns
+REQUEST_KEYWORDS = (
+    "know", "understand", "learn", "explain", "tell", "clarify", "help", "advise",
+    "about", "what", "how", "biết", "hiểu", "giải thích", "nói", "rõ", "là gì",
+    "để làm gì", "làm sao",
+)
+UNCLEAR_KEYWORDS = ("rõ", "hiểu", "biết", "unclear", "confused", "understand", "know")
+
+# Specific technical terms used to pick the core question (adjust based on your domain)
+TECHNICAL_TERMS = r'\b(router|route|routing|nextjs|react|framework|javascript|phương pháp|cách|method)\b'
+
+
+def _any_of(patterns: list[str]) -> re.Pattern:
+    """Compile a list of patterns into one alternation matching if any of them matches."""
+    return re.compile("|".join(f"(?:{pattern})" for pattern in patterns))
+
+
+def _any_literal(keywords: tuple) -> re.Pattern:
+    """Compile literal keywords into one alternation used as a cheap prefilter."""
+    return re.compile("|".join(re.escape(keyword) for keyword in keywords))
+
+
+class QuestionExtractor:
+    """
+    Question extraction engine with every pattern compiled once.
+
+    Each group of patterns is merged into a single alternation, so a sentence is
+    classified with one regex search per group instead of one per pattern. Literal
+    keyword prefilters skip the full searches for sentences that cannot match, and
+    duplicate checks use a set instead of list membership.
+    """
+
+    WHITESPACE = re.compile(r'\s+')
+    SENTENCE_SPLIT = re.compile(r'(?<=[.!?])\s+|[|;]')
+    QUESTION_WORD = re.compile(f"({EN_QUESTION_WORDS}|{VN_QUESTION_WORDS})")
+    REQUEST = _any_of(REQUEST_PHRASES_EN + REQUEST_PHRASES_VI)
+    TOPIC_REQUEST = _any_of(TOPIC_REQUEST_PATTERNS)
+    UNCLEAR = _any_of(UNCLEAR_PATTERNS)
+    REQUEST_PREFILTER = _any_literal(REQUEST_KEYWORDS)
+    UNCLEAR_PREFILTER = _any_literal(UNCLEAR_KEYWORDS)
+    LEADING_NUMBER = re.compile(r'^\d+\s*[.)]\s*')
+    GREETING = re.compile(
+        r'^(xin chào|cảm ơn|hello|thank you|hi|chào|kính gửi)[^.!?]+[,.]\s*', re.IGNORECASE)
+    TECHNICAL = re.compile(TECHNICAL_TERMS)
+
+    def split_sentences(self, text: str) -> list[str]:
+        cleaned_text = self.WHITESPACE.sub(' ', text).strip()
+        sentences = self.SENTENCE_SPLIT.split(cleaned_text)
+        return [s.strip() for s in sentences if s.strip()]
+
+    def extract(self, text: str) -> list[str]:
+        """
+        Extract questions from text comprehensively in both Vietnamese and English.
+
+        This function detects:
+        1. Questions ending with question marks
+        2. Questions starting with question words
+        3. Numbered questions
+        4. Implicit questions without question marks
+        5. Core information requests in conversational text
+
+        Args:
+            text: Input text that may contain questions
+
+        Returns:
+            List of extracted questions
+        """
+        if not text:
+            return []
+
+        sentences = self.split_sentences(text)
+
+        # Classify every sentence in a single pass
+        lowered = [s.lower() for s in sentences]
+        has_mark = [s.endswith('?') for s in sentences]
+        has_word = [bool(self.QUESTION_WORD.match(s)) for s in lowered]
+        # Sentences already matched by pattern 1 or 2 never reach pattern 3
+        has_request = [
+            not has_mark[i] and not has_word[i]
+            and bool(self.REQUEST_PREFILTER.search(s)) and bool(self.REQUEST.search(s))
+            for i, s in enumerate(lowered)
+        ]
+        leads_to_question = [
+            bool(self.UNCLEAR_PREFILTER.search(s)) and bool(self.UNCLEAR.search(s))
+            for s in lowered
+        ]
+
+        questions: list[str] = []
+        seen: set[str] = set()
+
+        def add(s: str) -> None:
+            questions.append(s)
+            seen.add(s)
+
+        # Pattern 1: explicit questions with question marks
+        for i, s in enumerate(sentences):
+            if has_mark[i]:
+                add(s)
+
+        # Pattern 2: questions starting with question words
+        for i, s in enumerate(sentences):
+            if has_word[i] and s not in seen:
+                add(s)
+
+        # Pattern 3: implicit questions using request phrases
+        for i, s in enumerate(sentences):
+            if has_request[i] and s not in seen:
+                add(s)
+
+        # Pattern 4: topic-focused sentences, only when nothing else was found
+        if not questions:
+            for s, low in zip(sentences, lowered):
+                if self.TOPIC_REQUEST.search(low):
+                    add(s)
+
+        # Pattern 5: the sentence following an "I'm still unclear" type phrase
+        for i in range(len(sentences) - 1):
+            if leads_to_question[i] and sentences[i + 1] not in seen:
+                add(sentences[i + 1])
+
+        # Clean up questions
+        cleaned_questions = []
+        for q in questions:
+            # Remove leading numbers and punctuation
+            q = self.LEADING_NUMBER.sub('', q.strip())
+
+            # Remove common conversation starters like "Hello professor" or "Thank you for"
+            q = self.GREETING.sub('', q)
+
+            if q and len(q) > 5:  # Ensure minimum length for a valid question
+                cleaned_questions.append(q)
+
+        # Extract the most probable core question
+        # Priority:
+        # 1. Question mark questions
+        # 2. Direct request questions with "how", "what", etc.
+        # 3. Sentences with key topic indicators
+        core_questions = [q for q in cleaned_questions if q.endswith('?')]
+
+        if not core_questions:
+            core_questions = [
+                q for q in cleaned_questions if self.QUESTION_WORD.match(q.lower())]
+
+        # If we have multiple core questions, prioritize based on relevance and specificity
+        if len(core_questions) > 1:
+            # Prefer questions with specific technical terms or topic indicators
+            for q in core_questions:
+                if self.TECHNICAL.search(q.lower()):
+                    return [q]
+
+            # If no specific technical terms found, return the longest question as it's likely more detailed
+            return [max(core_questions, key=len)]
+
+        return core_questions if core_questions else cleaned_questions
+
+    def extract_batch(self, texts: Iterable[str]) -> list[list[str]]:
+        """
+        Extract questions from many texts, computing repeated texts only once.
+
+        Args:
+            texts: Input texts that may contain questions
+
+        Returns:
+            One list of extracted questions per input text, in order
+        """
+        results: dict[str, list[str]] = {}
+        output = []
+        for text in texts:
+            if text not in results:
+                results[text] = self.extract(text)
+            output.append(list(results[text]))
+        return output
+
+
+question_extractor = QuestionExtractor()
+
+
+def extract_questions(text: str) -> list[str]:
+    """
+    Extract questions from text in both Vietnamese and English.
+
+    See `QuestionExtractor.extract`.
+    """
+    return question_extractor.extract(text)
+
+
+def extract_questions_batch(texts: Iterable[str]) -> list[list[str]]:
+    """
+    Extract questions from many texts.
+
+    See `QuestionExtractor.extract_batch`.
+    """
+    return question_extractor.extract_batch(texts)
@@ -1,3 +1,4 @@
-from .summarize import summarize
+from .summarize import summarize, SummarizeMode
+from .engine import LsaSummarizationEngine
 
-__all__ = ["summarize"]
+__all__ = ["summarize", "SummarizeMode", "LsaSummarizationEngine"]
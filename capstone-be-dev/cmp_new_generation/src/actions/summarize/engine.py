@@ -0,0 +1,195 @@
+import re
+from typing import Iterator, List, Optional
+
+import numpy as np
+from scipy import sparse
+
+from .tokenizer import TokenizerVietnamese
+
+# One line and its separator, with the separators of str.splitlines
+_LINE_RE = re.compile(
+    r"([^\n\r\v\f\x1c-\x1e\x85\u2028\u2029]*)(\r\n|[\n\r\v\f\x1c-\x1e\x85\u2028\u2029]|$)")
+
+
+class LsaSummarizationEngine:
+    """
+    Extractive LSA summarizer over a sparse TF-IDF sentence matrix.
+
+    Each sentence is a row of a sparse sentence-by-term matrix weighted with
+    smoothed maximum-TF (as sumy's LsaSummarizer) times IDF. Sentences are ranked
+    by the norm of their projection on the top singular vectors, computed with a
+    randomized truncated SVD, so time and memory grow with the number of non-zero
+    cells instead of sentences times vocabulary.
+
+    The tokenizer is created once and shared by every call.
+
+    Attributes:
+        tokenizer (TokenizerVietnamese): Splits text into sentences and words.
+        components (int): Number of singular vectors used for ranking.
+        oversampling (int): Extra random vectors of the randomized SVD.
+        power_iterations (int): Power iterations of the randomized SVD.
+        smooth (float): Smoothing of the maximum-TF normalization.
+    """
+
+    def __init__(
+        self,
+        tokenizer: Optional[TokenizerVietnamese] = None,
+        components: int = 10,
+        oversampling: int = 10,
+        power_iterations: int = 2,
+        smooth: float = 0.4,
+    ) -> None:
+        self.tokenizer = tokenizer or TokenizerVietnamese()
+        self.components = components
+        self.oversampling = oversampling
+        self.power_iterations = power_iterations
+        self.smooth = smooth
+
+    def iter_sentences(self, text: str) -> Iterator[str]:
+        """
+        Lazily split a text into sentences like sumy's PlaintextParser.
+
+        Paragraphs are separated by empty lines and lines all in upper case are
+        headings, which end the current text but are not candidate sentences.
+        """
+        lines: List[str] = []
+        for match in _LINE_RE.finditer(text.strip()):
+            line = match.group(1).strip()
+            if not line or _is_heading(line):
+                if lines:
+                    yield from self.tokenizer.iter_sentences(" ".join(lines))
+                    lines = []
+            else:
+                lines.append(line)
+            if not match.group(2):
+                break
+        if lines:
+            yield from self.tokenizer.iter_sentences(" ".join(lines))
+
+    def split_sentences(self, text: str) -> List[str]:
+        """Split a text into its candidate sentences."""
+        return list(self.iter_sentences(text))
+
+    def rank_sentences(self, sentences: List[str]) -> np.ndarray:
+        """
+        Rate each sentence by its weight in the main topics of the text.
+
+        Args:
+            sentences: The sentences of the text.
+
+        Returns:
+            The rating of each sentence, higher is more important.
+        """
+        matrix = self.build_matrix(sentences)
+        if matrix.nnz == 0:
+            return np.zeros(len(sentences))
+        u, sigma = self._truncated_svd(matrix)
+        return np.linalg.norm(u * sigma, axis=1)
+
+    def build_matrix(self, sentences: List[str]) -> sparse.csr_matrix:
+        """Build the sparse sentence-by-term TF-IDF matrix."""
+        vocabulary: dict[str, int] = {}
+        rows: List[int] = []
+        cols: List[int] = []
+        for row, sentence in enumerate(sentences):
+            for word in self.tokenizer.iter_words(sentence):
+                rows.append(row)
+                cols.append(vocabulary.setdefault(
+                    word.lower(), len(vocabulary)))
+
+        counts = sparse.csr_matrix(
+            (np.ones(len(rows)), (rows, cols)),
+            shape=(len(sentences), len(vocabulary)))
+        counts.sum_duplicates()
+        if counts.nnz == 0:
+            return counts
+
+        # TF chuẩn hóa theo tần suất lớn nhất của câu, chỉ trên các ô khác 0
+        max_counts = counts.max(axis=1).toarray().ravel()
+        row_of_cell = np.repeat(np.arange(counts.shape[0]), np.diff(counts.indptr))
+        counts.data = self.smooth + (1.0 - self.smooth) * \
+            counts.data / max_counts[row_of_cell]
+
+        document_frequency = np.bincount(
+            counts.indices, minlength=counts.shape[1])
+        idf = np.log(len(sentences) / document_frequency) + 1.0
+        counts.data *= idf[counts.indices]
+        return counts
+
+    def summarize(self, text: str, num_sentences: int = 5) -> str:
+        """
+        Summarize a text with its most important sentences.
+
+        Args:
+            text: The text to summarize.
+            num_sentences: Number of sentences of the summary.
+
+        Returns:
+            The selected sentences in document order, joined by spaces.
+        """
+        return " ".join(self.top_sentences(self.split_sentences(text), num_sentences))
+
+    def summarize_chunked(self, text: str, num_sentences: int = 5, window_size: int = 500) -> str:
+        """
+        Summarize a large text by map-reduce over fixed-size sentence windows.
+
+        Each window of `window_size` sentences is summarized as soon as it is read,
+        and the window summaries are summarized again whenever they fill a window,
+        so at most two windows of sentences are held at once whatever the size of
+        the text.
+
+        Args:
+            text: The text to summarize.
+            num_sentences: Number of sentences of the summary.
+            window_size: Number of sentences summarized at once.
+
+        Returns:
+            The selected sentences in document order, joined by spaces.
+        """
+        summaries: List[str] = []
+        window: List[str] = []
+        for sentence in self.iter_sentences(text):
+            window.append(sentence)
+            if len(window) < window_size:
+                continue
+            summaries.extend(self.top_sentences(window, num_sentences))
+            window = []
+            if len(summaries) >= window_size:
+                summaries = self.top_sentences(summaries, num_sentences)
+        summaries.extend(self.top_sentences(window, num_sentences))
+        return " ".join(self.top_sentences(summaries, num_sentences))
+
+    def top_sentences(self, sentences: List[str], num_sentences: int) -> List[str]:
+        """Select the `num_sentences` best rated sentences, in document order."""
+        if not sentences or num_sentences <= 0:
+            return []
+        ranks = self.rank_sentences(sentences)
+        best = np.argsort(-ranks, kind="stable")[:num_sentences]
+        return [sentences[i] for i in np.sort(best)]
+
+    def _truncated_svd(self, matrix: sparse.csr_matrix):
+        """Left singular vectors and singular values of the top components (randomized SVD)."""
+        rows, cols = matrix.shape
+        k = min(self.components, rows, cols)
+        sketch_size = k + self.oversampling
+        if sketch_size >= min(rows, cols):
+            # Ma trận nhỏ: SVD đầy đủ rẻ hơn
+            u, sigma, _ = np.linalg.svd(matrix.toarray(), full_matrices=False)
+            return u[:, :k], sigma[:k]
+
+        rng = np.random.default_rng(0)
+        sketch = matrix @ rng.standard_normal((cols, sketch_size))
+        basis, _ = np.linalg.qr(sketch)
+        for _ in range(self.power_iterations):
+            basis, _ = np.linalg.qr(matrix.T @ basis)
+            basis, _ = np.linalg.qr(matrix @ basis)
+        small = (matrix.T @ basis).T
+        u_small, sigma, _ = np.linalg.svd(small, full_matrices=False)
+        return (basis @ u_small)[:, :k], sigma[:k]
+
+
+def _is_heading(line: str) -> bool:
+    return line.isupper() and all(not c.isalpha() or c.isupper() for c in line)
+
+
+summarization_engine = LsaSummarizationEngine()
@@ -1,11 +1,30 @@
-from sumy.summarizers.lsa import LsaSummarizer
-from sumy.parsers.plaintext import PlaintextParser
-from .tokenizer import TokenizerVietnamese
+from typing import Literal
 
+from .engine import summarization_engine
+from ...settings import SUMMARY_CHUNKED_THRESHOLD, SUMMARY_WINDOW_SENTENCES
 
-def summarize(text: str, num_sentences: int = 5):
-    tokenizer = TokenizerVietnamese()
-    parser = PlaintextParser.from_string(text, tokenizer)
-    summarizer = LsaSummarizer()
-    summary = summarizer(parser.document, num_sentences)
-    return " ".join(str(sentence) for sentence in summary)
+SummarizeMode = Literal["auto", "full", "chunked"]
+
+
+def summarize(text: str, num_sentences: int = 5, mode: SummarizeMode = "auto"):
+    """
+    Summarize a text with its most important sentences.
+
+    Args:
+        text: The text to summarize.
+        num_sentences: Number of sentences of the summary.
+        mode: "full" ranks all sentences at once, "chunked" summarizes windows of
+            sentences then their summaries (bounded memory), "auto" uses chunked
+            above SUMMARY_CHUNKED_THRESHOLD characters.
+
+    Returns:
+        The selected sentences in document order, joined by spaces.
+    """
+    if mode == "auto":
+        mode = "chunked" if len(text) > SUMMARY_CHUNKED_THRESHOLD else "full"
+    if mode == "full":
+        return summarization_engine.summarize(text, num_sentences)
+    if mode == "chunked":
+        return summarization_engine.summarize_chunked(
+            text, num_sentences, window_size=SUMMARY_WINDOW_SENTENCES)
+    raise ValueError(f"Unknown summarize mode: {mode}")
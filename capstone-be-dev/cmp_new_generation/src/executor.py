@@ -0,0 +1,201 @@
+import asyncio
+import functools
+import importlib
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional, TypeVar
+
+from .settings import (
+    EXECUTOR_MAX_WORKERS,
+    PROCESS_POOL_ENABLED,
+    PROCESS_POOL_MAX_TASKS_PER_CHILD,
+    PROCESS_POOL_MAX_WORKERS,
+    PROCESS_POOL_MIN_INPUT_SIZE,
+    PROCESS_POOL_TIMEOUT,
+)
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Module của các tác vụ CPU, được import sẵn khi worker khởi động
+PROCESS_POOL_WARM_MODULES = (
+    "src.actions.summarize",
+    "src.actions.questions",
+    "trafilatura",
+)
+
+_executor: Optional[ThreadPoolExecutor] = None
+_process_pool: Optional[ProcessPoolExecutor] = None
+_process_pool_stats = {
+    "in_process": 0,
+    "in_pool": 0,
+    "timeouts": 0,
+    "broken_pools": 0,
+}
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """
+    Get the shared, bounded thread pool used for blocking work.
+
+    The pool is created lazily so importing this module has no side effects.
+
+    Returns:
+        The application-wide ThreadPoolExecutor.
+    """
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=EXECUTOR_MAX_WORKERS,
+            thread_name_prefix="cmp-blocking",
+        )
+        logger.info(
+            f"Initialized blocking executor with {EXECUTOR_MAX_WORKERS} workers")
+    return _executor
+
+
+async def run_blocking(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Run a synchronous function on the bounded executor without blocking the event loop.
+
+    Args:
+        func: The blocking function to run.
+        *args: Positional arguments for the function.
+        **kwargs: Keyword arguments for the function.
+
+    Returns:
+        The return value of the function.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        get_executor(), functools.partial(func, *args, **kwargs))
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """
+    Get the shared process pool used for CPU-bound work.
+
+    Workers are started with the "spawn" method, so they never inherit the event
+    loop, sockets or locks of the server process, and are replaced after
+    PROCESS_POOL_MAX_TASKS_PER_CHILD tasks to cap memory growth. Each worker
+    imports PROCESS_POOL_WARM_MODULES when it starts, so no task pays for it.
+
+    Returns:
+        The application-wide ProcessPoolExecutor.
+    """
+    global _process_pool
+    if _process_pool is None:
+        _process_pool = ProcessPoolExecutor(
+            max_workers=PROCESS_POOL_MAX_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+            max_tasks_per_child=PROCESS_POOL_MAX_TASKS_PER_CHILD,
+            initializer=_init_worker,
+        )
+        logger.info(
+            f"Initialized process pool with {PROCESS_POOL_MAX_WORKERS} workers")
+    return _process_pool
+
+
+def warm_process_pool() -> None:
+    """Start every worker of the process pool ahead of the first task, on application startup."""
+    if not PROCESS_POOL_ENABLED:
+        return
+    pool = get_process_pool()
+    # Worker "spawn" được tạo theo số task đang chờ: gửi một task rỗng cho mỗi worker
+    for _ in range(PROCESS_POOL_MAX_WORKERS):
+        pool.submit(_noop)
+
+
+def _init_worker() -> None:
+    for module in PROCESS_POOL_WARM_MODULES:
+        importlib.import_module(module)
+
+
+def _noop() -> None:
+    return None
+
+
+async def run_cpu_bound(
+    func: Callable[..., T],
+    *args: Any,
+    input_size: int = 0,
+    timeout: Optional[float] = PROCESS_POOL_TIMEOUT,
+    **kwargs: Any,
+) -> T:
+    """
+    Run a CPU-bound function in the process pool so it does not hold the GIL of the server.
+
+    Inputs smaller than PROCESS_POOL_MIN_INPUT_SIZE run on the thread pool instead,
+    since sending them to another process costs more than the work itself. The
+    function and its arguments must be picklable (module-level functions).
+
+    Args:
+        func: The function to run.
+        *args: Positional arguments for the function.
+        input_size: Size of the input (characters or bytes), used to pick the executor.
+        timeout: Seconds to wait for the result, None to wait forever.
+        **kwargs: Keyword arguments for the function.
+
+    Returns:
+        The return value of the function.
+
+    Raises:
+        asyncio.TimeoutError: If the task does not finish within `timeout`.
+    """
+    global _process_pool
+    if not PROCESS_POOL_ENABLED or input_size < PROCESS_POOL_MIN_INPUT_SIZE:
+        _process_pool_stats["in_process"] += 1
+        return await run_blocking(func, *args, **kwargs)
+
+    pool = get_process_pool()
+    try:
+        future = pool.submit(functools.partial(func, *args, **kwargs))
+    except BrokenProcessPool:
+        future = None
+    if future is not None:
+        _process_pool_stats["in_pool"] += 1
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+        except asyncio.TimeoutError:
+            # wait_for hủy task còn trong hàng đợi; task đang chạy không thể dừng,
+            # worker sẽ nhận task mới khi chạy xong
+            _process_pool_stats["timeouts"] += 1
+            logger.error(
+                f"{getattr(func, '__name__', func)} did not finish within {timeout} seconds")
+            raise
+        except BrokenProcessPool:
+            pass
+
+    # Một worker bị dừng đột ngột (ví dụ hết bộ nhớ): tạo lại pool, chạy task trong process
+    _process_pool_stats["broken_pools"] += 1
+    logger.error("Process pool is broken, recreating it")
+    if _process_pool is pool:
+        _process_pool = None
+        pool.shutdown(wait=False, cancel_futures=True)
+    return await run_blocking(func, *args, **kwargs)
+
+
+def get_executor_metrics() -> dict:
+    """Counters of the tasks run in process and in the process pool."""
+    return {
+        "thread_workers": EXECUTOR_MAX_WORKERS,
+        "process_workers": PROCESS_POOL_MAX_WORKERS if PROCESS_POOL_ENABLED else 0,
+        "process_pool_started": _process_pool is not None,
+        **_process_pool_stats,
+    }
+
+
+def shutdown_executor() -> None:
+    """Shut down the shared executors, waiting for running tasks to finish."""
+    global _executor, _process_pool
+    if _process_pool is not None:
+        _process_pool.shutdown(wait=True, cancel_futures=True)
+        _process_pool = None
+    if _executor is not None:
+        _executor.shutdown(wait=True)
+        _executor = None
@@ -0,0 +1,5 @@
+from .backends import RateLimitBackend, MemoryBackend, SQLiteBackend, create_backend
+from .limiter import RateLimiter
+
+__all__ = ["RateLimiter", "RateLimitBackend", "MemoryBackend", "SQLiteBackend",
+           "create_backend"]
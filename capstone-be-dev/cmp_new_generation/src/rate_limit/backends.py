@@ -0,0 +1,191 @@
+import math
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Tuple
+
+from ..settings import RATE_LIMIT_BACKEND, RATE_LIMIT_MAX_CLIENTS, RATE_LIMIT_SQLITE_PATH
+
+
+def take_token(
+    tokens: float,
+    updated_at: float,
+    capacity: float,
+    refill_rate: float,
+    now: float,
+    cost: float = 1.0,
+) -> Tuple[float, float]:
+    """
+    Apply the token-bucket algorithm to one client's bucket.
+
+    A cost above the capacity is charged as a full bucket, otherwise the request
+    could never be allowed.
+
+    Args:
+        tokens: Tokens left in the bucket at `updated_at`.
+        updated_at: Time of the last update of the bucket.
+        capacity: Maximum number of tokens in the bucket.
+        refill_rate: Tokens added per second.
+        now: Current time.
+        cost: Tokens taken by the request.
+
+    Returns:
+        The new number of tokens, and 0 if the request is allowed or the number of
+        seconds until enough tokens are available otherwise.
+    """
+    cost = min(cost, capacity)
+    tokens = min(capacity, tokens + max(0.0, now - updated_at) * refill_rate)
+    if tokens >= cost:
+        return tokens - cost, 0.0
+    return tokens, (cost - tokens) / refill_rate
+
+
+class RateLimitBackend(ABC):
+    """
+    Storage for token buckets, keyed by client.
+
+    Attributes:
+        blocking (bool): Whether `acquire` does blocking I/O and should run off the event loop.
+    """
+
+    blocking: bool = False
+
+    @abstractmethod
+    def acquire(self, key: str, capacity: float, refill_rate: float, now: float, cost: float = 1.0) -> float:
+        """
+        Take `cost` tokens from the bucket of `key`.
+
+        Args:
+            key: The client key.
+            capacity: Maximum number of tokens in the bucket.
+            refill_rate: Tokens added per second.
+            now: Current time.
+            cost: Tokens taken by the request.
+
+        Returns:
+            0 if the request is allowed, otherwise the number of seconds to wait.
+        """
+
+
+class MemoryBackend(RateLimitBackend):
+    """
+    In-process token buckets with LRU and idle eviction.
+
+    Each client costs a constant amount of memory. Buckets idle long enough to be
+    full again are indistinguishable from new ones and are dropped, and the least
+    recently used buckets are evicted beyond `max_clients`.
+
+    Attributes:
+        max_clients (int): Maximum number of buckets kept in memory.
+    """
+
+    def __init__(self, max_clients: int = RATE_LIMIT_MAX_CLIENTS) -> None:
+        self.max_clients = max_clients
+        self.buckets: "OrderedDict[str, Tuple[float, float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def acquire(self, key: str, capacity: float, refill_rate: float, now: float, cost: float = 1.0) -> float:
+        with self._lock:
+            self._evict(now)
+            tokens, updated_at, _ = self.buckets.pop(key, (capacity, now, 0.0))
+            tokens, retry_after = take_token(
+                tokens, updated_at, capacity, refill_rate, now, cost)
+            # Thời điểm bucket đầy trở lại, sau đó có thể xóa bucket
+            idle_at = now + (capacity - tokens) / refill_rate
+            self.buckets[key] = (tokens, now, idle_at)
+            return retry_after
+
+    def _evict(self, now: float) -> None:
+        while self.buckets:
+            key, (_, _, idle_at) = next(iter(self.buckets.items()))
+            if len(self.buckets) < self.max_clients and idle_at > now:
+                break
+            del self.buckets[key]
+
+
+class SQLiteBackend(RateLimitBackend):
+    """
+    Token buckets stored in a SQLite database shared by every worker process.
+
+    Each update runs in an immediate transaction, so limits hold across multiple
+    uvicorn workers on the same host.
+
+    Attributes:
+        path (str): Path of the SQLite database file.
+        max_clients (int): Maximum number of buckets kept in the database.
+    """
+
+    blocking = True
+    # Dọn các bucket cũ sau mỗi N lần gọi
+    CLEANUP_EVERY = 1000
+
+    def __init__(self, path: str = RATE_LIMIT_SQLITE_PATH, max_clients: int = RATE_LIMIT_MAX_CLIENTS) -> None:
+        self.path = path
+        self.max_clients = max_clients
+        self._lock = threading.Lock()
+        self._calls = 0
+        self._conn = sqlite3.connect(
+            path, timeout=5, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS rate_limit_buckets ("
+            "key TEXT PRIMARY KEY, tokens REAL NOT NULL, "
+            "updated_at REAL NOT NULL, idle_at REAL NOT NULL)")
+
+    def acquire(self, key: str, capacity: float, refill_rate: float, now: float, cost: float = 1.0) -> float:
+        with self._lock:
+            conn = self._conn
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(
+                    "SELECT tokens, updated_at FROM rate_limit_buckets WHERE key = ?",
+                    (key,)).fetchone()
+                tokens, updated_at = row if row else (capacity, now)
+                tokens, retry_after = take_token(
+                    tokens, updated_at, capacity, refill_rate, now, cost)
+                idle_at = now + (capacity - tokens) / refill_rate
+                conn.execute(
+                    "INSERT INTO rate_limit_buckets (key, tokens, updated_at, idle_at) "
+                    "VALUES (?, ?, ?, ?) ON CONFLICT(key) DO UPDATE SET "
+                    "tokens = excluded.tokens, updated_at = excluded.updated_at, "
+                    "idle_at = excluded.idle_at",
+                    (key, tokens, now, idle_at))
+                self._calls += 1
+                if self._calls % self.CLEANUP_EVERY == 0:
+                    self._evict(now)
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            return retry_after
+
+    def _evict(self, now: float) -> None:
+        self._conn.execute(
+            "DELETE FROM rate_limit_buckets WHERE idle_at <= ?", (now,))
+        self._conn.execute(
+            "DELETE FROM rate_limit_buckets WHERE key IN ("
+            "SELECT key FROM rate_limit_buckets ORDER BY updated_at DESC "
+            "LIMIT -1 OFFSET ?)", (self.max_clients,))
+
+
+def create_backend(name: str = RATE_LIMIT_BACKEND) -> RateLimitBackend:
+    """
+    Create the rate-limit backend configured by name.
+
+    Args:
+        name: "memory" or "sqlite".
+
+    Returns:
+        The backend instance.
+    """
+    if name == "memory":
+        return MemoryBackend()
+    if name == "sqlite":
+        return SQLiteBackend()
+    raise ValueError(f"Unknown rate limit backend: {name}")
+
+
+def retry_after_header(seconds: float) -> str:
+    """Format a wait time for the `Retry-After` header (whole seconds, at least 1)."""
+    return str(max(1, math.ceil(seconds)))
@@ -0,0 +1,92 @@
+import time
+from fastapi import Request, HTTPException
+from typing import Optional
+
+from .backends import RateLimitBackend, create_backend, retry_after_header
+from ..executor import run_blocking
+
+
+class RateLimiter:
+    """
+    A token-bucket rate limiter for FastAPI applications.
+
+    This rate limiter limits the number of requests a client can make within a specified time window.
+    The rate limiting is based on the client's IP address. Each client gets a bucket of `times` tokens
+    that refills continuously over `seconds`, so bursts up to `times` requests are allowed and the
+    sustained rate is `times / seconds`.
+
+    One instance must be shared by all requests (use the instance itself as the dependency), since the
+    buckets live in its backend.
+
+    Attributes:
+        times (int): The maximum number of requests allowed per client within the specified period.
+        seconds (int): The time window in seconds during which requests are counted.
+        scope (str): Prefix of the client keys, so several limiters can share one backend.
+        backend (RateLimitBackend): Storage for the per-client buckets.
+    """
+
+    def __init__(
+        self,
+        times: int,
+        seconds: int,
+        scope: str = "default",
+        backend: Optional[RateLimitBackend] = None,
+    ) -> None:
+        """
+        Initializes the RateLimiter instance with the specified request limit and time period.
+
+        Args:
+            times (int): The maximum number of requests allowed per client.
+            seconds (int): The time period in seconds for rate limiting.
+            scope (str): Prefix of the client keys in the backend.
+            backend (Optional[RateLimitBackend]): Bucket storage, the configured backend by default.
+        """
+        self.times: int = times
+        self.seconds: int = seconds
+        self.scope: str = scope
+        self.backend: RateLimitBackend = backend or create_backend()
+
+    async def __call__(self, request: Request) -> None:
+        """
+        Checks if the incoming request exceeds the allowed rate limit.
+
+        This method is called on each request to the FastAPI route that uses this rate limiter as a dependency.
+        If the client's bucket is empty, an HTTP 429 exception is raised with a `Retry-After` header.
+
+        Args:
+            request (Request): The incoming HTTP request object.
+
+        Raises:
+            HTTPException: If the request rate limit is exceeded, a 429 status code is returned.
+        """
+        await self.acquire(request)
+
+    async def acquire(self, request: Request, cost: float = 1) -> None:
+        """
+        Charge a request that counts as `cost` requests, such as a batch of questions.
+
+        Args:
+            request (Request): The incoming HTTP request object.
+            cost (float): Number of tokens taken from the client's bucket, at most `times`.
+
+        Raises:
+            HTTPException: If the client's bucket does not hold `cost` tokens, a 429 status code is returned.
+        """
+        client_ip: str = request.client.host if request.client else "unknown"
+        key = f"{self.scope}:{client_ip}"
+        refill_rate = self.times / self.seconds
+        current_time: float = time.time()
+
+        if self.backend.blocking:
+            retry_after = await run_blocking(
+                self.backend.acquire, key, self.times, refill_rate, current_time, cost)
+        else:
+            retry_after = self.backend.acquire(
+                key, self.times, refill_rate, current_time, cost)
+
+        if retry_after > 0:
+            wait = retry_after_header(retry_after)
+            raise HTTPException(
+                status_code=429,
+                detail=f"Quá số lần yêu cầu, vui lòng thử lại sau {wait} giây",
+                headers={"Retry-After": wait})
@@ -1,3 +1,4 @@
 from .main import actions_router
+from .admin import admin_router
 
-__all__ = ["actions_router"]
+__all__ = ["actions_router", "admin_router"]
@@ -0,0 +1,150 @@
+import secrets
+from fastapi import APIRouter, Depends, Header, HTTPException
+from typing import Optional
+from ..executor import run_blocking, get_executor_metrics
+from ..singleflight import singleflight_stats
+from ..upstream import hedge_stats, mistral_budget, mistral_controller
+from ..actions.chains import chain_metrics_stats, router_stats
+from .schemas import MetricsResponse
+from ..settings import ADMIN_TOKEN
+from ..actions.db import get_pool_metrics, embedding_cache, document_queue
+from ..actions.ctxs import content_cache, search_cache
+from ..actions.cache import answer_cache_stats, llm_cache_stats, invalidate_llm_cache
+
+
+def verify_admin_token(x_admin_token: Optional[str] = Header(default=None)):
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Admin API is disabled")
+    if not x_admin_token or not secrets.compare_digest(x_admin_token, ADMIN_TOKEN):
+        raise HTTPException(status_code=401, detail="Invalid admin token")
+
+
+admin_router = APIRouter(
+    prefix="/cmp-admin",
+    tags=["CMP Admin"],
+    dependencies=[Depends(verify_admin_token)],
+)
+
+
+@admin_router.get("/metrics/vector-store", response_model=MetricsResponse)
+async def vector_store_metrics():
+    """
+    Connection pool metrics of the vector store
+    """
+    return MetricsResponse(success=True, result=get_pool_metrics())
+
+
+@admin_router.get("/metrics/executor", response_model=MetricsResponse)
+async def executor_metrics():
+    """
+    Counters of the CPU-bound tasks run in process and in the process pool
+    """
+    return MetricsResponse(success=True, result=get_executor_metrics())
+
+
+@admin_router.get("/metrics/write-behind", response_model=MetricsResponse)
+async def write_behind_metrics():
+    """
+    Queue depth and flush counters of the write-behind document queue
+    """
+    return MetricsResponse(success=True, result=document_queue.stats())
+
+
+@admin_router.get("/metrics/embedding-cache", response_model=MetricsResponse)
+async def embedding_cache_metrics():
+    """
+    Hit and miss counters of the embedding cache
+    """
+    return MetricsResponse(success=True, result=embedding_cache.stats())
+
+
+@admin_router.get("/metrics/semantic-cache", response_model=MetricsResponse)
+async def semantic_cache_metrics():
+    """
+    Size and hit and miss counters of the semantic answer cache of each endpoint
+    """
+    return MetricsResponse(success=True, result=answer_cache_stats())
+
+
+@admin_router.get("/metrics/llm-cache", response_model=MetricsResponse)
+async def llm_cache_metrics():
+    """
+    Hit and miss counters and size of the LLM response cache of each chain
+    """
+    return MetricsResponse(success=True, result=await run_blocking(llm_cache_stats))
+
+
+@admin_router.delete("/llm-cache", response_model=MetricsResponse)
+async def invalidate_llm_cache_actions(chain: Optional[str] = None):
+    """
+    Invalidate the LLM response cache of one chain, or of every chain if none is given
+    """
+    invalidated = await run_blocking(invalidate_llm_cache, chain)
+    if chain and not invalidated:
+        raise HTTPException(
+            status_code=404, detail=f"No LLM cache for chain {chain}")
+    return MetricsResponse(success=True, result={"invalidated": invalidated})
+
+
+@admin_router.get("/metrics/content-cache", response_model=MetricsResponse)
+async def content_cache_metrics():
+    """
+    Hit, revalidation and miss counters and size of the URL content cache
+    """
+    return MetricsResponse(success=True, result=await run_blocking(content_cache.stats))
+
+
+@admin_router.get("/metrics/search-cache", response_model=MetricsResponse)
+async def search_cache_metrics():
+    """
+    Hit and miss counters of the search cache and searches coalesced upstream
+    """
+    return MetricsResponse(success=True, result=search_cache.stats())
+
+
+@admin_router.get("/metrics/coalescing", response_model=MetricsResponse)
+async def coalescing_metrics():
+    """
+    Executed and coalesced calls of the endpoints sharing identical in-flight requests
+    """
+    return MetricsResponse(success=True, result=singleflight_stats())
+
+
+@admin_router.get("/metrics/mistral", response_model=MetricsResponse)
+async def mistral_metrics():
+    """
+    Adaptive concurrency limit, queueing delay and retries of the Mistral API calls
+    """
+    return MetricsResponse(success=True, result=mistral_controller.stats())
+
+
+@admin_router.get("/metrics/mistral-budget", response_model=MetricsResponse)
+async def mistral_budget_metrics():
+    """
+    Token-per-minute budget of the Mistral API: available tokens and queued calls per priority class
+    """
+    return MetricsResponse(success=True, result=mistral_budget.stats())
+
+
+@admin_router.get("/metrics/llm-router", response_model=MetricsResponse)
+async def llm_router_metrics():
+    """
+    Rolling latency, error rate and health of the LLM backends
+    """
+    return MetricsResponse(success=True, result=router_stats())
+
+
+@admin_router.get("/metrics/llm-hedging", response_model=MetricsResponse)
+async def llm_hedging_metrics():
+    """
+    Hedge delay, hedge rate and hedge wins of the hedged chains
+    """
+    return MetricsResponse(success=True, result=hedge_stats())
+
+
+@admin_router.get("/metrics/chains", response_model=MetricsResponse)
+async def chain_metrics():
+    """
+    Latency and token usage of the LLM calls of each chain
+    """
+    return MetricsResponse(success=True, result=chain_metrics_stats())
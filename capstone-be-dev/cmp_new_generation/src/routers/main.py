@@ -1,9 +1,16 @@
-import re
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from ..actions import *
-from .schemas import QueryRequest, UrlRequest, UrlsRequest, TextRequest, QuestionRequest, ActionResponse
-from ..settings import BRAND_INSTRUCTION
+from .schemas import QueryRequest, UrlRequest, UrlsRequest, TextRequest, SummarizeRequest, QuestionRequest, DialogueRequest, BatchQuestionRequest, ActionResponse, BatchActionResponse
+from ..settings import BRAND_INSTRUCTION, BATCH_MAX_CONCURRENCY, SEMANTIC_CACHE_ENABLED
+from ..actions.db import embeddings, document_queue
+from ..actions.cache import get_answer_cache
+from ..actions.ctxs import normalize_query
 from src.rate_limit import RateLimiter
+from src.executor import run_blocking, run_cpu_bound
+from src.singleflight import coalesce
+from src.upstream import set_priority
+from starlette.background import BackgroundTask
+from .streaming import ChainStream, sse_event, sse_response
 import logging
 from urlextract import URLExtract
 
@@ -12,20 +19,23 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
-def rate_limit_normal():
-    return RateLimiter(times=30, seconds=60*2)
-
-
-def rate_limit_mcp():
-    return RateLimiter(times=30, seconds=3600//2)
+# Limiter dùng chung cho mọi request, lịch sử của từng IP nằm trong backend
+rate_limit_normal = RateLimiter(times=30, seconds=60*2, scope="normal")
+rate_limit_mcp = RateLimiter(times=30, seconds=3600//2, scope="mcp")
 
 
 def rate_unlimit():
     return
 
 
+async def interactive_priority():
+    # Các lời gọi Mistral của request được phục vụ trước việc lưu tài liệu ở background
+    set_priority("interactive")
+
+
 DepsLimiterNormal = Depends(rate_limit_normal)
 DepsLimiterMCP = Depends(rate_limit_mcp)
+DepsPriorityInteractive = Depends(interactive_priority)
 
 actions_router = APIRouter(
     prefix="/cmp-actions",
@@ -42,171 +52,13 @@ Giáo viện: sẽ xem nội dung tóm tắt và trả lời câu hỏi của si
 Sinh viên: sẽ đặt câu hỏi tiếp theo dựa trên câu trả lời của giáo viên
 
 Số lần lặp lại: 3-5 lần tùy theo yêu cầu từ bên frontend.
+Endpoint /dialogue chạy vòng lặp giáo viên - sinh viên ngay trên server.
 """
 
 DB_SAVE_VECTOR_STORE = True  # False khi muốn test response nhiều lần.
 extractor = URLExtract()
 
 
-def extract_questions(text: str) -> list[str]:
-    """
-    Extract questions from text comprehensively in both Vietnamese and English.
-
-    This function detects:
-    1. Questions ending with question marks
-    2. Questions starting with question words
-    3. Numbered questions
-    4. Implicit questions without question marks
-    5. Core information requests in conversational text
-
-    Args:
-        text: Input text that may contain questions
-
-    Returns:
-        List of extracted questions
-    """
-    if not text:
-        return []
-
-    questions = []
-
-    # Clean text - normalize spaces and line breaks
-    cleaned_text = re.sub(r'\s+', ' ', text).strip()
-
-    # Split into sentences for better analysis
-    sentences = re.split(r'(?<=[.!?])\s+|[|;]', cleaned_text)
-    sentences = [s.strip() for s in sentences if s.strip()]
-
-    # English question words (expanded)
-    en_question_words = r'\b(what|why|how|when|where|who|which|whose|whom|can|could|would|will|is|are|do|does|did|has|have|should|may|might|explain|tell|describe|elaborate|clarify|discuss|advise)\b'
-
-    # Vietnamese question words (expanded)
-    vn_question_words = r'\b(gì|sao|làm sao|khi nào|ở đâu|ai|tại sao|bao giờ|như thế nào|cái gì|vì sao|có phải|làm thế nào|hãy|là gì|thế nào|cho biết|giải thích|trình bày|nói về|là ai|thể nào)\b'
-
-    question_word_pattern = f"({en_question_words}|{vn_question_words})"
-
-    # Pattern 1: Extract explicit questions with question marks
-    for s in sentences:
-        if s.endswith('?'):
-            questions.append(s)
-
-    # Pattern 2: Extract questions starting with question words (without relying on question marks)
-    for s in sentences:
-        if re.match(question_word_pattern, s.lower()) and s not in questions:
-            questions.append(s)
-
-    # Pattern 3: Extract implicit questions using request phrases
-    request_phrases_en = [
-        r'\b(I\s+(?:want|need|would like)\s+to\s+(?:know|understand|learn))',
-        r'\b((?:Can|Could)\s+you\s+(?:explain|tell|clarify|help))',
-        r'\b((?:Please|Kindly)\s+(?:explain|tell|clarify|advise))',
-        r'\b(I\'m\s+(?:confused|unclear|interested)\s+about)',
-        r'\b((?:not|don\'t)\s+understand\s+how)',
-        r'(what\s+is|how\s+to|how\s+can)'
-    ]
-
-    request_phrases_vi = [
-        r'\b((?:tôi|mình|em)\s+(?:muốn|cần|chưa)\s+(?:biết|hiểu))',
-        r'\b((?:bạn|thầy|anh|chị|cô|anh|em)\s+(?:có thể|vui lòng|hãy)\s+(?:giải thích|cho biết|nói về))',
-        r'\b((?:xin|làm ơn|vui lòng)\s+(?:giải thích|cho biết|nói))',
-        r'\b((?:chưa|không|còn)\s+(?:rõ|hiểu|biết))',
-        r'\b((?:là gì|để làm gì|làm sao))'
-    ]
-
-    all_request_patterns = request_phrases_en + request_phrases_vi
-
-    for s in sentences:
-        if s in questions:
-            continue
-
-        for pattern in all_request_patterns:
-            if re.search(pattern, s.lower()):
-                questions.append(s)
-                break
-
-    # Pattern 4: Look for topic-focused sentences that mention key concepts
-    # This is useful when people ask about a topic without explicit question structure
-    # Like "Nextjs là gì" (What is NextJS)
-    if not questions:
-        # Extract sentences with keywords/topics and common information request patterns
-        topic_request_patterns = [
-            # Vietnamese: "X là gì", "X dùng để làm gì"
-            r'([a-zA-Z0-9_\-]+\s+(?:là gì|là ai|là cái gì|dùng để làm gì))',
-            # English: "what is X", "how to use X"
-            r'((?:what is|how to use|how to|how does)\s+[a-zA-Z0-9_\-]+)',
-            # English: "X works", "X function"
-            r'([a-zA-Z0-9_\-]+\s+(?:works|function|means|used for))',
-        ]
-
-        for s in sentences:
-            for pattern in topic_request_patterns:
-                if re.search(pattern, s.lower()):
-                    questions.append(s)
-                    break
-
-    # Pattern 5: Look for sentences with "tôi vẫn chưa rõ" or "I'm still unclear" type phrases
-    # These typically lead to the core question
-    unclear_patterns = [
-        # Vietnamese
-        r'((?:tôi|mình|em)\s+(?:vẫn|còn|chưa)\s+(?:chưa|không)\s+(?:rõ|hiểu|biết))',
-        # English
-        r'((?:I|We)\s+(?:still|am|don\'t|do not)\s+(?:unclear|confused|understand|know))'
-    ]
-
-    for i, s in enumerate(sentences):
-        for pattern in unclear_patterns:
-            if re.search(pattern, s.lower()) and i < len(sentences) - 1:
-                # The actual question likely follows this phrase
-                next_sentence = sentences[i+1]
-                if next_sentence not in questions:
-                    questions.append(next_sentence)
-
-    # Clean up questions
-    cleaned_questions = []
-    for q in questions:
-        # Remove leading numbers and punctuation
-        q = re.sub(r'^\d+\s*[.)]\s*', '', q.strip())
-
-        # Remove common conversation starters like "Hello professor" or "Thank you for"
-        q = re.sub(
-            r'^(xin chào|cảm ơn|hello|thank you|hi|chào|kính gửi)[^.!?]+[,.]\s*', '', q, flags=re.IGNORECASE)
-
-        if q and len(q) > 5:  # Ensure minimum length for a valid question
-            cleaned_questions.append(q)
-
-    # Extract the most probable core question
-    # Priority:
-    # 1. Question mark questions
-    # 2. Direct request questions with "how", "what", etc.
-    # 3. Sentences with key topic indicators
-
-    core_questions = []
-
-    # Priority 1: Question marks
-    question_mark_questions = [q for q in cleaned_questions if q.endswith('?')]
-    if question_mark_questions:
-        core_questions.extend(question_mark_questions)
-
-    # Priority 2: Questions with direct question words
-    if not core_questions:
-        for q in cleaned_questions:
-            if re.match(question_word_pattern, q.lower()):
-                core_questions.append(q)
-
-    # If we have multiple core questions, prioritize based on relevance and specificity
-    if len(core_questions) > 1:
-        # Prefer questions with specific technical terms or topic indicators
-        for q in core_questions:
-            # Check for specific technical terms (adjust based on your domain)
-            if re.search(r'\b(router|route|routing|nextjs|react|framework|javascript|phương pháp|cách|method)\b', q.lower()):
-                return [q]
-
-        # If no specific technical terms found, return the longest question as it's likely more detailed
-        return [max(core_questions, key=len)]
-
-    return core_questions if core_questions else cleaned_questions
-
-
 def extract_only_questions(question_from_student: str, way: int = 1):
     """
     Extract only the question from the question_from_student
@@ -223,6 +75,101 @@ def extract_only_questions(question_from_student: str, way: int = 1):
         return summarize(" ".join(extract_questions(summa)), num_sentences=1)
 
 
+TEACHER_CONTEXT_LOCATIONS = [
+    "student_ask_teacher", "meeting_with_teacher", "ask_teacher", "summarize"]
+STUDENT_CONTEXT_LOCATIONS = ["meeting_with_teacher", "ask_teacher", "summarize"]
+
+
+async def get_context_safely(question: str, location: list[str], caller: str) -> str:
+    """
+    Get context from the vector store, falling back to an empty string on database errors
+    """
+    try:
+        return await aget_from_vector_store(question, location) or ""
+    except Exception as db_error:
+        logger.error(
+            f"Database error getting context in {caller}: {str(db_error)}")
+        return ""
+
+
+async def lookup_teacher_answer(question: str, caller: str):
+    """
+    Look up a cached answer of a similar question
+
+    Returns the cached answer (or None) and the question embedding, which is reused
+    to cache the generated answer on a miss.
+    """
+    if not SEMANTIC_CACHE_ENABLED:
+        return None, None
+    try:
+        vector = await embeddings.aembed_query(question)
+    except Exception as e:
+        logger.error(f"Error embedding question in {caller}: {str(e)}")
+        return None, None
+    match = get_answer_cache(caller).lookup(vector)
+    if match is None:
+        return None, vector
+    answer, similarity = match
+    logger.info(
+        f"Semantic cache hit in {caller} (similarity {similarity:.3f})")
+    return answer, vector
+
+
+def cache_teacher_answer(vector, answer: str, caller: str) -> None:
+    if vector is not None and answer:
+        get_answer_cache(caller).add(vector, answer)
+
+
+def question_key(request: QuestionRequest) -> str:
+    """
+    Identity of a question request, identical questions in flight share one answer
+    """
+    return normalize_query(request.question)
+
+
+async def save_documents_safely(docs: list, caller: str) -> None:
+    """
+    Queue documents to be saved to the vector store in the background, logging instead of failing the request on errors
+    """
+    if not DB_SAVE_VECTOR_STORE or not docs:
+        return
+    try:
+        await document_queue.put(docs)
+    except Exception as db_error:
+        logger.error(
+            f"Database error saving in {caller}: {str(db_error)}")
+        # Continue processing even if DB operation fails
+
+
+async def save_result_safely(text: str, location: str, topic: str, caller: str) -> None:
+    """
+    Save a single result to the vector store
+    """
+    await save_documents_safely([create_document(text, location, topic)], caller)
+
+
+async def save_stream_result_safely(stream: ChainStream, location: str, topic: str) -> None:
+    """
+    Save the text of a finished stream; incomplete or failed streams are not saved
+    """
+    if stream.result:
+        await save_result_safely(stream.result, location, topic, stream.caller)
+
+
+async def save_dialogue_safely(turns: list[DialogueTurn]) -> None:
+    """
+    Save the answers and follow-up questions of a dialogue in one batch
+    """
+    docs = []
+    for turn in turns:
+        docs.append(create_document(
+            turn.answer, "meeting_with_teacher", "alex_professor_it"))
+        if turn.follow_up:
+            docs.append(create_document(
+                turn.follow_up, "student_ask_teacher", "alice_student_it"))
+    await save_documents_safely(docs, "dialogue_actions")
+
+
 @actions_router.post("/search-google", response_model=ActionResponse, dependencies=[DepsLimiterNormal])
 async def search_google_actions(request: QueryRequest):
     """
@@ -231,20 +178,21 @@ async def search_google_actions(request: QueryRequest):
     links: list[str] = []
     try:
         try:
-            links: list[str] = search_google(
-                extract_only_questions(request.query), num_results=request.num_results, start_num=request.start_num)
+            links: list[str] = await asearch_google(
+                await run_blocking(extract_only_questions, request.query),
+                num_results=request.num_results, start_num=request.start_num)
             if not links:
                 # Try to extract questions from the question_from_student
-                questions = extract_only_questions(request.query, way=2)
-                links: list[str] = search_google(
+                questions = await run_blocking(extract_only_questions, request.query, way=2)
+                links: list[str] = await asearch_google(
                     questions, num_results=request.num_results, start_num=request.start_num)
         except Exception as e:
             logger.error(f"Error in search_google_actions: {str(e)}")
 
         try:
             if not links:
-                generate_links_from_question = select_chain(
-                    "generate_links_from_question").invoke({
+                generate_links_from_question = await select_chain(
+                    "generate_links_from_question").ainvoke({
                         "question_from_student": request.query
                     })
                 links = extractor.find_urls(generate_links_from_question)[
@@ -275,7 +223,7 @@ async def get_content_from_url_actions(request: UrlRequest):
     Get content from url
     """
     try:
-        content: str = get_content_from_url(request.url)
+        content: str = await aget_content_from_url(request.url)
         if not content:
             return ActionResponse(
                 success=False,
@@ -299,8 +247,8 @@ async def get_content_from_urls_actions(request: UrlsRequest):
     Get content from urls
     """
     try:
-        content: list[str] = get_content_from_urls(request.urls)
-        if not content:
+        content: list[str] = await aget_content_from_urls(request.urls)
+        if not any(content):
             return ActionResponse(
                 success=False,
                 result="No content found",
@@ -318,22 +266,17 @@ async def get_content_from_urls_actions(request: UrlsRequest):
 
 
 @actions_router.post("/summarize", response_model=ActionResponse, dependencies=[DepsLimiterNormal])
-async def summarize_actions(request: TextRequest):
+async def summarize_actions(request: SummarizeRequest):
     """
     Summarize text
     """
     try:
-        summa = summarize(request.text)
+        summa = await run_cpu_bound(
+            summarize, request.text, mode=request.mode, input_size=len(request.text))
 
         # Safe database operation
-        if DB_SAVE_VECTOR_STORE:
-            try:
-                save_to_vector_store(
-                    [create_document(summa, "summarize", "alex_professor_it")])
-            except Exception as db_error:
-                logger.error(
-                    f"Database error in summarize_actions: {str(db_error)}")
-                # Continue processing even if DB operation fails
+        await save_result_safely(
+            summa, "summarize", "alex_professor_it", "summarize_actions")
 
         return ActionResponse(
             success=True,
@@ -347,36 +290,37 @@ async def summarize_actions(request: TextRequest):
         )
 
 
-@actions_router.post("/ask-teacher", response_model=ActionResponse, dependencies=[DepsLimiterMCP])
+@actions_router.post("/ask-teacher", response_model=ActionResponse, dependencies=[DepsLimiterMCP, DepsPriorityInteractive])
+@coalesce(key=question_key)
 async def ask_teacher_actions(request: QuestionRequest):
     """
     Ask teacher with question
     """
     try:
+        cached_answer, question_vector = await lookup_teacher_answer(
+            request.question, "ask_teacher_actions")
+        if cached_answer:
+            return ActionResponse(
+                success=True,
+                result=cached_answer,
+                cached=True,
+            )
+
         # Get context safely with fallback to empty string
-        try:
-            context = get_from_vector_store(request.question, [
-                "student_ask_teacher", "meeting_with_teacher", "ask_teacher", "summarize"]) or ""
-        except Exception as db_error:
-            logger.error(
-                f"Database error getting context in ask_teacher_actions: {str(db_error)}")
-            context = ""  # Fallback to empty context
+        context = await get_context_safely(
+            request.question, TEACHER_CONTEXT_LOCATIONS, "ask_teacher_actions")
 
-        result = select_chain("alex_professor_it").invoke({
+        result = await select_chain("alex_professor_it").ainvoke({
             "question_from_student": request.question,
             "context": context,
             "brand_instruction": BRAND_INSTRUCTION
         })
 
+        cache_teacher_answer(question_vector, result, "ask_teacher_actions")
+
         # Safe database operation
-        if DB_SAVE_VECTOR_STORE:
-            try:
-                save_to_vector_store(
-                    [create_document(result, "ask_teacher", "alex_professor_it")])
-            except Exception as db_error:
-                logger.error(
-                    f"Database error saving in ask_teacher_actions: {str(db_error)}")
-                # Continue processing even if DB operation fails
+        await save_result_safely(
+            result, "ask_teacher", "alex_professor_it", "ask_teacher_actions")
 
         return ActionResponse(
             success=True,
@@ -390,36 +334,98 @@ async def ask_teacher_actions(request: QuestionRequest):
         )
 
 
-@actions_router.post("/meeting-with-teacher", response_model=ActionResponse, dependencies=[DepsLimiterMCP])
-async def meeting_with_teacher_actions(request: QuestionRequest):
+@actions_router.post("/ask-teacher/batch", response_model=BatchActionResponse, dependencies=[DepsPriorityInteractive])
+async def ask_teacher_batch_actions(request: BatchQuestionRequest, http_request: Request):
     """
-    Meeting with teacher
+    Ask teacher with many questions at once, answers are returned in the same order
     """
+    # Mỗi câu hỏi là một lần gọi LLM: trừ vào rate limit theo số câu hỏi
+    await rate_limit_mcp.acquire(http_request, cost=len(request.questions))
     try:
-        # Get context safely with fallback to empty string
+        # Embed all questions in one call, then search the vector store concurrently
         try:
-            context = get_from_vector_store(request.question, [
-                "student_ask_teacher", "meeting_with_teacher", "ask_teacher", "summarize"]) or ""
+            contexts = await aget_many_from_vector_store(
+                request.questions, TEACHER_CONTEXT_LOCATIONS)
         except Exception as db_error:
             logger.error(
-                f"Database error getting context in meeting_with_teacher_actions: {str(db_error)}")
-            context = ""  # Fallback to empty context
+                f"Database error getting context in ask_teacher_batch_actions: {str(db_error)}")
+            contexts = [None] * len(request.questions)
+
+        max_concurrency = min(
+            request.max_concurrency or BATCH_MAX_CONCURRENCY, BATCH_MAX_CONCURRENCY)
+        answers = await select_chain("alex_professor_it").abatch([
+            {
+                "question_from_student": question,
+                "context": context or "",
+                "brand_instruction": BRAND_INSTRUCTION
+            }
+            for question, context in zip(request.questions, contexts)
+        ], config={"max_concurrency": max_concurrency}, return_exceptions=True)
+
+        results: list[ActionResponse] = []
+        for answer in answers:
+            if isinstance(answer, Exception):
+                logger.error(
+                    f"Error in ask_teacher_batch_actions: {str(answer)}")
+                results.append(ActionResponse(
+                    success=False,
+                    result=f"Error processing request: {str(answer)}"
+                ))
+            else:
+                results.append(ActionResponse(success=True, result=answer))
+
+        # One save for the whole batch, so answers are embedded in a single call
+        await save_documents_safely([
+            create_document(result.result, "ask_teacher", "alex_professor_it")
+            for result in results if result.success
+        ], "ask_teacher_batch_actions")
+
+        return BatchActionResponse(
+            success=any(result.success for result in results),
+            results=results,
+        )
+    except Exception as e:
+        logger.error(f"Error in ask_teacher_batch_actions: {str(e)}")
+        return BatchActionResponse(
+            success=False,
+            results=[ActionResponse(
+                success=False,
+                result=f"Error processing request: {str(e)}"
+            )]
+        )
 
-        result = select_chain("alex_professor_it").invoke({
+
+@actions_router.post("/meeting-with-teacher", response_model=ActionResponse, dependencies=[DepsLimiterMCP, DepsPriorityInteractive])
+@coalesce(key=question_key)
+async def meeting_with_teacher_actions(request: QuestionRequest):
+    """
+    Meeting with teacher
+    """
+    try:
+        cached_answer, question_vector = await lookup_teacher_answer(
+            request.question, "meeting_with_teacher_actions")
+        if cached_answer:
+            return ActionResponse(
+                success=True,
+                result=cached_answer,
+                cached=True,
+            )
+
+        # Get context safely with fallback to empty string
+        context = await get_context_safely(
+            request.question, TEACHER_CONTEXT_LOCATIONS, "meeting_with_teacher_actions")
+
+        result = await select_chain("alex_professor_it").ainvoke({
             "question_from_student": request.question,
             "context": context,
             "brand_instruction": BRAND_INSTRUCTION
         })
 
+        cache_teacher_answer(question_vector, result, "meeting_with_teacher_actions")
+
         # Safe database operation
-        if DB_SAVE_VECTOR_STORE:
-            try:
-                save_to_vector_store(
-                    [create_document(result, "meeting_with_teacher", "alex_professor_it")])
-            except Exception as db_error:
-                logger.error(
-                    f"Database error saving in meeting_with_teacher_actions: {str(db_error)}")
-                # Continue processing even if DB operation fails
+        await save_result_safely(
+            result, "meeting_with_teacher", "alex_professor_it", "meeting_with_teacher_actions")
 
         return ActionResponse(
             success=True,
@@ -433,36 +439,26 @@ async def meeting_with_teacher_actions(request: QuestionRequest):
         )
 
 
-@actions_router.post("/student-ask-teacher", response_model=ActionResponse, dependencies=[DepsLimiterMCP])
+@actions_router.post("/student-ask-teacher", response_model=ActionResponse, dependencies=[DepsLimiterMCP, DepsPriorityInteractive])
+@coalesce(key=question_key)
 async def student_ask_teacher_actions(request: QuestionRequest):
     """
     Student ask teacher
     """
     try:
         # Get answer safely with fallback to empty string
-        try:
-            answer_from_alex_professor_it = get_from_vector_store(request.question, [
-                "meeting_with_teacher", "ask_teacher", "summarize"]) or ""
-        except Exception as db_error:
-            logger.error(
-                f"Database error getting answer in student_ask_teacher_actions: {str(db_error)}")
-            answer_from_alex_professor_it = ""  # Fallback to empty answer
+        answer_from_alex_professor_it = await get_context_safely(
+            request.question, STUDENT_CONTEXT_LOCATIONS, "student_ask_teacher_actions")
 
-        result = select_chain("alice_student_it").invoke({
+        result = await select_chain("alice_student_it").ainvoke({
             "question_from_student": request.question,
             "answer_from_alex_professor_it": answer_from_alex_professor_it,
             "brand_instruction": BRAND_INSTRUCTION
         })
 
         # Safe database operation
-        if DB_SAVE_VECTOR_STORE:
-            try:
-                save_to_vector_store(
-                    [create_document(result, "student_ask_teacher", "alice_student_it")])
-            except Exception as db_error:
-                logger.error(
-                    f"Database error saving in student_ask_teacher_actions: {str(db_error)}")
-                # Continue processing even if DB operation fails
+        await save_result_safely(
+            result, "student_ask_teacher", "alice_student_it", "student_ask_teacher_actions")
 
         return ActionResponse(
             success=True,
@@ -476,13 +472,100 @@ async def student_ask_teacher_actions(request: QuestionRequest):
         )
 
 
+@actions_router.post("/ask-teacher/stream", dependencies=[DepsLimiterMCP, DepsPriorityInteractive])
+async def ask_teacher_stream_actions(request: QuestionRequest):
+    """
+    Ask teacher with question, streaming the answer as Server-Sent-Events
+    """
+    context = await get_context_safely(
+        request.question, TEACHER_CONTEXT_LOCATIONS, "ask_teacher_stream_actions")
+
+    stream = ChainStream(select_chain("alex_professor_it"), {
+        "question_from_student": request.question,
+        "context": context,
+        "brand_instruction": BRAND_INSTRUCTION
+    }, "ask_teacher_stream_actions")
+
+    # Lưu vào vector store sau khi stream kết thúc để không làm chậm token đầu tiên
+    return stream.to_response(background=BackgroundTask(
+        save_stream_result_safely, stream, "ask_teacher", "alex_professor_it"))
+
+
+@actions_router.post("/meeting-with-teacher/stream", dependencies=[DepsLimiterMCP, DepsPriorityInteractive])
+async def meeting_with_teacher_stream_actions(request: QuestionRequest):
+    """
+    Meeting with teacher, streaming the answer as Server-Sent-Events
+    """
+    context = await get_context_safely(
+        request.question, TEACHER_CONTEXT_LOCATIONS, "meeting_with_teacher_stream_actions")
+
+    stream = ChainStream(select_chain("alex_professor_it"), {
+        "question_from_student": request.question,
+        "context": context,
+        "brand_instruction": BRAND_INSTRUCTION
+    }, "meeting_with_teacher_stream_actions")
+
+    return stream.to_response(background=BackgroundTask(
+        save_stream_result_safely, stream, "meeting_with_teacher", "alex_professor_it"))
+
+
+@actions_router.post("/student-ask-teacher/stream", dependencies=[DepsLimiterMCP, DepsPriorityInteractive])
+async def student_ask_teacher_stream_actions(request: QuestionRequest):
+    """
+    Student ask teacher, streaming the question as Server-Sent-Events
+    """
+    answer_from_alex_professor_it = await get_context_safely(
+        request.question, STUDENT_CONTEXT_LOCATIONS, "student_ask_teacher_stream_actions")
+
+    stream = ChainStream(select_chain("alice_student_it"), {
+        "question_from_student": request.question,
+        "answer_from_alex_professor_it": answer_from_alex_professor_it,
+        "brand_instruction": BRAND_INSTRUCTION
+    }, "student_ask_teacher_stream_actions")
+
+    return stream.to_response(background=BackgroundTask(
+        save_stream_result_safely, stream, "student_ask_teacher", "alice_student_it"))
+
+
+@actions_router.post("/dialogue", dependencies=[DepsLimiterMCP, DepsPriorityInteractive])
+async def dialogue_actions(request: DialogueRequest):
+    """
+    Run a multi-turn professor/student dialogue, streaming each turn as Server-Sent-Events
+    """
+    turns: list[DialogueTurn] = []
+
+    async def retrieve(query: str) -> str:
+        return await get_context_safely(query, TEACHER_CONTEXT_LOCATIONS, "dialogue_actions")
+
+    async def events():
+        try:
+            async for turn in run_dialogue(request.question, request.turns, retrieve):
+                turns.append(turn)
+                yield sse_event(turn.to_dict(), event="turn")
+        except Exception as e:
+            logger.error(f"Error in dialogue_actions: {str(e)}")
+            yield sse_event({
+                "success": False,
+                "result": f"Error processing request: {str(e)}",
+            }, event="error")
+            return
+        yield sse_event({
+            "success": True,
+            "result": [turn.to_dict() for turn in turns],
+        }, event="end")
+
+    # Các lượt đã hoàn thành được lưu sau khi stream kết thúc
+    return sse_response(events(), background=BackgroundTask(save_dialogue_safely, turns))
+
+
 @actions_router.post("/extract-questions", response_model=ActionResponse, dependencies=[DepsLimiterNormal])
 async def extract_questions_endpoint(request: TextRequest):
     """
     Extract questions from text in both Vietnamese and English
     """
     try:
-        questions = extract_questions(request.text)
+        questions = await run_cpu_bound(
+            extract_questions, request.text, input_size=len(request.text))
         return ActionResponse(
             success=True,
             result=questions,
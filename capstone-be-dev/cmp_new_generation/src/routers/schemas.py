@@ -1,5 +1,6 @@
-from pydantic import BaseModel
-from typing import List, Union, Optional
+from pydantic import BaseModel, Field
+from typing import Any, Dict, List, Literal, Union, Optional
+from ..settings import BATCH_MAX_QUESTIONS
 
 # Request models
 
@@ -22,12 +23,39 @@ class TextRequest(BaseModel):
     text: str
 
 
+class SummarizeRequest(TextRequest):
+    # "chunked": tóm tắt theo từng cửa sổ câu, dùng cho văn bản rất dài
+    mode: Literal["auto", "full", "chunked"] = "auto"
+
+
 class QuestionRequest(BaseModel):
     question: str
 
+
+class BatchQuestionRequest(BaseModel):
+    questions: List[str] = Field(min_length=1, max_length=BATCH_MAX_QUESTIONS)
+    max_concurrency: Optional[int] = Field(default=None, ge=1)
+
+
+class DialogueRequest(BaseModel):
+    question: str
+    turns: int = Field(default=3, ge=1, le=5)
+
 # Response models
 
 
 class ActionResponse(BaseModel):
     success: bool
     result: Union[str, List[str]]
+    # True khi câu trả lời được lấy từ semantic cache
+    cached: bool = False
+
+
+class BatchActionResponse(BaseModel):
+    success: bool
+    results: List[ActionResponse]
+
+
+class MetricsResponse(BaseModel):
+    success: bool
+    result: Dict[str, Any]
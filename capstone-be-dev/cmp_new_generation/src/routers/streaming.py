@@ -0,0 +1,107 @@
+import json
+import logging
+from typing import Any, AsyncIterator, Optional
+
+from fastapi.responses import StreamingResponse
+from langchain_core.runnables import Runnable
+from starlette.background import BackgroundTask
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    # Tắt buffer của reverse proxy (nginx) để token tới client ngay
+    "X-Accel-Buffering": "no",
+}
+
+
+def sse_event(data: Any, event: Optional[str] = None) -> str:
+    """
+    Format one Server-Sent-Events message.
+
+    Args:
+        data: JSON-serializable payload of the event.
+        event: Optional event name.
+
+    Returns:
+        The encoded event, terminated by a blank line.
+    """
+    message = f"data: {json.dumps(data, ensure_ascii=False)}\n\n"
+    if event:
+        message = f"event: {event}\n" + message
+    return message
+
+
+def sse_response(events: AsyncIterator[str], background: Optional[BackgroundTask] = None) -> StreamingResponse:
+    """
+    Build a `text/event-stream` response from already formatted events.
+
+    Args:
+        events: Async iterator of events built with `sse_event`.
+        background: Task to run after the last event has been sent.
+
+    Returns:
+        The streaming response.
+    """
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
+        background=background,
+    )
+
+
+class ChainStream:
+    """
+    Stream the output of a chain as Server-Sent-Events.
+
+    Every chunk produced by the chain is sent as a `token` event. When the chain
+    finishes, an `end` event carries the full text; if it fails, an `error` event is
+    sent instead. The full text is kept in `result` so work that depends on it can
+    run after the stream closes.
+
+    Attributes:
+        chain (Runnable): The chain to stream.
+        inputs (dict): The inputs of the chain.
+        caller (str): Name of the endpoint, used for logging.
+        result (Optional[str]): The full text, set only when the stream completed.
+    """
+
+    def __init__(self, chain: Runnable, inputs: dict, caller: str) -> None:
+        self.chain = chain
+        self.inputs = inputs
+        self.caller = caller
+        self.result: Optional[str] = None
+
+    async def events(self) -> AsyncIterator[str]:
+        chunks: list[str] = []
+        try:
+            async for chunk in self.chain.astream(self.inputs):
+                if not chunk:
+                    continue
+                chunks.append(chunk)
+                yield sse_event({"token": chunk}, event="token")
+        except Exception as e:
+            logger.error(f"Error in {self.caller}: {str(e)}")
+            yield sse_event({
+                "success": False,
+                "result": f"Error processing request: {str(e)}",
+            }, event="error")
+            return
+
+        self.result = "".join(chunks)
+        yield sse_event({"success": True, "result": self.result}, event="end")
+
+    def to_response(self, background: Optional[BackgroundTask] = None) -> StreamingResponse:
+        """
+        Build the StreamingResponse for this stream.
+
+        Args:
+            background: Task to run after the last event has been sent.
+
+        Returns:
+            The `text/event-stream` response.
+        """
+        return sse_response(self.events(), background=background)
@@ -1,4 +1,5 @@
 from pathlib import Path
+import tempfile
 from dotenv import load_dotenv
 import os
 
@@ -15,6 +16,205 @@ MODEL_NAME_EMBEDDING = os.getenv("MODEL_NAME_EMBEDDING")
 
 DATABASE_URL = os.getenv("DATABASE_URL")
 
+# Database connection pool (dùng chung cho toàn bộ vòng đời ứng dụng)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+# Thời gian (giây) trước khi một kết nối được mở lại, tránh bị server đóng ngầm.
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+
+# Write-behind queue (lưu tài liệu vào vector store theo lô ở background)
+# Số tài liệu tối đa trong hàng đợi, khi đầy request phải chờ tối đa WRITE_BEHIND_PUT_TIMEOUT giây.
+WRITE_BEHIND_MAX_SIZE = int(os.getenv("WRITE_BEHIND_MAX_SIZE", "1000"))
+WRITE_BEHIND_PUT_TIMEOUT = float(os.getenv("WRITE_BEHIND_PUT_TIMEOUT", "5"))
+# Lưu một lô khi đủ số tài liệu hoặc sau khoảng thời gian (giây).
+WRITE_BEHIND_BATCH_SIZE = int(os.getenv("WRITE_BEHIND_BATCH_SIZE", "32"))
+WRITE_BEHIND_FLUSH_INTERVAL = float(os.getenv("WRITE_BEHIND_FLUSH_INTERVAL", "2"))
+
+# Embedding cache
+# Dung lượng tối đa (byte) của tầng cache trong bộ nhớ.
+EMBEDDING_CACHE_MAX_BYTES = int(os.getenv("EMBEDDING_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+# File SQLite của tầng cache trên đĩa, để trống để tắt.
+EMBEDDING_CACHE_PATH = os.getenv(
+    "EMBEDDING_CACHE_PATH", os.path.join(tempfile.gettempdir(), "cmp_embedding_cache.sqlite3"))
+# Tổng dung lượng (byte) tối đa của tầng cache trên đĩa, vector ít dùng nhất bị xóa trước.
+EMBEDDING_CACHE_DISK_MAX_BYTES = int(os.getenv("EMBEDDING_CACHE_DISK_MAX_BYTES", str(1024 * 1024 * 1024)))
+# Thời gian (giây) giữ một vector trên đĩa, 0 để giữ mãi.
+EMBEDDING_CACHE_TTL = float(os.getenv("EMBEDDING_CACHE_TTL", str(30 * 24 * 3600)))
+
+# Semantic answer cache (/ask-teacher, /meeting-with-teacher)
+SEMANTIC_CACHE_ENABLED = os.getenv("SEMANTIC_CACHE_ENABLED", "true").lower() == "true"
+# Độ tương đồng cosine tối thiểu để dùng lại câu trả lời đã có.
+SEMANTIC_CACHE_THRESHOLD = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.95"))
+SEMANTIC_CACHE_TTL = float(os.getenv("SEMANTIC_CACHE_TTL", str(24 * 3600)))
+SEMANTIC_CACHE_MAX_ENTRIES = int(os.getenv("SEMANTIC_CACHE_MAX_ENTRIES", "5000"))
+
+# LLM response cache (exact match trên prompt, model và tham số)
+# Danh sách chain dùng cache, phân cách bởi dấu phẩy.
+LLM_CACHE_CHAINS = [
+    name.strip() for name in os.getenv(
+        "LLM_CACHE_CHAINS", "alex_professor_it,generate_links_from_question").split(",")
+    if name.strip()
+]
+LLM_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", str(24 * 3600)))
+# Số câu trả lời tối đa giữ trong bộ nhớ cho mỗi chain.
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "1000"))
+# File SQLite của tầng cache trên đĩa, để trống để tắt.
+LLM_CACHE_PATH = os.getenv(
+    "LLM_CACHE_PATH", os.path.join(tempfile.gettempdir(), "cmp_llm_cache.sqlite3"))
+
+# Mistral API (chat và embeddings dùng chung một bộ điều khiển tải)
+# Số request đồng thời được điều chỉnh theo AIMD: tăng dần khi thành công, nhân với
+# MISTRAL_CONCURRENCY_BACKOFF khi API quá tải (429, 5xx, timeout).
+MISTRAL_CONCURRENCY_INITIAL = int(os.getenv("MISTRAL_CONCURRENCY_INITIAL", "8"))
+MISTRAL_CONCURRENCY_MIN = int(os.getenv("MISTRAL_CONCURRENCY_MIN", "1"))
+MISTRAL_CONCURRENCY_MAX = int(os.getenv("MISTRAL_CONCURRENCY_MAX", "64"))
+MISTRAL_CONCURRENCY_BACKOFF = float(os.getenv("MISTRAL_CONCURRENCY_BACKOFF", "0.5"))
+# Thử lại khi timeout, lỗi kết nối hoặc status tạm thời (408, 429, 500, 502, 503, 504).
+MISTRAL_MAX_RETRIES = int(os.getenv("MISTRAL_MAX_RETRIES", "3"))
+# Backoff (giây) khi API không gửi header Retry-After.
+MISTRAL_RETRY_BASE_DELAY = float(os.getenv("MISTRAL_RETRY_BASE_DELAY", "1"))
+MISTRAL_RETRY_MAX_DELAY = float(os.getenv("MISTRAL_RETRY_MAX_DELAY", "30"))
+# Ngân sách token mỗi phút dùng chung cho chat và embeddings, 0 để tắt.
+# Request được nhận theo lớp ưu tiên: interactive (trả lời giáo viên) > default > background (lưu tài liệu).
+MISTRAL_TOKENS_PER_MINUTE = float(os.getenv("MISTRAL_TOKENS_PER_MINUTE", "500000"))
+# Ước lượng số token của request trước khi gửi.
+MISTRAL_CHARS_PER_TOKEN = float(os.getenv("MISTRAL_CHARS_PER_TOKEN", "3"))
+MISTRAL_COMPLETION_TOKENS_ESTIMATE = int(os.getenv("MISTRAL_COMPLETION_TOKENS_ESTIMATE", "512"))
+
+# LLM router (chọn backend nhanh nhất còn hoạt động cho mỗi lời gọi)
+# Backend mặc định của mọi chain theo thứ tự ưu tiên: "mistral", "ollama", "openai".
+LLM_BACKENDS = [
+    name.strip() for name in os.getenv("LLM_BACKENDS", "mistral").split(",") if name.strip()
+]
+# Backend riêng của từng chain, ví dụ: "alex_professor_it=mistral,ollama;generate_links_from_question=ollama"
+LLM_ROUTES = {
+    chain.strip(): [name.strip() for name in names.split(",") if name.strip()]
+    for chain, _, names in (
+        route.partition("=") for route in os.getenv("LLM_ROUTES", "").split(";") if "=" in route)
+}
+# Số lời gọi gần nhất dùng để tính độ trễ và tỉ lệ lỗi của mỗi backend.
+LLM_ROUTER_WINDOW = int(os.getenv("LLM_ROUTER_WINDOW", "50"))
+# Backend có tỉ lệ lỗi vượt ngưỡng bị bỏ qua trong LLM_ROUTER_COOLDOWN giây.
+LLM_ROUTER_MAX_ERROR_RATE = float(os.getenv("LLM_ROUTER_MAX_ERROR_RATE", "0.5"))
+LLM_ROUTER_COOLDOWN = float(os.getenv("LLM_ROUTER_COOLDOWN", "30"))
+# Tỉ lệ lời gọi gửi tới một backend ngẫu nhiên để cập nhật độ trễ của nó.
+LLM_ROUTER_EXPLORE_RATE = float(os.getenv("LLM_ROUTER_EXPLORE_RATE", "0.05"))
+# Ollama (chạy cục bộ), để trống OLLAMA_MODEL để tắt.
+OLLAMA_BASE_URL = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
+OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", "")
+# Endpoint tương thích OpenAI (vLLM, LM Studio, ...), cần cài langchain-openai.
+OPENAI_COMPAT_BASE_URL = os.getenv("OPENAI_COMPAT_BASE_URL", "")
+OPENAI_COMPAT_API_KEY = os.getenv("OPENAI_COMPAT_API_KEY", "")
+OPENAI_COMPAT_MODEL = os.getenv("OPENAI_COMPAT_MODEL", "")
+
+# Hedged requests (gửi thêm một request trùng khi request đầu chậm bất thường)
+# Các chain bật hedging cho lời gọi Mistral, ví dụ: "alex_professor_it". Để trống để tắt.
+LLM_HEDGE_CHAINS = [
+    name.strip() for name in os.getenv("LLM_HEDGE_CHAINS", "").split(",") if name.strip()
+]
+# Gửi request trùng khi request đầu chạy quá percentile này của độ trễ gần đây.
+LLM_HEDGE_PERCENTILE = float(os.getenv("LLM_HEDGE_PERCENTILE", "95"))
+# Tỉ lệ tối đa số lời gọi được hedge, giới hạn tải thêm khi upstream gặp sự cố.
+LLM_HEDGE_MAX_RATE = float(os.getenv("LLM_HEDGE_MAX_RATE", "0.1"))
+# Số độ trễ cần có trước khi bắt đầu hedge.
+LLM_HEDGE_MIN_SAMPLES = int(os.getenv("LLM_HEDGE_MIN_SAMPLES", "20"))
+# Thời gian chờ tối thiểu (giây) trước khi hedge.
+LLM_HEDGE_MIN_DELAY = float(os.getenv("LLM_HEDGE_MIN_DELAY", "0.5"))
+
+# Cấu hình từng chain (model Mistral, số token tối đa, stop sequences, temperature)
+# Model nhỏ, nhanh cho các chain có câu trả lời ngắn.
+SMALL_MODEL_NAME = os.getenv("SMALL_MODEL_NAME", "ministral-8b-latest")
+
+
+def _chain_config(chain: str, model: str, max_tokens: int, temperature: float, stop: str = "") -> dict:
+    # Ghi đè bằng biến môi trường <CHAIN>_MODEL, <CHAIN>_MAX_TOKENS (0 = không giới hạn),
+    # <CHAIN>_TEMPERATURE, <CHAIN>_STOP (các stop sequence ngăn cách bởi "|").
+    prefix = chain.upper()
+    return {
+        "model": os.getenv(f"{prefix}_MODEL", model),
+        "max_tokens": int(os.getenv(f"{prefix}_MAX_TOKENS", str(max_tokens))) or None,
+        "temperature": float(os.getenv(f"{prefix}_TEMPERATURE", str(temperature))),
+        "stop": [s for s in os.getenv(f"{prefix}_STOP", stop).split("|") if s],
+    }
+
+
+LLM_CHAIN_CONFIG = {
+    "alex_professor_it": _chain_config("alex_professor_it", MODEL_NAME, 2048, 0.7),
+    "alice_student_it": _chain_config("alice_student_it", SMALL_MODEL_NAME, 256, 0.7),
+    "generate_links_from_question": _chain_config("generate_links_from_question", SMALL_MODEL_NAME, 1024, 0.3),
+}
+
+# Admin
+# Token cho các endpoint /cmp-admin (header X-Admin-Token). Để trống sẽ tắt các endpoint này.
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")
+
+# Concurrency
+# Số thread tối đa cho các tác vụ đồng bộ (blocking) chạy ngoài event loop.
+EXECUTOR_MAX_WORKERS = int(os.getenv("EXECUTOR_MAX_WORKERS", "16"))
+# Process pool cho các tác vụ nặng CPU (trích xuất trang, tóm tắt, trích câu hỏi).
+PROCESS_POOL_ENABLED = os.getenv("PROCESS_POOL_ENABLED", "true").lower() == "true"
+PROCESS_POOL_MAX_WORKERS = int(os.getenv("PROCESS_POOL_MAX_WORKERS", str(os.cpu_count() or 1)))
+# Worker được thay mới sau N task để giới hạn bộ nhớ tăng dần.
+PROCESS_POOL_MAX_TASKS_PER_CHILD = int(os.getenv("PROCESS_POOL_MAX_TASKS_PER_CHILD", "100"))
+PROCESS_POOL_TIMEOUT = float(os.getenv("PROCESS_POOL_TIMEOUT", "60"))
+# Input nhỏ hơn ngưỡng (ký tự/byte) chạy trong process hiện tại, rẻ hơn chi phí IPC.
+PROCESS_POOL_MIN_INPUT_SIZE = int(os.getenv("PROCESS_POOL_MIN_INPUT_SIZE", "20000"))
+# Endpoint gộp các request giống nhau đang chạy cùng lúc thành một lần xử lý, phân cách bởi dấu phẩy.
+COALESCE_ENDPOINTS = [
+    name.strip() for name in os.getenv(
+        "COALESCE_ENDPOINTS",
+        "ask_teacher_actions,meeting_with_teacher_actions,student_ask_teacher_actions").split(",")
+    if name.strip()
+]
+# Timeout (giây) khi tải nội dung từ một URL.
+HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", "15"))
+
+# Page fetcher
+# Giới hạn kết nối của connection pool dùng chung khi tải nhiều URL.
+FETCH_MAX_CONNECTIONS = int(os.getenv("FETCH_MAX_CONNECTIONS", "100"))
+FETCH_MAX_PER_HOST = int(os.getenv("FETCH_MAX_PER_HOST", "4"))
+# Thời gian (giây) cache kết quả phân giải DNS.
+FETCH_DNS_CACHE_TTL = int(os.getenv("FETCH_DNS_CACHE_TTL", "300"))
+# Deadline (giây) cho toàn bộ một lần tải nhiều URL.
+FETCH_TOTAL_TIMEOUT = float(os.getenv("FETCH_TOTAL_TIMEOUT", "30"))
+# Số byte tối đa đọc từ một trang.
+FETCH_MAX_BYTES = int(os.getenv("FETCH_MAX_BYTES", str(5 * 1024 * 1024)))
+
+# Summarize
+# Văn bản dài hơn ngưỡng (ký tự) được tóm tắt theo từng cửa sổ câu (chế độ "auto").
+SUMMARY_CHUNKED_THRESHOLD = int(os.getenv("SUMMARY_CHUNKED_THRESHOLD", "200000"))
+# Số câu của mỗi cửa sổ khi tóm tắt theo chế độ "chunked".
+SUMMARY_WINDOW_SENTENCES = int(os.getenv("SUMMARY_WINDOW_SENTENCES", "500"))
+
+# URL content cache (nội dung đã trích xuất từ trang web, nén trong SQLite)
+CONTENT_CACHE_PATH = os.getenv(
+    "CONTENT_CACHE_PATH", os.path.join(tempfile.gettempdir(), "cmp_content_cache.sqlite3"))
+# Thời gian (giây) dùng nội dung mà không cần kiểm tra lại với trang gốc.
+CONTENT_CACHE_TTL = float(os.getenv("CONTENT_CACHE_TTL", str(6 * 3600)))
+# Tổng dung lượng (byte, sau khi nén) tối đa của cache.
+CONTENT_CACHE_MAX_BYTES = int(os.getenv("CONTENT_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+
+# Search cache (kết quả tìm kiếm Google theo câu truy vấn đã chuẩn hóa)
+SEARCH_CACHE_ENABLED = os.getenv("SEARCH_CACHE_ENABLED", "true").lower() == "true"
+SEARCH_CACHE_TTL = float(os.getenv("SEARCH_CACHE_TTL", "3600"))
+# Số kết quả lấy trong lần tìm đầu tiên, các trang start_num sau được cắt từ đây.
+SEARCH_CACHE_WINDOW = int(os.getenv("SEARCH_CACHE_WINDOW", "20"))
+SEARCH_CACHE_MAX_ENTRIES = int(os.getenv("SEARCH_CACHE_MAX_ENTRIES", "1000"))
+
+# Batch
+# Số câu hỏi tối đa trong một request batch và số lời gọi LLM chạy đồng thời.
+BATCH_MAX_QUESTIONS = int(os.getenv("BATCH_MAX_QUESTIONS", "50"))
+BATCH_MAX_CONCURRENCY = int(os.getenv("BATCH_MAX_CONCURRENCY", "4"))
+
+# Rate limit
+# "memory": giới hạn riêng cho từng worker, "sqlite": dùng chung giữa các worker trên cùng máy.
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "memory")
+RATE_LIMIT_SQLITE_PATH = os.getenv(
+    "RATE_LIMIT_SQLITE_PATH", os.path.join(tempfile.gettempdir(), "cmp_rate_limit.sqlite3"))
+# Số client (IP) tối đa được theo dõi, client ít dùng nhất bị loại trước.
+RATE_LIMIT_MAX_CLIENTS = int(os.getenv("RATE_LIMIT_MAX_CLIENTS", "10000"))
+
 
 BRAND_INSTRUCTION = """
 Tác giả của mô hình CMP (Communication Model Protocol) là Nguyễn Phương Anh Tú, được gợi cảm hứng từ MCP(Model Context Protocol)
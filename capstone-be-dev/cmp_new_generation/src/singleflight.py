@@ -0,0 +1,117 @@
+import asyncio
+import functools
+import logging
+from typing import Any, Awaitable, Callable, Dict, Hashable, TypeVar
+
+from .settings import COALESCE_ENDPOINTS
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls for the same key into one execution.
+
+    The first caller of a key runs the coroutine; callers arriving while it is in
+    flight await the same result (or exception) instead of starting their own.
+    Nothing is kept once the call finishes, caching is left to the caller.
+
+    Attributes:
+        name (str): Name used in logs and metrics.
+    """
+
+    def __init__(self, name: str = "singleflight") -> None:
+        self.name = name
+        self._calls: Dict[Hashable, asyncio.Task] = {}
+        self.executed = 0
+        self.shared = 0
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run `func` for `key`, or join the call already in flight for it.
+
+        The call runs in its own task, so a caller that is cancelled (e.g. a client
+        disconnecting) does not cancel the result awaited by the other callers.
+
+        Args:
+            key: Identity of the call.
+            func: Coroutine function producing the result.
+
+        Returns:
+            The result of the single execution.
+        """
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(func())
+            self._calls[key] = task
+            self.executed += 1
+            task.add_done_callback(lambda done: self._forget(key, done))
+        else:
+            self.shared += 1
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # Tránh cảnh báo "exception was never retrieved" khi mọi caller đã bị hủy
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> Dict[str, Any]:
+        """Executed and shared call counters."""
+        total = self.executed + self.shared
+        return {
+            "executed": self.executed,
+            "shared": self.shared,
+            "in_flight": len(self._calls),
+            "shared_rate": self.shared / total if total else 0.0,
+        }
+
+
+_flights: Dict[str, SingleFlight] = {}
+
+
+def get_singleflight(name: str) -> SingleFlight:
+    """Get the SingleFlight of an endpoint, created on first use."""
+    flight = _flights.get(name)
+    if flight is None:
+        flight = _flights[name] = SingleFlight(name)
+    return flight
+
+
+def singleflight_stats() -> Dict[str, Dict[str, Any]]:
+    """Executed and shared call counters of every endpoint."""
+    return {name: flight.stats() for name, flight in _flights.items()}
+
+
+def coalesce(key: Callable[..., Hashable]):
+    """
+    Share one execution between identical concurrent calls of an async endpoint.
+
+    Only endpoints listed in COALESCE_ENDPOINTS (by function name) are wrapped,
+    others are returned unchanged. The wrapper keeps the signature of the
+    endpoint, so it can be placed under a FastAPI route decorator.
+
+    Args:
+        key: Function of the endpoint arguments returning the identity of a call,
+            e.g. the normalized question.
+
+    Returns:
+        The decorator.
+    """
+    def decorator(func: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+        if func.__name__ not in COALESCE_ENDPOINTS:
+            return func
+        flight = get_singleflight(func.__name__)
+
+        @functools.wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> T:
+            return await flight.do(key(*args, **kwargs), lambda: func(*args, **kwargs))
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,23 @@
+from .budget import (
+    PRIORITIES,
+    TokenBudgetScheduler,
+    current_priority,
+    mistral_budget,
+    set_priority,
+    use_priority,
+)
+from .controller import AdaptiveConcurrencyController, mistral_controller
+from .hedge import Hedger, get_hedger, hedge_stats
+from .transport import (
+    ControlledTransport,
+    AsyncControlledTransport,
+    controlled_clients,
+    parse_retry_after,
+)
+
+__all__ = ["PRIORITIES", "TokenBudgetScheduler", "current_priority", "mistral_budget",
+           "set_priority", "use_priority",
+           "AdaptiveConcurrencyController", "mistral_controller",
+           "Hedger", "get_hedger", "hedge_stats",
+           "ControlledTransport", "AsyncControlledTransport",
+           "controlled_clients", "parse_retry_after"]
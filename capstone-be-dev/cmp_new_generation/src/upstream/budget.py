@@ -0,0 +1,277 @@
+import asyncio
+import heapq
+import itertools
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional
+
+import httpx
+
+from ..settings import (
+    MISTRAL_CHARS_PER_TOKEN,
+    MISTRAL_COMPLETION_TOKENS_ESTIMATE,
+    MISTRAL_TOKENS_PER_MINUTE,
+)
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Lớp ưu tiên, số nhỏ được phục vụ trước
+PRIORITIES: Dict[str, int] = {"interactive": 0, "default": 1, "background": 2}
+
+_priority: ContextVar[str] = ContextVar("upstream_priority", default="default")
+
+
+def current_priority() -> str:
+    """Priority class of the upstream calls made in the current context."""
+    return _priority.get()
+
+
+def set_priority(name: str) -> None:
+    """Set the priority class of the upstream calls made in the current context."""
+    if name not in PRIORITIES:
+        raise ValueError(f"Unknown priority class: {name}")
+    _priority.set(name)
+
+
+@contextmanager
+def use_priority(name: str) -> Iterator[None]:
+    """Run a block with another priority class, restoring the previous one after."""
+    if name not in PRIORITIES:
+        raise ValueError(f"Unknown priority class: {name}")
+    token = _priority.set(name)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def estimate_tokens(request: httpx.Request) -> int:
+    """
+    Estimate the tokens a Mistral request will use, prompt and completion.
+
+    The prompt is the text of the chat messages or of the embedding inputs, counted
+    with MISTRAL_CHARS_PER_TOKEN characters per token; chat completions add
+    `max_tokens`, or MISTRAL_COMPLETION_TOKENS_ESTIMATE when it is not set.
+    """
+    try:
+        body = json.loads(request.content or b"{}")
+    except ValueError:
+        return 1
+    if "messages" in body:
+        chars = sum(len(_text(message.get("content"))) for message in body["messages"])
+        completion = body.get("max_tokens") or MISTRAL_COMPLETION_TOKENS_ESTIMATE
+    else:
+        chars = len(_text(body.get("input")))
+        completion = 0
+    return max(1, int(chars / MISTRAL_CHARS_PER_TOKEN) + completion)
+
+
+def usage_tokens(body: bytes) -> Optional[int]:
+    """Total tokens reported in the `usage` of a Mistral response, if any."""
+    try:
+        usage = json.loads(body).get("usage") or {}
+    except (ValueError, AttributeError):
+        return None
+    total = usage.get("total_tokens")
+    return int(total) if total is not None else None
+
+
+def _text(content: Any) -> str:
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return "".join(
+            _text(part.get("text") if isinstance(part, dict) else part) for part in content)
+    return ""
+
+
+class _Ticket:
+    """A call waiting for budget, ordered by priority then arrival."""
+
+    def __init__(self, priority: int, seq: int, tokens: float, loop: Optional[asyncio.AbstractEventLoop]) -> None:
+        self.priority = priority
+        self.seq = seq
+        self.tokens = tokens
+        self.loop = loop
+        self.event = asyncio.Event() if loop else threading.Event()
+
+    def __lt__(self, other: "_Ticket") -> bool:
+        return (self.priority, self.seq) < (other.priority, other.seq)
+
+    def wake(self) -> None:
+        if self.loop is None:
+            self.event.set()
+        else:
+            self.loop.call_soon_threadsafe(self.event.set)
+
+
+class TokenBudgetScheduler:
+    """
+    Token-per-minute budget shared by every call to an upstream API.
+
+    The budget is a token bucket holding up to `tokens_per_minute` tokens, refilled
+    continuously. A call is admitted once the bucket holds its estimated tokens and
+    no call of the same or a higher priority class is waiting before it, so
+    interactive calls overtake queued background work. When the response reports
+    its real usage, the difference with the estimate is given back or charged.
+
+    Attributes:
+        tokens_per_minute (float): Budget per minute, 0 to admit every call at once.
+    """
+
+    def __init__(self, tokens_per_minute: float = MISTRAL_TOKENS_PER_MINUTE) -> None:
+        self.tokens_per_minute = tokens_per_minute
+        self._lock = threading.Lock()
+        self._tokens = float(tokens_per_minute)
+        self._updated_at = time.monotonic()
+        self._queue: List[_Ticket] = []
+        self._seq = itertools.count()
+        self.admitted = {name: 0 for name in PRIORITIES}
+        self.tokens_admitted = 0.0
+        self.wait_total = {name: 0.0 for name in PRIORITIES}
+
+    @property
+    def enabled(self) -> bool:
+        return self.tokens_per_minute > 0
+
+    async def acquire(self, tokens: float, priority: Optional[str] = None) -> None:
+        """
+        Wait until the budget admits a call, from an event loop.
+
+        Args:
+            tokens: Estimated tokens of the call.
+            priority: Priority class, the class of the current context by default.
+        """
+        if not self.enabled:
+            return
+        name = priority or current_priority()
+        ticket = self._enqueue(tokens, name, asyncio.get_running_loop())
+        started = time.monotonic()
+        try:
+            while True:
+                wait = self._try_admit(ticket)
+                if wait is None:
+                    break
+                try:
+                    await asyncio.wait_for(ticket.event.wait(), wait)
+                except asyncio.TimeoutError:
+                    pass
+        except BaseException:
+            self._remove(ticket)
+            raise
+        self._record(name, tokens, time.monotonic() - started)
+
+    def acquire_sync(self, tokens: float, priority: Optional[str] = None) -> None:
+        """Wait until the budget admits a call, from a thread. See `acquire`."""
+        if not self.enabled:
+            return
+        name = priority or current_priority()
+        ticket = self._enqueue(tokens, name, None)
+        started = time.monotonic()
+        try:
+            while True:
+                wait = self._try_admit(ticket)
+                if wait is None:
+                    break
+                ticket.event.wait(wait)
+        except BaseException:
+            self._remove(ticket)
+            raise
+        self._record(name, tokens, time.monotonic() - started)
+
+    def settle(self, estimated: float, actual: Optional[int]) -> None:
+        """
+        Correct the budget with the real usage of an admitted call.
+
+        Args:
+            estimated: Tokens charged when the call was admitted.
+            actual: Tokens reported by the upstream, None if unknown.
+        """
+        if not self.enabled or actual is None:
+            return
+        with self._lock:
+            self._tokens = min(
+                float(self.tokens_per_minute), self._tokens + min(estimated, self.tokens_per_minute) - actual)
+            if self._queue:
+                self._queue[0].wake()
+
+    def stats(self) -> dict:
+        """Available budget, queued calls per priority class and admission counters."""
+        with self._lock:
+            self._refill(time.monotonic())
+            queued = {name: 0 for name in PRIORITIES}
+            queued_tokens = 0.0
+            for ticket in self._queue:
+                queued[_priority_name(ticket.priority)] += 1
+                queued_tokens += ticket.tokens
+            return {
+                "enabled": self.enabled,
+                "tokens_per_minute": self.tokens_per_minute,
+                "available": self._tokens,
+                "queued": queued,
+                "queued_tokens": queued_tokens,
+                "admitted": dict(self.admitted),
+                "tokens_admitted": self.tokens_admitted,
+                "wait_avg": {
+                    name: self.wait_total[name] / self.admitted[name] if self.admitted[name] else 0.0
+                    for name in PRIORITIES
+                },
+            }
+
+    def _enqueue(self, tokens: float, name: str, loop: Optional[asyncio.AbstractEventLoop]) -> _Ticket:
+        # Call lớn hơn cả ngân sách một phút vẫn được nhận khi bucket đầy
+        ticket = _Ticket(PRIORITIES[name], next(self._seq),
+                         min(tokens, self.tokens_per_minute), loop)
+        with self._lock:
+            heapq.heappush(self._queue, ticket)
+        return ticket
+
+    def _try_admit(self, ticket: _Ticket) -> Optional[float]:
+        """Admit the ticket if it is first and the budget allows it, else return how long to wait."""
+        with self._lock:
+            self._refill(time.monotonic())
+            first = self._queue[0] is ticket
+            if first and self._tokens >= ticket.tokens:
+                heapq.heappop(self._queue)
+                self._tokens -= ticket.tokens
+                if self._queue:
+                    self._queue[0].wake()
+                return None
+            ticket.event.clear()
+            if not first:
+                # Chờ tới lượt: call đứng trước đánh thức khi được nhận, timeout chỉ để dự phòng
+                return 60.0
+            return (ticket.tokens - self._tokens) * 60.0 / self.tokens_per_minute
+
+    def _remove(self, ticket: _Ticket) -> None:
+        with self._lock:
+            if ticket in self._queue:
+                self._queue.remove(ticket)
+                heapq.heapify(self._queue)
+                if self._queue:
+                    self._queue[0].wake()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(
+            float(self.tokens_per_minute),
+            self._tokens + (now - self._updated_at) * self.tokens_per_minute / 60.0)
+        self._updated_at = now
+
+    def _record(self, name: str, tokens: float, wait: float) -> None:
+        with self._lock:
+            self.admitted[name] += 1
+            self.tokens_admitted += tokens
+            self.wait_total[name] += wait
+
+
+def _priority_name(priority: int) -> str:
+    return next(name for name, value in PRIORITIES.items() if value == priority)
+
+
+mistral_budget = TokenBudgetScheduler()
@@ -0,0 +1,204 @@
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from typing import Deque, Optional
+
+from ..settings import (
+    MISTRAL_CONCURRENCY_BACKOFF,
+    MISTRAL_CONCURRENCY_INITIAL,
+    MISTRAL_CONCURRENCY_MAX,
+    MISTRAL_CONCURRENCY_MIN,
+)
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Khoảng thời gian (giây) tối thiểu giữa hai lần giảm limit, một đợt lỗi chỉ giảm một lần
+DECREASE_COOLDOWN = 1.0
+# Hệ số làm mượt của thời gian chờ trung bình
+QUEUE_DELAY_SMOOTHING = 0.1
+
+
+class _Waiter:
+    """A caller waiting for a slot, from a thread or from an event loop."""
+
+    def __init__(self, loop: Optional[asyncio.AbstractEventLoop] = None) -> None:
+        self.loop = loop
+        self.future = loop.create_future() if loop else None
+        self.event = None if loop else threading.Event()
+
+    def wake(self) -> None:
+        if self.loop is None:
+            self.event.set()
+        else:
+            self.loop.call_soon_threadsafe(self._set_result)
+
+    def _set_result(self) -> None:
+        if not self.future.done():
+            self.future.set_result(None)
+
+
+class AdaptiveConcurrencyController:
+    """
+    Client-side limit of the in-flight calls to an upstream API, adapted with AIMD.
+
+    The limit grows by about one slot per round of successful calls (additive
+    increase) and is multiplied by `backoff` when the upstream signals overload
+    (429, 5xx gateway errors, timeouts), at most once per second (multiplicative
+    decrease). A `Retry-After` answer pauses every caller until it elapses.
+    Sync callers (threads) and async callers share the same slots.
+
+    Attributes:
+        limit (float): Current limit, the integer part is the number of slots.
+        min_limit (int): Lower bound of the limit.
+        max_limit (int): Upper bound of the limit.
+        backoff (float): Factor applied to the limit on overload.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = MISTRAL_CONCURRENCY_INITIAL,
+        min_limit: int = MISTRAL_CONCURRENCY_MIN,
+        max_limit: int = MISTRAL_CONCURRENCY_MAX,
+        backoff: float = MISTRAL_CONCURRENCY_BACKOFF,
+    ) -> None:
+        self.limit = float(initial_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff = backoff
+        self._lock = threading.Lock()
+        self._waiters: Deque[_Waiter] = deque()
+        self._in_flight = 0
+        self._paused_until = 0.0
+        self._last_decrease = 0.0
+        self.queue_delay_avg = 0.0
+        self.queue_delay_max = 0.0
+        self.completed = 0
+        self.overloads = 0
+        self.retries = 0
+        self.pauses = 0
+
+    async def acquire(self) -> None:
+        """Wait for a free slot from an event loop."""
+        loop = asyncio.get_running_loop()
+        started = time.monotonic()
+        woken = False
+        while True:
+            paused = self._paused_until - time.monotonic()
+            if paused > 0:
+                await asyncio.sleep(paused)
+                continue
+            waiter = self._try_acquire(loop, woken)
+            if waiter is None:
+                break
+            try:
+                await waiter.future
+            except asyncio.CancelledError:
+                self._cancel(waiter)
+                raise
+            woken = True
+        self._record_delay(time.monotonic() - started)
+
+    def acquire_sync(self) -> None:
+        """Wait for a free slot from a thread."""
+        started = time.monotonic()
+        woken = False
+        while True:
+            paused = self._paused_until - time.monotonic()
+            if paused > 0:
+                time.sleep(paused)
+                continue
+            waiter = self._try_acquire(None, woken)
+            if waiter is None:
+                break
+            waiter.event.wait()
+            woken = True
+        self._record_delay(time.monotonic() - started)
+
+    def release(self, ok: bool = True, overloaded: bool = False, retry_after: Optional[float] = None) -> None:
+        """
+        Free a slot and adapt the limit to the outcome of the call.
+
+        Args:
+            ok: The call succeeded, the limit is increased.
+            overloaded: The upstream signalled overload, the limit is decreased.
+            retry_after: Seconds every caller should wait, from the `Retry-After` header.
+        """
+        now = time.monotonic()
+        with self._lock:
+            self._in_flight -= 1
+            if overloaded:
+                self.overloads += 1
+                if now - self._last_decrease >= DECREASE_COOLDOWN:
+                    self._last_decrease = now
+                    self.limit = max(float(self.min_limit), self.limit * self.backoff)
+                    logger.warning(
+                        f"Upstream overloaded, concurrency limit lowered to {int(self.limit)}")
+            elif ok:
+                self.completed += 1
+                self.limit = min(float(self.max_limit), self.limit + 1.0 / self.limit)
+            if retry_after:
+                self.pauses += 1
+                self._paused_until = max(self._paused_until, now + retry_after)
+            self._wake_locked()
+
+    def record_retry(self) -> None:
+        self.retries += 1
+
+    def stats(self) -> dict:
+        """Current limit, in-flight and queued calls, queueing delay and overload counters."""
+        with self._lock:
+            return {
+                "limit": int(self.limit),
+                "in_flight": self._in_flight,
+                "queued": len(self._waiters),
+                "queue_delay_avg": self.queue_delay_avg,
+                "queue_delay_max": self.queue_delay_max,
+                "paused_for": max(0.0, self._paused_until - time.monotonic()),
+                "completed": self.completed,
+                "overloads": self.overloads,
+                "retries": self.retries,
+                "pauses": self.pauses,
+                "min_limit": self.min_limit,
+                "max_limit": self.max_limit,
+            }
+
+    def _try_acquire(self, loop: Optional[asyncio.AbstractEventLoop], woken: bool) -> Optional[_Waiter]:
+        # Lấy slot nếu còn trống, ngược lại xếp hàng và trả về waiter để chờ.
+        # Caller mới không vượt qua hàng đợi, caller vừa được đánh thức giữ vị trí đầu hàng.
+        with self._lock:
+            if self._in_flight < int(self.limit) and (woken or not self._waiters):
+                self._in_flight += 1
+                return None
+            waiter = _Waiter(loop)
+            if woken:
+                self._waiters.appendleft(waiter)
+            else:
+                self._waiters.append(waiter)
+            return waiter
+
+    def _cancel(self, waiter: _Waiter) -> None:
+        with self._lock:
+            try:
+                self._waiters.remove(waiter)
+            except ValueError:
+                # Đã được đánh thức: chuyển lượt cho caller kế tiếp
+                self._wake_locked()
+
+    def _wake_locked(self) -> None:
+        # Mỗi waiter được đánh thức thử lấy slot lại từ đầu hàng đợi
+        free = int(self.limit) - self._in_flight
+        while free > 0 and self._waiters:
+            self._waiters.popleft().wake()
+            free -= 1
+
+    def _record_delay(self, delay: float) -> None:
+        with self._lock:
+            self.queue_delay_avg += QUEUE_DELAY_SMOOTHING * (delay - self.queue_delay_avg)
+            self.queue_delay_max = max(self.queue_delay_max, delay)
+
+
+mistral_controller = AdaptiveConcurrencyController()
@@ -0,0 +1,169 @@
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from typing import Awaitable, Callable, Deque, Dict, Optional, TypeVar
+
+from ..settings import (
+    LLM_HEDGE_MAX_RATE,
+    LLM_HEDGE_MIN_DELAY,
+    LLM_HEDGE_MIN_SAMPLES,
+    LLM_HEDGE_PERCENTILE,
+)
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Số lời gọi gần nhất dùng để tính percentile độ trễ
+LATENCY_WINDOW = 200
+# Số hedge tối đa được dồn lại khi ít khi cần hedge
+HEDGE_BURST = 10.0
+
+
+class Hedger:
+    """
+    Hedged requests: a call still running after a percentile of the recent
+    latencies is duplicated, the first to succeed wins and the other is cancelled.
+    A primary request cancelled by a winning hedge records the time it ran, a lower
+    bound of its latency, so slow requests still count in the percentile.
+
+    Hedges are throttled by a token bucket: every call adds `max_rate` tokens (up
+    to HEDGE_BURST) and every hedge takes one, so hedges never exceed `max_rate`
+    of the calls, even when every call is slow during an incident. No call is
+    hedged before `min_samples` latencies are known.
+
+    Attributes:
+        name (str): Name used in logs and metrics.
+        percentile (float): Percentile of the recent latencies after which to hedge.
+        max_rate (float): Maximum share of calls that are hedged.
+        min_samples (int): Latencies needed before hedging.
+        min_delay (float): Lower bound in seconds of the hedge delay.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        percentile: float = LLM_HEDGE_PERCENTILE,
+        max_rate: float = LLM_HEDGE_MAX_RATE,
+        min_samples: int = LLM_HEDGE_MIN_SAMPLES,
+        min_delay: float = LLM_HEDGE_MIN_DELAY,
+    ) -> None:
+        self.name = name
+        self.percentile = percentile
+        self.max_rate = max_rate
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+        self._lock = threading.Lock()
+        self._latencies: Deque[float] = deque(maxlen=LATENCY_WINDOW)
+        self._tokens = HEDGE_BURST
+        self.calls = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+        self.throttled = 0
+
+    def delay(self) -> Optional[float]:
+        """Seconds to wait before hedging a call, None while too few latencies are known."""
+        with self._lock:
+            if len(self._latencies) < self.min_samples:
+                return None
+            latencies = sorted(self._latencies)
+        index = min(len(latencies) - 1, int(len(latencies) * self.percentile / 100))
+        return max(self.min_delay, latencies[index])
+
+    async def run(self, call: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run a call, hedging it if it is slower than the hedge delay.
+
+        Args:
+            call: Coroutine function making the request; called twice when hedged.
+
+        Returns:
+            The result of the first successful request.
+        """
+        with self._lock:
+            self.calls += 1
+            self._tokens = min(HEDGE_BURST, self._tokens + self.max_rate)
+        delay = self.delay()
+        started = time.perf_counter()
+        primary = asyncio.ensure_future(self._timed(call))
+        if delay is None:
+            return await primary
+
+        pending = {primary}
+        try:
+            done, _ = await asyncio.wait(pending, timeout=delay)
+            if done or not self._take_token():
+                return await primary
+
+            logger.info(f"Hedging {self.name} call after {delay:.2f} seconds")
+            hedge = asyncio.ensure_future(self._timed(call))
+            pending.add(hedge)
+            while True:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                winner = done.pop()
+                # Request xong trước bị lỗi: chờ request còn lại
+                if winner.exception() is None or not pending:
+                    break
+            if winner is hedge and winner.exception() is None:
+                with self._lock:
+                    self.hedge_wins += 1
+                    # Request chính bị hủy vẫn đã chạy ít nhất ngần này: ghi lại để
+                    # percentile không bị kéo xuống bởi chỉ các request nhanh
+                    if not primary.done():
+                        self._latencies.append(time.perf_counter() - started)
+            return winner.result()
+        finally:
+            # Hủy request thua (hoặc cả hai khi caller bị hủy)
+            for task in pending:
+                task.cancel()
+
+    def stats(self) -> dict:
+        """Hedge delay and counters."""
+        delay = self.delay()
+        with self._lock:
+            return {
+                "delay": delay,
+                "percentile": self.percentile,
+                "calls": self.calls,
+                "hedged": self.hedged,
+                "hedge_rate": self.hedged / self.calls if self.calls else 0.0,
+                "hedge_wins": self.hedge_wins,
+                "throttled": self.throttled,
+                "max_rate": self.max_rate,
+            }
+
+    async def _timed(self, call: Callable[[], Awaitable[T]]) -> T:
+        started = time.perf_counter()
+        result = await call()
+        with self._lock:
+            self._latencies.append(time.perf_counter() - started)
+        return result
+
+    def _take_token(self) -> bool:
+        with self._lock:
+            if self._tokens >= 1:
+                self._tokens -= 1
+                self.hedged += 1
+                return True
+            self.throttled += 1
+            return False
+
+
+_hedgers: Dict[str, Hedger] = {}
+
+
+def get_hedger(name: str) -> Hedger:
+    """Get the Hedger of a chain, created on first use."""
+    hedger = _hedgers.get(name)
+    if hedger is None:
+        hedger = _hedgers[name] = Hedger(name)
+    return hedger
+
+
+def hedge_stats() -> Dict[str, dict]:
+    """Hedge delay and counters of every chain."""
+    return {name: hedger.stats() for name, hedger in _hedgers.items()}
@@ -0,0 +1,327 @@
+import asyncio
+import email.utils
+import logging
+import random
+import time
+from typing import Any, Callable, Optional, Tuple
+
+import httpx
+
+from ..settings import MISTRAL_MAX_RETRIES, MISTRAL_RETRY_BASE_DELAY, MISTRAL_RETRY_MAX_DELAY
+from .budget import TokenBudgetScheduler, estimate_tokens, usage_tokens
+from .controller import AdaptiveConcurrencyController
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Upstream quá tải: giảm limit và thử lại
+OVERLOAD_STATUSES = frozenset([429, 502, 503, 504])
+# Lỗi tạm thời có thể thử lại; các lỗi 4xx khác (400, 401, 422, ...) trả về ngay
+RETRYABLE_STATUSES = OVERLOAD_STATUSES | frozenset([408, 500])
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a `Retry-After` header, in seconds or as an HTTP date."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+
+def retry_delay(attempt: int) -> float:
+    """Exponential backoff with full jitter for the retry number `attempt` (from 0)."""
+    return random.uniform(0, min(MISTRAL_RETRY_MAX_DELAY, MISTRAL_RETRY_BASE_DELAY * 2 ** attempt))
+
+
+class _ReleasingStream(httpx.SyncByteStream):
+    """Response body that frees the controller slot when the response is closed."""
+
+    def __init__(self, stream: httpx.SyncByteStream, release: Callable[[], None]) -> None:
+        self._stream = stream
+        self._release = release
+
+    def __iter__(self):
+        yield from self._stream
+
+    def close(self) -> None:
+        try:
+            self._stream.close()
+        finally:
+            self._release()
+
+
+class _AsyncReleasingStream(httpx.AsyncByteStream):
+    """Async response body that frees the controller slot when the response is closed."""
+
+    def __init__(self, stream: httpx.AsyncByteStream, release: Callable[[], None]) -> None:
+        self._stream = stream
+        self._release = release
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            self._release()
+
+
+def _once(func: Callable[[], None]) -> Callable[[], None]:
+    called = False
+
+    def wrapper() -> None:
+        nonlocal called
+        if not called:
+            called = True
+            func()
+
+    return wrapper
+
+
+class ControlledTransport(httpx.BaseTransport):
+    """
+    httpx transport sending every request through an AdaptiveConcurrencyController.
+
+    A slot is held from sending the request until the response is closed, so
+    streamed completions count as in flight while they are read. With a `budget`,
+    the request first waits for its estimated tokens in its priority class, and
+    the usage reported by a non-streamed response settles the estimate; error
+    responses and requests that never reached the upstream are refunded. Timeouts,
+    connection errors and retryable statuses are retried up to `max_retries`
+    times, waiting `Retry-After` when the upstream sends it and an exponential
+    backoff otherwise.
+
+    Attributes:
+        transport (httpx.BaseTransport): The transport doing the I/O.
+        controller (AdaptiveConcurrencyController): The shared concurrency controller.
+        budget (Optional[TokenBudgetScheduler]): The shared token budget, admitting
+            the request before it takes a concurrency slot.
+        max_retries (int): Maximum number of retries of a request.
+    """
+
+    def __init__(
+        self,
+        transport: httpx.BaseTransport,
+        controller: AdaptiveConcurrencyController,
+        budget: Optional[TokenBudgetScheduler] = None,
+        max_retries: int = MISTRAL_MAX_RETRIES,
+    ) -> None:
+        self.transport = transport
+        self.controller = controller
+        self.budget = budget
+        self.max_retries = max_retries
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        charge = 0
+        if self.budget is not None and self.budget.enabled:
+            charge = estimate_tokens(request)
+            self.budget.acquire_sync(charge)
+        # True khi request đang ở upstream (đang gửi hoặc đọc response)
+        sending = False
+        try:
+            attempt = 0
+            while True:
+                self.controller.acquire_sync()
+                sending = True
+                try:
+                    response = self.transport.handle_request(request)
+                except httpx.TransportError as e:
+                    sending = False
+                    self.controller.release(
+                        ok=False, overloaded=isinstance(e, httpx.TimeoutException))
+                    if attempt >= self.max_retries:
+                        raise
+                    delay = _log_retry(request, attempt, repr(e), None)
+                except BaseException:
+                    self.controller.release(ok=False)
+                    raise
+                else:
+                    status = response.status_code
+                    if status not in RETRYABLE_STATUSES or attempt >= self.max_retries:
+                        release = _once(lambda: self.controller.release(
+                            ok=status < 400, overloaded=status in OVERLOAD_STATUSES))
+                        if charge and not _is_event_stream(response):
+                            try:
+                                raw = b"".join(response.stream)
+                            finally:
+                                response.close()
+                                release()
+                            return _settled(self.budget, response, raw, charge)
+                        return httpx.Response(
+                            status, headers=response.headers,
+                            stream=_ReleasingStream(response.stream, release),
+                            extensions=response.extensions)
+                    sending = False
+                    retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                    response.close()
+                    self.controller.release(
+                        ok=False, overloaded=status in OVERLOAD_STATUSES, retry_after=retry_after)
+                    delay = _log_retry(request, attempt, str(status), retry_after)
+                self.controller.record_retry()
+                attempt += 1
+                time.sleep(delay)
+        except BaseException:
+            _refund(self.budget, charge, sending)
+            raise
+
+    def close(self) -> None:
+        self.transport.close()
+
+
+
+class AsyncControlledTransport(httpx.AsyncBaseTransport):
+    """
+    Async httpx transport sending every request through an AdaptiveConcurrencyController.
+
+    See ControlledTransport.
+
+    Attributes:
+        transport (httpx.AsyncBaseTransport): The transport doing the I/O.
+        controller (AdaptiveConcurrencyController): The shared concurrency controller.
+        budget (Optional[TokenBudgetScheduler]): The shared token budget, admitting
+            the request before it takes a concurrency slot.
+        max_retries (int): Maximum number of retries of a request.
+    """
+
+    def __init__(
+        self,
+        transport: httpx.AsyncBaseTransport,
+        controller: AdaptiveConcurrencyController,
+        budget: Optional[TokenBudgetScheduler] = None,
+        max_retries: int = MISTRAL_MAX_RETRIES,
+    ) -> None:
+        self.transport = transport
+        self.controller = controller
+        self.budget = budget
+        self.max_retries = max_retries
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        charge = 0
+        if self.budget is not None and self.budget.enabled:
+            charge = estimate_tokens(request)
+            await self.budget.acquire(charge)
+        # True khi request đang ở upstream (đang gửi hoặc đọc response)
+        sending = False
+        try:
+            attempt = 0
+            while True:
+                await self.controller.acquire()
+                sending = True
+                try:
+                    response = await self.transport.handle_async_request(request)
+                except httpx.TransportError as e:
+                    sending = False
+                    self.controller.release(
+                        ok=False, overloaded=isinstance(e, httpx.TimeoutException))
+                    if attempt >= self.max_retries:
+                        raise
+                    delay = _log_retry(request, attempt, repr(e), None)
+                except BaseException:
+                    self.controller.release(ok=False)
+                    raise
+                else:
+                    status = response.status_code
+                    if status not in RETRYABLE_STATUSES or attempt >= self.max_retries:
+                        release = _once(lambda: self.controller.release(
+                            ok=status < 400, overloaded=status in OVERLOAD_STATUSES))
+                        if charge and not _is_event_stream(response):
+                            try:
+                                raw = b"".join([chunk async for chunk in response.stream])
+                            finally:
+                                await response.aclose()
+                                release()
+                            return _settled(self.budget, response, raw, charge)
+                        return httpx.Response(
+                            status, headers=response.headers,
+                            stream=_AsyncReleasingStream(response.stream, release),
+                            extensions=response.extensions)
+                    sending = False
+                    retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                    await response.aclose()
+                    self.controller.release(
+                        ok=False, overloaded=status in OVERLOAD_STATUSES, retry_after=retry_after)
+                    delay = _log_retry(request, attempt, str(status), retry_after)
+                self.controller.record_retry()
+                attempt += 1
+                await asyncio.sleep(delay)
+        except BaseException:
+            _refund(self.budget, charge, sending)
+            raise
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+
+def controlled_clients(
+    client: httpx.Client,
+    async_client: httpx.AsyncClient,
+    controller: AdaptiveConcurrencyController,
+    budget: Optional[TokenBudgetScheduler] = None,
+    verify: Any = True,
+) -> Tuple[httpx.Client, httpx.AsyncClient]:
+    """
+    Copies of a pair of httpx clients (base URL, headers, timeout) whose requests go through `controller`.
+
+    Args:
+        client: The sync client to copy.
+        async_client: The async client to copy.
+        controller: The concurrency controller shared by the clients.
+        budget: The token budget shared by the clients, None for no budget.
+        verify: SSL verification of the underlying transports.
+
+    Returns:
+        The controlled sync and async clients.
+    """
+    return (
+        httpx.Client(
+            base_url=client.base_url, headers=client.headers, timeout=client.timeout,
+            transport=ControlledTransport(httpx.HTTPTransport(verify=verify), controller, budget)),
+        httpx.AsyncClient(
+            base_url=async_client.base_url, headers=async_client.headers, timeout=async_client.timeout,
+            transport=AsyncControlledTransport(httpx.AsyncHTTPTransport(verify=verify), controller, budget)),
+    )
+
+
+def _is_event_stream(response: httpx.Response) -> bool:
+    return response.headers.get("Content-Type", "").startswith("text/event-stream")
+
+
+def _settled(budget: TokenBudgetScheduler, response: httpx.Response, raw: bytes, charge: int) -> httpx.Response:
+    """Response rebuilt from its read body, after settling the budget with the reported usage."""
+    result = httpx.Response(
+        response.status_code, headers=response.headers, content=raw,
+        extensions=response.extensions)
+    # Request lỗi không tiêu tốn token: hoàn lại phần đã trừ
+    budget.settle(charge, usage_tokens(result.content) if response.status_code < 400 else 0)
+    return result
+
+
+def _refund(budget: Optional[TokenBudgetScheduler], charge: int, sending: bool) -> None:
+    """
+    Settle the budget of a request that failed or was cancelled without a response.
+
+    The charge is refunded when no attempt was at the upstream: retries exhausted
+    on transport errors, or cancelled while waiting for a slot or a backoff. A
+    request cancelled while at the upstream (hedge loser, client disconnect) keeps
+    its estimate, since the upstream may already have processed it.
+    """
+    if charge and not sending:
+        budget.settle(charge, 0)
+
+
+def _log_retry(request: httpx.Request, attempt: int, reason: str, retry_after: Optional[float]) -> float:
+    """Log a retry and return the backoff to sleep (0 when the controller pauses for Retry-After)."""
+    logger.warning(
+        f"{request.method} {request.url.path} failed ({reason}), "
+        f"retry {attempt + 1}" + (f" after {retry_after:.1f}s" if retry_after else ""))
+    return 0.0 if retry_after else retry_delay(attempt)